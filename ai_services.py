@@ -1,83 +1,400 @@
 # ai_services.py
+import hashlib
+import json
 import os
 import re
-from collections import Counter
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
 import streamlit as st
-from openai import OpenAI, APIError
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
-from data_config import CURRICULUM_STANDARDS
-from vocabulary_loader import MOE_VOCABULARIES, get_vocabulary_for_grade, analyze_vocabulary_level
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from copy_detection import detect_copied_spans, format_copy_check_for_prompt
+from data_config import (
+    CURRICULUM_STANDARDS, OPENAI_CASSETTE_DIR, MODEL_TIERS, MODEL_TASK_ROUTES, AI_CIRCUIT_FAILURE_THRESHOLD, AI_CIRCUIT_SLOW_CALL_SECONDS, AI_CIRCUIT_OPEN_SECONDS,
+    AI_CONCURRENCY_INITIAL_LIMIT, AI_CONCURRENCY_MIN_LIMIT, AI_CONCURRENCY_MAX_LIMIT, AI_CONCURRENCY_DECREASE_FACTOR,
+    AI_CONCURRENCY_LATENCY_TARGET_RATIO, AI_CONCURRENCY_LATENCY_TARGET_SECONDS,
+    AI_HEDGE_PERCENTILE, AI_HEDGE_MIN_SAMPLES, AI_HEDGE_MIN_DELAY_SECONDS, AI_HEDGE_MAX_RATIO,
+    AI_TRANSLATION_DEADLINE_SECONDS, AI_SUMMARY_DEADLINE_SECONDS, AI_FEEDBACK_DEADLINE_SECONDS,
+    LONG_PASSAGE_MAX_PARALLEL_CHUNKS, SUMMARY_MIN_WORDS, SUMMARY_MAX_WORDS, SUMMARY_MAX_OFF_LIST_WORDS, SUMMARY_MAX_REWRITES,
+    get_curriculum_key
+)
+from hedging import HedgedRequests
+from local_summarizer import compress_sentence, summarize_locally, tokenize_words
+from long_passage import ChunkSummaryCache, chunk_passage, is_long_passage
+from model_router import ModelRouter
+from passage_profiler import profile_passage, format_profile_for_prompt
+from rate_limiter import AdaptiveConcurrencyLimiter
+from vocabulary_loader import get_vocabulary_for_grade, analyze_vocabulary_level, get_moe_vocabularies, in_vocabulary
+from single_flight import SingleFlight
+from spelling_index import check_spelling
+from startup_profiler import record_startup_timing
+from utils import count_words, extract_keywords, summary_word_diff
 
 # 환경 설정
 try:
     OPENAI_KEY = st.secrets["openai"]["api_key"]
-except KeyError:
-    OPENAI_KEY = ""
+except (KeyError, FileNotFoundError):
+    # Streamlit secrets가 없는 환경(분석 API 서버 등)에서는 환경 변수 사용
+    OPENAI_KEY = os.environ.get("OPENAI_API_KEY", "")
 
-OPENAI_OK = bool(OPENAI_KEY)
+# 요청/응답 기록·재생 모드 (record/replay/offline, 비어 있으면 실제 API만 사용)
+OPENAI_CASSETTE_MODE = os.environ.get("OPENAI_CASSETTE_MODE", "").strip().lower()
 
-client = None
-if OPENAI_OK:
+# offline 모드는 저장된 응답만 쓰므로 API 키 없이도 동작
+OPENAI_OK = bool(OPENAI_KEY) or OPENAI_CASSETTE_MODE == "offline"
+
+_cassette_transport = None
+
+def _cassette_http_client():
+    """OPENAI_CASSETTE_MODE가 설정된 경우 기록·재생 전송 계층을 쓰는 httpx 클라이언트
+
+    OPENAI_CASSETTE_DIR로 저장 위치를, OPENAI_CASSETTE_LATENCY로 재생 지연(초 또는 recorded)을 지정합니다.
+    """
+    global _cassette_transport
+    if not OPENAI_CASSETTE_MODE:
+        return None
+    import httpx
+    from openai_cassette import CassetteTransport
+
+    latency = os.environ.get("OPENAI_CASSETTE_LATENCY", "0").strip().lower()
+    _cassette_transport = CassetteTransport(
+        os.environ.get("OPENAI_CASSETTE_DIR") or OPENAI_CASSETTE_DIR,
+        mode=OPENAI_CASSETTE_MODE,
+        latency_seconds=0.0 if latency == "recorded" else float(latency),
+        use_recorded_latency=latency == "recorded"
+    )
+    return httpx.Client(transport=_cassette_transport)
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """OpenAI 클라이언트를 최초 사용 시 한 번만 생성 (openai 패키지도 이때 import, Streamlit 앱과 분석 API가 함께 사용)"""
+    global _client
+    if not OPENAI_OK:
+        return None
+    if _client is not None:
+        return _client
+
+    with _client_lock:
+        if _client is None:
+            try:
+                with record_startup_timing("OpenAI 클라이언트 초기화"):
+                    from openai import OpenAI
+                    # offline 모드에서 저장된 응답이 없는 요청은 다시 보내도 없으므로 재시도하지 않음
+                    options = {"max_retries": 0} if OPENAI_CASSETTE_MODE == "offline" else {}
+                    _client = OpenAI(api_key=OPENAI_KEY or "offline", http_client=_cassette_http_client(), **options)
+            except Exception as e:
+                st.error(f"OpenAI 초기화 실패: {e}")
+                return None
+    return _client
+
+def _secrets_to_dict(value):
+    """secrets 섹션을 일반 dict로 변환"""
+    if hasattr(value, "items"):
+        return {key: _secrets_to_dict(item) for key, item in value.items()}
+    return value
+
+try:
+    _MODEL_ROUTING_OVERRIDES = _secrets_to_dict(st.secrets.get("model_routing", {}))
+except FileNotFoundError:
+    _MODEL_ROUTING_OVERRIDES = {}
+
+# 작업별 모델 등급 선택과 지연 시간/비용 통계
+MODEL_ROUTER = ModelRouter(MODEL_TIERS, MODEL_TASK_ROUTES, _MODEL_ROUTING_OVERRIDES)
+
+# 동시에 들어온 같은 요청은 한 번만 보냄 (예: 연수에서 여러 교사가 같은 지문을 동시에 분석)
+OPENAI_SINGLE_FLIGHT = SingleFlight()
+
+# OpenAI 장애 시 요청을 기다리지 않고 바로 로컬 결과로 대체
+OPENAI_CIRCUIT_BREAKER = CircuitBreaker(
+    "OpenAI",
+    failure_threshold=AI_CIRCUIT_FAILURE_THRESHOLD,
+    slow_call_seconds=AI_CIRCUIT_SLOW_CALL_SECONDS,
+    open_seconds=AI_CIRCUIT_OPEN_SECONDS
+)
+
+# 프로세스 전체 OpenAI 동시 요청 한도 (화면/학급 일괄 분석/API 요청이 함께 사용)
+OPENAI_CONCURRENCY_LIMITER = AdaptiveConcurrencyLimiter(
+    initial_limit=AI_CONCURRENCY_INITIAL_LIMIT,
+    min_limit=AI_CONCURRENCY_MIN_LIMIT,
+    max_limit=AI_CONCURRENCY_MAX_LIMIT,
+    latency_target_seconds=AI_CONCURRENCY_LATENCY_TARGET_SECONDS,
+    decrease_factor=AI_CONCURRENCY_DECREASE_FACTOR
+)
+
+# 짧은 호출(요약/번역)이 늦어질 때 같은 요청을 한 번 더 보내 지연 꼬리 줄이기
+OPENAI_HEDGING = HedgedRequests(max_hedge_ratio=AI_HEDGE_MAX_RATIO)
+
+# 긴 지문 조각별 부분 요약 (단락 하나만 고치면 그 조각만 다시 요약)
+LONG_PASSAGE_CHUNK_CACHE = ChunkSummaryCache()
+
+class DeadlineExceededError(TimeoutError):
+    """요청 마감 시간 초과"""
+
+def make_deadline(seconds: float) -> float:
+    """지금부터 seconds초 뒤의 마감 시각 (time.monotonic 기준)"""
+    return time.monotonic() + seconds
+
+def _remaining_seconds(deadline):
+    """마감까지 남은 시간 (마감이 없으면 None, 이미 지났으면 DeadlineExceededError)"""
+    if deadline is None:
+        return None
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise DeadlineExceededError("요청 마감 시간이 지났습니다.")
+    return remaining
+
+def _is_service_failure(error: BaseException) -> bool:
+    """차단기에 실패로 기록할 오류인지 (잘못된 요청 등 4xx 응답, 호출자의 마감 시간 초과는 서비스 장애로 보지 않음)"""
+    from openai import APIStatusError
+    if isinstance(error, APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    # DeadlineExceededError/동시 요청 한도 대기 초과 (API 응답 시간 초과는 APITimeoutError)
+    if isinstance(error, TimeoutError):
+        return False
+    return True
+
+def _cassette_miss(error: BaseException):
+    """offline 카세트에 저장된 응답이 없어 생긴 오류면 그 CassetteMissError (openai가 APIConnectionError로 감싸므로 원인까지 확인)"""
+    from openai_cassette import CassetteMissError
+    while error is not None:
+        if isinstance(error, CassetteMissError):
+            return error
+        error = error.__cause__
+    return None
+
+def _is_overload(error: BaseException) -> bool:
+    """동시 요청 한도를 줄일 오류인지 (429, 응답 시간 초과)"""
+    from openai import APIStatusError, APITimeoutError
+    if isinstance(error, APIStatusError):
+        return error.status_code == 429
+    return isinstance(error, APITimeoutError)
+
+def _fallback_errors() -> tuple:
+    """로컬 결과로 대체할 오류 (차단 중, 마감 초과, 연결 실패/시간 초과)"""
+    from openai import APIConnectionError
+    return (CircuitOpenError, TimeoutError, APIConnectionError)
+
+def _build_request(prompt: str, route: dict, tier: str) -> dict:
+    return {
+        "model": MODEL_ROUTER.model_for(tier),
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": route["temperature"],
+        "max_tokens": route["max_tokens"]
+    }
+
+def _call_model(client, request: dict, task: str, tier: str, deadline: float = None, latency_budget: float = None,
+                cancellation=None) -> str:
+    """Chat Completions 한 번 호출 (차단기/동시 요청 한도/마감 시간 적용, 결과를 작업별 통계에 기록)
+
+    cancellation(HedgeCancellation)이 취소되면 아직 보내지 않은 요청은 보내지 않습니다. 이미 보낸 요청은 응답이 올 때까지
+    동시 요청 자리를 차지하고(실제로 서버 부하이므로), 늦은 응답은 차단기/동시 요청 한도/작업별 지연 통계에 반영하지 않습니다.
+    """
+    latency_target = latency_budget * AI_CONCURRENCY_LATENCY_TARGET_RATIO if latency_budget is not None else None
+    # 동시 요청 한도가 차 있으면 마감 시간 안에서 대기 (대기 실패가 차단기 시험 호출을 붙잡지 않도록 차단기 확인보다 먼저)
+    slot = OPENAI_CONCURRENCY_LIMITER.acquire_slot(timeout=_remaining_seconds(deadline))
     try:
-        client = OpenAI(api_key=OPENAI_KEY)
-    except Exception as e:
-        st.error(f"OpenAI 초기화 실패: {e}")
-        OPENAI_OK = False
+        timeout = _remaining_seconds(deadline)
+        if cancellation is not None and cancellation.cancelled:
+            raise CancelledError("추가 요청이 먼저 끝나 보내지 않았습니다.")
+        OPENAI_CIRCUIT_BREAKER.before_call()
+    except BaseException:
+        slot.abandon()
+        raise
+    if latency_budget is not None:
+        timeout = latency_budget if timeout is None else min(timeout, latency_budget)
+    start = time.monotonic()
+    try:
+        # 마감/지연 예산이 있으면 재시도 없이 남은 시간 안에서 한 번만 호출
+        api = client.with_options(timeout=timeout, max_retries=0) if timeout is not None else client
+        response = api.chat.completions.create(**request)
+    except BaseException as e:
+        elapsed = time.monotonic() - start
+        miss = _cassette_miss(e)
+        if miss is not None:
+            # 저장된 응답 누락은 서비스 장애가 아니므로 차단기/한도에 반영하지 않고,
+            # 연결 실패처럼 로컬 결과로 조용히 대체되지 않도록 CassetteMissError 그대로 알림
+            slot.abandon()
+            from openai_cassette import CassetteMissError
+            raise CassetteMissError(str(miss), request=miss.request) from None
+        if cancellation is not None and cancellation.cancelled:
+            # 진 쪽 요청의 늦은 오류는 이긴 요청이 이미 결과를 냈으므로 자리만 반환
+            slot.abandon()
+            raise
+        slot.release(elapsed, overloaded=_is_overload(e), latency_target_seconds=latency_target)
+        MODEL_ROUTER.record_call(task, tier, elapsed, error=True)
+        if _is_service_failure(e):
+            OPENAI_CIRCUIT_BREAKER.record_failure(f"{type(e).__name__}: {e}")
+        else:
+            OPENAI_CIRCUIT_BREAKER.record_success(elapsed)
+        raise
+    elapsed = time.monotonic() - start
+    if cancellation is not None and cancellation.cancelled:
+        # 진 쪽 요청의 늦은 응답: 자리만 반환하고 토큰 비용만 기록 (느린 응답이 지연 기준/차단기를 흔들지 않도록)
+        slot.abandon()
+        MODEL_ROUTER.record_call(task, tier, elapsed, response.usage, discarded=True)
+        return response.choices[0].message.content.strip()
+    slot.release(elapsed, latency_target_seconds=latency_target)
+    MODEL_ROUTER.record_call(task, tier, elapsed, response.usage)
+    # 작업별 지연 예산을 넘긴 응답은 느린 응답으로 기록
+    OPENAI_CIRCUIT_BREAKER.record_success(elapsed, slow_call_seconds=latency_budget)
+    return response.choices[0].message.content.strip()
 
-def extract_keywords(text: str, top_n: int = 5) -> list:
-    """텍스트에서 주요 키워드 추출 (지시대명사, 문법어휘 제외)"""
-    if not text.strip():
-        return []
-    
-    # 제외할 단어들 (지시대명사, 문법어휘, 관사, 전치사 등)
-    stopwords = {
-        'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them',
-        'this', 'that', 'these', 'those', 'my', 'your', 'his', 'her', 'its', 'our', 'their',
-        'a', 'an', 'the', 'and', 'or', 'but', 'so', 'if', 'because', 'when', 'where', 'how', 'why',
-        'in', 'on', 'at', 'by', 'for', 'with', 'without', 'to', 'from', 'of', 'about', 'into', 'through',
-        'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did',
-        'will', 'would', 'could', 'should', 'may', 'might', 'can', 'must', 'shall',
-        'not', 'no', 'yes', 'very', 'more', 'most', 'much', 'many', 'some', 'any', 'all', 'each', 'every',
-        'also', 'just', 'only', 'even', 'up', 'down', 'out', 'over', 'under', 'here', 'there', 'where',
-        'then', 'now', 'always', 'never', 'often', 'seldom', 'sometimes', 'usually', 'rarely', 'already',
-        'still', 'yet', 'away', 'back', 'forth', 'further', 'once', 'twice', 'enough', 'indeed', 'perhaps',
-        'possibly', 'probably', 'surely', 'truly', 'actually', 'obviously', 'simply', 'really', 'almost',
-        'among', 'amongst', 'around', 'above', 'below', 'between', 'before', 'after', 'along', 'beside',
-        'besides', 'inside', 'outside', 'near', 'off', 'past', 'round', 'since', 'until', 'upon', 'within',
-        'without', 'across', 'against', 'amongst', 'amid', 'amidst', 'around', 'concerning', 'despite',
-        'during', 'except', 'inside', 'like', 'minus', 'outside', 'plus', 'regarding', 'save', 'than',
-        'towards', 'unlike', 'versus', 'via', 'whether', 'whilst', 'whom', 'whose', 'though', 'throughout',
-        'till', 'together', 'too', 'underneath', 'unless', 'whither', 'yet', 'hence', 'thereby', 'therein',
-        'thereof', 'thereto', 'thereupon', 'whereby', 'wherein', 'whereof', 'whereto', 'whereupon', 'whoever',
-        'whatever', 'whenever', 'wherever', 'whichever', 'whomever'
+def _chat_completion_with_tier(client, prompt: str, task: str, tier: str, deadline: float = None, latency_budget: float = None,
+                               hedge_tier: str = None) -> str:
+    """지정한 모델 등급으로 Chat Completions 호출 (같은 요청이 진행 중이면 그 응답을 함께 사용)
+
+    hedge_tier를 주면 작업의 p90 지연 시간까지 응답이 없을 때 그 등급으로 같은 요청을 한 번 더 보내고 먼저 온 응답을 사용합니다.
+    """
+    route = MODEL_ROUTER.route(task)
+    request = _build_request(prompt, route, tier)
+    key = hashlib.sha256(json.dumps(request, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def call():
+        hedge_delay = MODEL_ROUTER.latency_percentile(task, AI_HEDGE_PERCENTILE, AI_HEDGE_MIN_SAMPLES) if hedge_tier else None
+        if hedge_delay is None:
+            return _call_model(client, request, task, tier, deadline, latency_budget)
+        hedge_request = _build_request(prompt, route, hedge_tier)
+        return OPENAI_HEDGING.run(
+            task,
+            lambda cancellation: _call_model(client, request, task, tier, deadline, latency_budget, cancellation),
+            lambda cancellation: _call_model(client, hedge_request, task, hedge_tier, deadline, latency_budget, cancellation),
+            delay_seconds=max(hedge_delay, AI_HEDGE_MIN_DELAY_SECONDS),
+            timeout=_remaining_seconds(deadline)
+        )
+
+    return OPENAI_SINGLE_FLIGHT.do(key, call, timeout=_remaining_seconds(deadline))
+
+def _chat_completion(client, prompt: str, task: str, deadline: float = None) -> str:
+    """작업에 설정된 모델 등급으로 호출하고, 지연 예산을 넘기면 대체 등급으로 한 번 더 요청"""
+    from openai import APITimeoutError
+    route = MODEL_ROUTER.route(task)
+    try:
+        return _chat_completion_with_tier(client, prompt, task, route["tier"], deadline, route["latency_budget_seconds"], route.get("hedge_tier"))
+    except APITimeoutError:
+        if not route.get("fallback_tier"):
+            raise
+        MODEL_ROUTER.record_fallback(task)
+        # 대체 등급은 전체 마감 시간 안에서만 기다림
+        return _chat_completion_with_tier(client, prompt, task, route["fallback_tier"], deadline)
+
+def is_ai_degraded() -> bool:
+    """OpenAI 차단기가 열려 있거나 복구 확인 중이면 True"""
+    return OPENAI_CIRCUIT_BREAKER.state != "closed"
+
+def get_openai_request_stats() -> dict:
+    """OpenAI 요청 합치기/차단기/동시 요청 한도/추가 요청/카세트 재생 현황 (디버그용)"""
+    return {
+        "single_flight": OPENAI_SINGLE_FLIGHT.stats(),
+        "circuit_breaker": OPENAI_CIRCUIT_BREAKER.stats(),
+        "concurrency": OPENAI_CONCURRENCY_LIMITER.stats(),
+        "hedging": OPENAI_HEDGING.stats(),
+        "tasks": MODEL_ROUTER.stats(),
+        "chunk_cache": LONG_PASSAGE_CHUNK_CACHE.stats(),
+        "summary_constraints": _summary_constraint_snapshot(),
+        "cassette": _cassette_transport.stats() if _cassette_transport is not None else None
     }
-    
-    # 텍스트를 소문자로 변환하고 단어 추출
-    words = re.findall(r'\b[a-zA-Z]+\b', text.lower())
-    
-    # 불용어 제거 및 길이 3 이상인 단어만 선택
-    filtered_words = [word for word in words if word not in stopwords and len(word) >= 3]
-    
-    # 빈도 계산 후 상위 n개 반환
-    word_counts = Counter(filtered_words)
-    return [word for word, count in word_counts.most_common(top_n)]
 
-def translate_keywords_to_korean(keywords: list) -> dict:
+# 수정 요약문 비교 피드백에 넣는 이전 피드백 최대 길이
+REVISION_CONTEXT_MAX_CHARS = 800
+
+# AI 피드백 대신 자동 점검 결과만 제공할 때의 첫 줄
+LOCAL_FEEDBACK_PREFIX = "**AI 피드백을 일시적으로 사용할 수 없어 자동 점검 결과만 제공합니다.**"
+# AI 피드백이 아닌 결과 (생성 불가/실패 메시지, 자동 점검 결과)
+FAILED_FEEDBACK_PREFIXES = ("피드백 제공 불가", "피드백 생성 실패", LOCAL_FEEDBACK_PREFIX)
+
+def generate_local_summary(text: str, grade_level: str) -> str:
+    """API 없이 즉시 만드는 학년 수준 추출 요약 (모범 요약 초안 및 장애 시 대체용)"""
+    target_vocab = get_vocabulary_for_grade(grade_level, get_moe_vocabularies())
+    return summarize_locally(text, target_vocab)
+
+def _summarize_chunk(client, chunk: str, deadline: float = None) -> tuple:
+    """긴 지문 조각 하나를 2-3문장으로 부분 요약 (캐시 사용, 장애 시 로컬 요약) → (요약, 출처)"""
+    key = LONG_PASSAGE_CHUNK_CACHE.key(chunk)
+    cached = LONG_PASSAGE_CHUNK_CACHE.get(key)
+    if cached is not None:
+        return cached, "cache"
+
+    prompt = f"""다음은 긴 영어 지문(교과서 단원 등)의 일부입니다. 나중에 전체 요약을 만들 수 있도록 이 부분의 핵심 내용을 영어 2-3문장(50단어 이내)으로 요약해주세요.
+원문에 없는 내용은 추가하지 말고, 요약문만 출력해주세요.
+
+지문 일부: {chunk}"""
+    from openai import APIError
+    try:
+        summary = _chat_completion(client, prompt, "chunk_summary", deadline)
+    except (*_fallback_errors(), APIError):
+        # 조각 하나의 오류(5xx/4xx 포함)로 전체 요약이 실패하지 않도록 로컬 요약으로 대체
+        # 로컬 요약은 캐시하지 않아 다음 요청에서 다시 AI 요약을 시도
+        return summarize_locally(chunk, None, 25, 45), "local"
+    LONG_PASSAGE_CHUNK_CACHE.put(key, summary)
+    return summary, "ai"
+
+def condense_long_passage(text: str, deadline: float = None) -> tuple:
+    """긴 지문을 조각별로 병렬 부분 요약한 뒤 순서대로 이어 붙임 (결과가 여전히 길면 한 단계 더 줄임)
+
+    반환: (줄인 텍스트, {"chunks": 조각 수, "cached": 캐시 사용 수, "local": 로컬 대체 수, "levels": 단계 수})
+    """
+    client = get_client()
+    info = {"chunks": 0, "cached": 0, "local": 0, "levels": 0}
+    if client is None or not is_long_passage(text):
+        return text, info
+
+    # 작업 스레드에서도 st.* 호출이 현재 세션에 표시되도록 실행 컨텍스트 전달
+    script_ctx = get_script_run_ctx()
+    while is_long_passage(text):
+        chunks = chunk_passage(text)
+        if len(chunks) <= 1:
+            break
+        with ThreadPoolExecutor(max_workers=min(LONG_PASSAGE_MAX_PARALLEL_CHUNKS, len(chunks)),
+                                initializer=lambda: add_script_run_ctx(ctx=script_ctx)) as executor:
+            results = list(executor.map(lambda chunk: _summarize_chunk(client, chunk, deadline), chunks))
+        info["chunks"] += len(chunks)
+        info["cached"] += sum(1 for _, source in results if source == "cache")
+        info["local"] += sum(1 for _, source in results if source == "local")
+        info["levels"] += 1
+        # 부분 요약을 단락으로 이어 붙여 다음 단계에서도 단락 경계가 유지되도록 함
+        text = "\n\n".join(summary for summary, _ in results)
+    return text, info
+
+def _local_feedback_lines(summary: str, vocab_analysis: dict, keywords: list) -> list:
+    """로컬 계산만으로 만드는 점검 항목 (길이/어휘/키워드)"""
+    word_count = count_words(summary)
+    within = SUMMARY_MIN_WORDS <= word_count <= SUMMARY_MAX_WORDS
+    lines = [f"- 길이: {word_count}단어 (기준 {SUMMARY_MIN_WORDS}-{SUMMARY_MAX_WORDS}단어 {'충족' if within else '미충족'})"]
+    if vocab_analysis:
+        non_target = ", ".join(vocab_analysis.get("non_target_examples", [])[:5]) or "없음"
+        lines.append(f"- 기준 어휘 비율: {vocab_analysis.get('target_vocab_ratio', 0):.0%} (기준 외 어휘: {non_target})")
+    if keywords:
+        summary_words = set(re.findall(r'[a-z]+', summary.lower()))
+        missing = [k for k in keywords if k.lower() not in summary_words]
+        lines.append(f"- 핵심 키워드 포함: {len(keywords) - len(missing)}/{len(keywords)}개" + (f" (빠진 키워드: {', '.join(missing)})" if missing else ""))
+    return lines
+
+def _local_feedback(summary: str, vocab_analysis: dict, keywords: list, error: BaseException) -> str:
+    """AI 피드백 대신 제공하는 자동 점검 결과"""
+    lines = [f"{LOCAL_FEEDBACK_PREFIX} ({error})", ""]
+    lines.extend(_local_feedback_lines(summary, vocab_analysis, keywords))
+    return "\n".join(lines)
+
+def translate_keywords_to_korean(keywords: list, deadline: float = None) -> dict:
     """키워드를 한국어로 번역"""
-    if not OPENAI_OK or client is None or not keywords:
+    if not keywords:
         return {}
+    if deadline is None:
+        deadline = make_deadline(AI_TRANSLATION_DEADLINE_SECONDS)
+    client = get_client()
+    if client is None:
+        return {}
+    from openai import APIError
     
     keywords_str = ", ".join(keywords)
     prompt = f"다음 영어 단어들을 한국어로 번역해주세요. 각 단어마다 가장 적절한 의미 하나씩만 제시해주세요:\n{keywords_str}\n\n형식: 영어단어1: 한국어뜻1, 영어단어2: 한국어뜻2, ..."
     
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3,
-            max_tokens=300
-        )
-        result = response.choices[0].message.content.strip()
+        result = _chat_completion(client, prompt, "translation", deadline)
         
         # 결과 파싱
         translations = {}
@@ -94,6 +411,9 @@ def translate_keywords_to_korean(keywords: list) -> dict:
                 translations[eng.strip()] = kor.strip()
         
         return translations
+    except _fallback_errors() as e:
+        st.warning(f"키워드 번역을 건너뜁니다: {e}")
+        return {}
     except APIError as e:
         st.error(f"OpenAI API 호출 오류 (키워드 번역): {e}")
         return {}
@@ -101,21 +421,98 @@ def translate_keywords_to_korean(keywords: list) -> dict:
         st.error(f"키워드 번역 중 오류 발생: {e}")
         return {}
 
-def generate_ai_summary(text: str, grade_level: str, subject_type: str) -> str:
-    """교육과정별 맞춤 요약문 생성 (2022 개정 + 2015 개정)"""
-    if not OPENAI_OK or client is None:
-        return "GPT 요약 불가: API 오류"
-    if not text.strip():
-        return "GPT 요약 불가: 텍스트가 없습니다."
-    
-    curriculum_key = grade_level
-    if grade_level in ["고2", "고3"]:
-        curriculum_key = f"{grade_level}_{subject_type}"
+# 모범 요약 제약 검사 결과 (디버그용)
+_summary_constraint_stats = {"checked": 0, "passed_first": 0, "rewrites": 0, "fixed": 0, "trimmed": 0, "unfixed": 0}
+_summary_constraint_lock = threading.Lock()
+
+def _summary_constraint_snapshot() -> dict:
+    with _summary_constraint_lock:
+        return dict(_summary_constraint_stats)
+
+def _count_summary_constraint(name: str):
+    with _summary_constraint_lock:
+        _summary_constraint_stats[name] += 1
+
+def check_summary_constraints(summary: str, target_vocab, passage_words: set) -> dict:
+    """요약문 단어 수와 기준 어휘를 로컬에서 검사 (원문에 나온 단어는 기준 밖이어도 허용)
+
+    반환: {"word_count", "off_list_words", "violations": 위반 설명 목록}
+    """
+    word_count = count_words(summary)
+    off_list_words = sorted({
+        w for w in tokenize_words(summary)
+        if w not in passage_words and not in_vocabulary(w, target_vocab)
+    }) if target_vocab else []
+
+    violations = []
+    if word_count < SUMMARY_MIN_WORDS or word_count > SUMMARY_MAX_WORDS:
+        violations.append(f"현재 {word_count}단어 → {SUMMARY_MIN_WORDS}-{SUMMARY_MAX_WORDS}단어로 맞추기")
+    if len(off_list_words) > SUMMARY_MAX_OFF_LIST_WORDS:
+        violations.append(f"기준 어휘 밖 단어 ({', '.join(off_list_words)}) → 기본 어휘로 바꾸기")
+    return {"word_count": word_count, "off_list_words": off_list_words, "violations": violations}
+
+def _constraint_distance(check: dict) -> int:
+    """제약에서 벗어난 정도 (단어 수 초과/부족 + 허용 개수를 넘은 기준 밖 단어 수)"""
+    word_count = check["word_count"]
+    length_gap = max(0, SUMMARY_MIN_WORDS - word_count, word_count - SUMMARY_MAX_WORDS)
+    return length_gap + max(0, len(check["off_list_words"]) - SUMMARY_MAX_OFF_LIST_WORDS)
+
+def enforce_summary_constraints(client, summary: str, original_text: str, grade_level: str, vocabulary_reference: str, deadline: float = None) -> str:
+    """생성된 요약이 길이/어휘 제약을 어기면 위반 내용과 요약문만 보내 짧게 고쳐 쓰기를 요청 (최대 SUMMARY_MAX_REWRITES회)
+
+    고쳐 쓴 결과가 나빠지면 이전 결과를 유지하고, 끝까지 길면 절 경계에서 로컬로 줄입니다.
+    """
+    target_vocab = get_vocabulary_for_grade(grade_level, get_moe_vocabularies())
+    passage_words = set(tokenize_words(original_text))
+    check = check_summary_constraints(summary, target_vocab, passage_words)
+    _count_summary_constraint("checked")
+    if not check["violations"]:
+        _count_summary_constraint("passed_first")
+        return summary
+
+    for _ in range(SUMMARY_MAX_REWRITES):
+        violations = "\n".join(f"- {v}" for v in check["violations"])
+        prompt = f"""다음 영어 요약문을 아래 조건에 맞게 고쳐주세요. 뜻과 핵심 내용은 그대로 두고, 고친 요약문 한 문장만 출력해주세요.
+
+조건 위반:
+{violations}
+(어휘 기준: {grade_level} {vocabulary_reference})
+
+요약문: {summary}"""
+        try:
+            candidate = _chat_completion(client, prompt, "summary_rewrite", deadline)
+        except Exception as e:
+            # 카세트 누락은 그대로 알리고, 그 밖의 이유로 고쳐 쓰기가 실패하면 지금까지 가장 나은 요약을 유지
+            if _cassette_miss(e) is not None:
+                raise
+            break
+        _count_summary_constraint("rewrites")
+        candidate_check = check_summary_constraints(candidate, target_vocab, passage_words)
+        if _constraint_distance(candidate_check) >= _constraint_distance(check):
+            break
+        summary, check = candidate, candidate_check
+        if not check["violations"]:
+            _count_summary_constraint("fixed")
+            return summary
+
+    # 여전히 길면 API 없이 절 경계에서 줄임 (중간에서 자르지 않음)
+    if check["word_count"] > SUMMARY_MAX_WORDS:
+        trimmed = compress_sentence(summary, target_vocab, max_words=SUMMARY_MAX_WORDS, allow_truncate=False)
+        if trimmed and count_words(trimmed) >= SUMMARY_MIN_WORDS:
+            _count_summary_constraint("trimmed")
+            return trimmed
+    _count_summary_constraint("unfixed")
+    return summary
+
+def build_summary_prompt(text: str, grade_level: str, subject_type: str, prompt_text: str = None) -> str:
+    """모범 요약 프롬프트 (prompt_text: 긴 지문을 줄인 텍스트, 없으면 원문 사용, 교육과정 정보가 없으면 None)"""
+    curriculum_key = get_curriculum_key(grade_level, subject_type)
     
     curriculum_info = CURRICULUM_STANDARDS.get(curriculum_key)
-    
     if not curriculum_info:
-        return f"GPT 요약 불가: {grade_level} ({subject_type})에 대한 교육과정 정보가 없습니다."
+        return None
+    if prompt_text is None:
+        prompt_text = text
 
     curriculum_guide_parts = [
         f"{curriculum_info['curriculum_type']} - "
@@ -136,14 +533,17 @@ def generate_ai_summary(text: str, grade_level: str, subject_type: str) -> str:
     ])
     
     curriculum_guide = "\n".join(curriculum_guide_parts)
+    # 지문 난이도는 모델이 추정하지 않도록 로컬 분석 결과를 함께 전달
+    difficulty_info = format_profile_for_prompt(profile_passage(text), grade_level)
 
     prompt = f"""한국 고등학교 {grade_level} ({subject_type}) 영어과 교육과정에 따라 다음 텍스트를 정확히 15-20단어로 요약해주세요.
 
 {curriculum_guide}
+{difficulty_info}
 
 요약 시, 교육부 {grade_level} 수준에 맞는 어휘와 문법을 사용하고, 해당 학년 성취기준/성취수준에 부합하도록 작성해주세요.
 
-텍스트: {text}
+텍스트: {prompt_text}
 
 요구사항:
 - 정확히 15-20단어
@@ -151,36 +551,53 @@ def generate_ai_summary(text: str, grade_level: str, subject_type: str) -> str:
 - 핵심 아이디어 포함
 - 해당 학년 성취기준/성취수준에 부합
 - {curriculum_info['vocabulary_reference']} 어휘 수준 고려"""
-    
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3,
-            max_tokens=100
-        )
-        return response.choices[0].message.content.strip()
-    except APIError as e:
-        return f"GPT 요약 실패: OpenAI API 오류: {e}"
-    except Exception as e:
-        return f"GPT 요약 실패: {e}"
+    return prompt
 
-def provide_feedback(user_summary: str, original_text: str, grade_level: str, subject_type: str, all_vocabularies: dict) -> str:
-    """교육과정별 + 과목유형별 맞춤 피드백 제공 (2015/2022 어휘 통합 분석)"""
-    if not OPENAI_OK or client is None:
-        return "피드백 제공 불가: API 오류"
-    if not user_summary.strip():
-        return "피드백 제공 불가: 요약문이 없습니다."
+def generate_ai_summary(text: str, grade_level: str, subject_type: str, deadline: float = None) -> str:
+    """교육과정별 맞춤 요약문 생성 (2022 개정 + 2015 개정)"""
+    return generate_ai_summary_with_source(text, grade_level, subject_type, deadline)[0]
+
+def generate_ai_summary_with_source(text: str, grade_level: str, subject_type: str, deadline: float = None) -> tuple:
+    """교육과정별 맞춤 요약문과 출처를 반환
+
+    출처: "ai" (GPT 생성), "local" (API 장애로 로컬 추출 요약으로 대체), "error" (생성 실패 메시지)
+    """
+    if not text.strip():
+        return "GPT 요약 불가: 텍스트가 없습니다.", "error"
+    client = get_client()
+    if client is None:
+        # API 키가 없거나 클라이언트를 만들 수 없으면 로컬 요약으로 대체
+        local_summary = generate_local_summary(text, grade_level)
+        return (local_summary, "local") if local_summary else ("GPT 요약 불가: API 오류", "error")
+    from openai import APIError
+    if deadline is None:
+        deadline = make_deadline(AI_SUMMARY_DEADLINE_SECONDS)
     
-    curriculum_key = grade_level
-    if grade_level in ["고2", "고3"]:
-        curriculum_key = f"{grade_level}_{subject_type}"
+    curriculum_key = get_curriculum_key(grade_level, subject_type)
     
     curriculum_info = CURRICULUM_STANDARDS.get(curriculum_key)
-
+    
     if not curriculum_info:
-        return f"피드백 제공 불가: {grade_level} ({subject_type})에 대한 교육과정 정보가 없습니다."
+        return f"GPT 요약 불가: {grade_level} ({subject_type})에 대한 교육과정 정보가 없습니다.", "error"
 
+    try:
+        # 긴 지문은 조각별 부분 요약을 이어 붙인 텍스트로 최종 요약 (로컬 대체 요약은 원문 기준)
+        prompt_text, _ = condense_long_passage(text, deadline)
+        prompt = build_summary_prompt(text, grade_level, subject_type, prompt_text)
+        summary = _chat_completion(client, prompt, "summary", deadline)
+        return enforce_summary_constraints(client, summary, text, grade_level, curriculum_info['vocabulary_reference'], deadline), "ai"
+    except _fallback_errors() as e:
+        local_summary = generate_local_summary(text, grade_level)
+        if local_summary:
+            return local_summary, "local"
+        return f"GPT 요약 실패: {e}", "error"
+    except APIError as e:
+        return f"GPT 요약 실패: OpenAI API 오류: {e}", "error"
+    except Exception as e:
+        return f"GPT 요약 실패: {e}", "error"
+
+def _build_feedback_curriculum_context(curriculum_key: str, curriculum_info: dict, subject_type: str) -> str:
+    """피드백 프롬프트용 교육과정 기준 설명"""
     curriculum_context_parts = [
         f"{curriculum_info['curriculum_type']} - "
     ]
@@ -196,7 +613,27 @@ def provide_feedback(user_summary: str, original_text: str, grade_level: str, su
                 curriculum_context_parts.append(f"- {sub_name}: {sub_desc}")
         curriculum_context_parts.append(curriculum_info['assessment_tips'])
     
-    curriculum_context = "\n".join(curriculum_context_parts)
+    return "\n".join(curriculum_context_parts)
+
+def provide_feedback(user_summary: str, original_text: str, grade_level: str, subject_type: str, all_vocabularies: dict, deadline: float = None) -> str:
+    """교육과정별 + 과목유형별 맞춤 피드백 제공 (2015/2022 어휘 통합 분석)"""
+    client = get_client()
+    if client is None:
+        return "피드백 제공 불가: API 오류"
+    from openai import APIError
+    if not user_summary.strip():
+        return "피드백 제공 불가: 요약문이 없습니다."
+    if deadline is None:
+        deadline = make_deadline(AI_FEEDBACK_DEADLINE_SECONDS)
+    
+    curriculum_key = get_curriculum_key(grade_level, subject_type)
+    
+    curriculum_info = CURRICULUM_STANDARDS.get(curriculum_key)
+
+    if not curriculum_info:
+        return f"피드백 제공 불가: {grade_level} ({subject_type})에 대한 교육과정 정보가 없습니다."
+
+    curriculum_context = _build_feedback_curriculum_context(curriculum_key, curriculum_info, subject_type)
 
     # 해당 학년에 맞는 어휘 집합 가져오기
     target_vocab = get_vocabulary_for_grade(grade_level, all_vocabularies)
@@ -213,15 +650,28 @@ def provide_feedback(user_summary: str, original_text: str, grade_level: str, su
 - 2022년 기준 어휘: {vocab_analysis['vocab_2022_words']}개 ({vocab_analysis['vocab_2022_ratio']:.1%})
 """
     
+    misspellings = check_spelling(user_summary, original_text)
     if vocab_analysis['non_target_examples']:
         vocab_feedback_info += f"- 기준 외 어휘 예시: {', '.join(vocab_analysis['non_target_examples'][:5])} (최대 5개)"
+    if misspellings:
+        vocab_feedback_info += f"\n- 철자 오류 의심 (로컬 확인): {', '.join(m['word'] + ' → ' + m['suggestions'][0] for m in misspellings)}"
+    # 원문 그대로 옮긴 구간은 모델이 대조하지 않도록 로컬에서 찾아 전달
+    copy_info = format_copy_check_for_prompt(detect_copied_spans(user_summary, original_text))
+    if copy_info:
+        vocab_feedback_info += f"\n- {copy_info}"
+
+    try:
+        # 긴 지문은 원문 대신 단락별 부분 요약을 전달 (모범 요약 생성 때 만든 조각 요약을 캐시에서 재사용)
+        passage_text, condense_info = condense_long_passage(original_text, deadline)
+        passage_label = "원문 (긴 지문이라 단락별 요약으로 대체)" if condense_info["levels"] else "원문"
 
-    prompt = f"""다음은 한국 {grade_level} ({subject_type}) 영어교사가 작성한 요약문입니다. 해당 교육과정 기준에 따라 평가해주세요:
+        prompt = f"""다음은 한국 {grade_level} ({subject_type}) 영어교사가 작성한 요약문입니다. 해당 교육과정 기준에 따라 평가해주세요:
 
 {curriculum_context}
+{format_profile_for_prompt(profile_passage(original_text), grade_level)}
 {vocab_feedback_info}
 
-원문: {original_text}
+{passage_label}: {passage_text}
 
 교사 요약문: {user_summary}
 
@@ -237,15 +687,136 @@ def provide_feedback(user_summary: str, original_text: str, grade_level: str, su
 8.  **어휘 분석**: 2015년/2022년 교육부 기본 어휘 기준 적절성
 
 특목고.자사고와 일반고의 차이, 교육과정 전환기 특성을 고려하여 실용적인 개선 방안을 제시해주세요."""
+        return _chat_completion(client, prompt, "feedback", deadline)
+    except _fallback_errors() as e:
+        return _local_feedback(user_summary, vocab_analysis, extract_keywords(original_text, 5), e)
+    except APIError as e:
+        return f"피드백 생성 실패: OpenAI API 오류: {e}"
+    except Exception as e:
+        return f"피드백 생성 실패: {e}"
+
+def _condense_feedback(feedback: str, max_chars: int = REVISION_CONTEXT_MAX_CHARS) -> str:
+    """이전 피드백에서 마크다운 장식을 걷어내고 길이를 제한"""
+    lines = []
+    for line in feedback.splitlines():
+        line = line.strip().replace("**", "").lstrip("#").strip()
+        if line:
+            lines.append(line)
+    condensed = "\n".join(lines)
+    if len(condensed) > max_chars:
+        condensed = condensed[:max_chars].rstrip() + " ..."
+    return condensed
+
+def provide_revision_feedback(previous_summary: str, revised_summary: str, previous_feedback: str, ai_summary: str, keywords: list, grade_level: str, subject_type: str, all_vocabularies: dict, deadline: float = None) -> str:
+    """수정된 요약문에 대한 비교 피드백 (원문 대신 이전 피드백 맥락과 변경 내용만 전송)"""
+    client = get_client()
+    if client is None:
+        return "수정 피드백 제공 불가: API 오류"
+    from openai import APIError
+    if not revised_summary.strip():
+        return "수정 피드백 제공 불가: 수정된 요약문이 없습니다."
+    if revised_summary.strip() == previous_summary.strip():
+        return "수정 피드백 제공 불가: 이전 요약문과 달라진 내용이 없습니다."
+    if deadline is None:
+        deadline = make_deadline(AI_FEEDBACK_DEADLINE_SECONDS)
+    
+    curriculum_key = get_curriculum_key(grade_level, subject_type)
+    
+    curriculum_info = CURRICULUM_STANDARDS.get(curriculum_key)
+    
+    if not curriculum_info:
+        return f"수정 피드백 제공 불가: {grade_level} ({subject_type})에 대한 교육과정 정보가 없습니다."
+    
+    # 수정 전후 어휘 분석 (로컬 계산)
+    target_vocab = get_vocabulary_for_grade(grade_level, all_vocabularies)
+    before = analyze_vocabulary_level(previous_summary, target_vocab, all_vocabularies)
+    after = analyze_vocabulary_level(revised_summary, target_vocab, all_vocabularies)
+    
+    prompt = f"""한국 {grade_level} ({subject_type}) 영어교사가 이전 피드백을 반영해 요약문을 수정했습니다. 원문은 이미 평가되었으므로 변경 사항만 비교 평가해주세요.
+
+기준: {curriculum_info['curriculum_type']}, {curriculum_info['summary_level_desc']}, {curriculum_info['vocabulary_reference']}
+핵심 키워드: {', '.join(keywords) if keywords else '없음'}
+AI 모범 요약: {ai_summary}
+
+이전 피드백 요지:
+{_condense_feedback(previous_feedback)}
+
+변경 내용 ([-삭제-] {{+추가+}}):
+{summary_word_diff(previous_summary, revised_summary)}
+
+수정 전후 지표:
+- 단어 수: {count_words(previous_summary)} → {count_words(revised_summary)} (기준 15-20단어)
+- 기준 어휘 비율: {before['target_vocab_ratio']:.0%} → {after['target_vocab_ratio']:.0%}
+- 기준 외 어휘: {before['non_target_vocab_words']}개 → {after['non_target_vocab_words']}개
+
+다음 형식으로 짧게 답해주세요:
+판정: 개선 / 비슷함 / 후퇴 중 하나
+- 좋아진 점 (1줄)
+- 남은 문제 (1줄)
+- 다음 수정 제안 (1줄)"""
     
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.2,
-            max_tokens=1500
-        )
-        return response.choices[0].message.content.strip()
+        return _chat_completion(client, prompt, "revision_feedback", deadline)
+    except _fallback_errors() as e:
+        return _local_feedback(revised_summary, after, keywords, e)
+    except APIError as e:
+        return f"수정 피드백 생성 실패: OpenAI API 오류: {e}"
+    except Exception as e:
+        return f"수정 피드백 생성 실패: {e}"
+
+def build_class_feedback_context(original_text: str, grade_level: str, subject_type: str, keywords: list, ai_summary: str):
+    """학급 일괄 피드백용 공통 프롬프트 앞부분 (지문/교육과정/키워드/모범 요약을 한 번만 구성)
+
+    교육과정 정보가 없으면 None을 반환합니다.
+    """
+    curriculum_key = get_curriculum_key(grade_level, subject_type)
+    
+    curriculum_info = CURRICULUM_STANDARDS.get(curriculum_key)
+    if not curriculum_info:
+        return None
+    
+    curriculum_context = _build_feedback_curriculum_context(curriculum_key, curriculum_info, subject_type)
+    
+    # 모든 학생 요청이 같은 앞부분을 공유하도록 학생별 내용은 뒤에 붙임
+    return f"""다음은 한국 {grade_level} ({subject_type}) 학생이 영어 지문을 15-20단어로 요약한 것입니다. 해당 교육과정 기준에 따라 간단히 평가해주세요:
+
+{curriculum_context}
+{format_profile_for_prompt(profile_passage(original_text), grade_level)}
+
+원문: {original_text}
+
+핵심 키워드: {', '.join(keywords) if keywords else '없음'}
+AI 모범 요약 (참고용): {ai_summary}
+"""
+
+def provide_student_feedback(student_summary: str, shared_context: str, vocab_analysis: dict, keywords: list = None, deadline: float = None, copy_check: dict = None) -> str:
+    """학급 일괄 분석에서 학생 요약문 한 편에 대한 짧은 피드백 (copy_check: 원문 복사 확인 결과)"""
+    client = get_client()
+    if client is None:
+        return "피드백 제공 불가: API 오류"
+    from openai import APIError
+    if not student_summary.strip():
+        return "피드백 제공 불가: 요약문이 없습니다."
+    if not shared_context:
+        return "피드백 제공 불가: 교육과정 정보가 없습니다."
+    if deadline is None:
+        deadline = make_deadline(AI_FEEDBACK_DEADLINE_SECONDS)
+    
+    prompt = f"""{shared_context}
+학생 요약문: {student_summary}
+(단어 수 {count_words(student_summary)}개, 기준 어휘 비율 {vocab_analysis.get('target_vocab_ratio', 0):.0%}, 기준 외 어휘: {', '.join(vocab_analysis.get('non_target_examples', [])[:5]) or '없음'})
+{format_copy_check_for_prompt(copy_check)}
+
+다음 형식으로 3줄 이내로 답해주세요:
+- 잘한 점
+- 고칠 점 (내용/문법/어휘/길이 중 가장 중요한 것)
+- 수정 예시 한 문장"""
+    
+    try:
+        return _chat_completion(client, prompt, "class_feedback", deadline)
+    except _fallback_errors() as e:
+        # 표 한 칸에 들어가도록 자동 점검 항목만 한 줄로
+        return "[자동 점검] " + " / ".join(line[2:] for line in _local_feedback_lines(student_summary, vocab_analysis, keywords or []))
     except APIError as e:
         return f"피드백 생성 실패: OpenAI API 오류: {e}"
     except Exception as e:
@@ -0,0 +1,290 @@
+# analysis_api.py
+import argparse
+import asyncio
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+from ai_services import (
+    FAILED_FEEDBACK_PREFIXES, LOCAL_FEEDBACK_PREFIX, OPENAI_OK, generate_ai_summary_with_source, provide_feedback,
+    make_deadline, is_ai_degraded, get_openai_request_stats
+)
+from data_config import (
+    CURRICULUM_STANDARDS, AI_SUMMARY_DEADLINE_SECONDS, AI_FEEDBACK_DEADLINE_SECONDS,
+    ANALYSIS_API_HOST, ANALYSIS_API_PORT, ANALYSIS_API_MAX_CONCURRENT_AI, ANALYSIS_API_MAX_QUEUED_AI,
+    ANALYSIS_API_WORKER_THREADS, ANALYSIS_API_MAX_BODY_BYTES, ANALYSIS_API_IDLE_TIMEOUT_SECONDS, get_curriculum_key
+)
+from spelling_index import check_spelling, get_english_words, get_spelling_index
+from utils import extract_keywords
+from vocabulary_loader import get_vocabulary_for_grade, analyze_vocabulary_level, get_moe_vocabularies, suggest_synonyms
+
+class ApiError(Exception):
+    """HTTP 오류 응답으로 돌려줄 요청 오류"""
+
+    def __init__(self, status: HTTPStatus, message: str, headers: dict = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+def _require_text(body: dict, name: str) -> str:
+    value = body.get(name)
+    if not isinstance(value, str) or not value.strip():
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"'{name}' 문자열이 필요합니다.")
+    return value
+
+def _require_curriculum(body: dict) -> tuple:
+    """grade_level/subject_type을 검사해 교육과정 정보가 있는 조합인지 확인"""
+    grade_level = _require_text(body, "grade_level")
+    subject_type = body.get("subject_type") or "일반선택+진로선택"
+    if get_curriculum_key(grade_level, subject_type) not in CURRICULUM_STANDARDS:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"{grade_level} ({subject_type})에 대한 교육과정 정보가 없습니다.")
+    return grade_level, subject_type
+
+def handle_keywords(body: dict) -> dict:
+    top_n = body.get("top_n", 5)
+    if not isinstance(top_n, int) or not 1 <= top_n <= 20:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "'top_n'은 1-20 사이 정수여야 합니다.")
+    return {"keywords": extract_keywords(_require_text(body, "text"), top_n)}
+
+def handle_vocabulary(body: dict) -> dict:
+    text = _require_text(body, "text")
+    grade_level, _ = _require_curriculum(body)
+    all_vocabularies = get_moe_vocabularies()
+    target_vocab = get_vocabulary_for_grade(grade_level, all_vocabularies)
+    analysis = analyze_vocabulary_level(text, target_vocab, all_vocabularies)
+    return {**analysis, "synonym_suggestions": suggest_synonyms(analysis["non_target_examples"], target_vocab, all_vocabularies)}
+
+def handle_spelling(body: dict) -> dict:
+    passage = body.get("passage", "")
+    if not isinstance(passage, str):
+        raise ApiError(HTTPStatus.BAD_REQUEST, "'passage'는 문자열이어야 합니다.")
+    return {"misspellings": check_spelling(_require_text(body, "text"), passage)}
+
+def handle_summary(body: dict) -> dict:
+    text = _require_text(body, "text")
+    grade_level, subject_type = _require_curriculum(body)
+    summary, source = generate_ai_summary_with_source(text, grade_level, subject_type, make_deadline(AI_SUMMARY_DEADLINE_SECONDS))
+    if source == "error":
+        raise ApiError(HTTPStatus.BAD_GATEWAY, summary)
+    return {"summary": summary, "source": source}
+
+def handle_feedback(body: dict) -> dict:
+    summary = _require_text(body, "summary")
+    text = _require_text(body, "text")
+    grade_level, subject_type = _require_curriculum(body)
+    feedback = provide_feedback(summary, text, grade_level, subject_type, get_moe_vocabularies(), make_deadline(AI_FEEDBACK_DEADLINE_SECONDS))
+    # API 장애 시 자동 점검 결과는 출처를 표시해 반환 (요약과 같은 방식)
+    if feedback.startswith(LOCAL_FEEDBACK_PREFIX):
+        return {"feedback": feedback, "source": "local"}
+    if feedback.startswith(FAILED_FEEDBACK_PREFIXES):
+        raise ApiError(HTTPStatus.BAD_GATEWAY, feedback)
+    return {"feedback": feedback, "source": "ai"}
+
+# 경로 → (처리 함수, OpenAI 호출 여부)
+ROUTES = {
+    "/v1/keywords": (handle_keywords, False),
+    "/v1/vocabulary": (handle_vocabulary, False),
+    "/v1/spelling": (handle_spelling, False),
+    "/v1/summary": (handle_summary, True),
+    "/v1/feedback": (handle_feedback, True),
+}
+
+class AnalysisApiServer:
+    """키워드/어휘 분석, 모범 요약, 피드백을 JSON으로 제공하는 asyncio HTTP/1.1 서버 (keep-alive 지원)
+
+    처리 함수는 스레드 풀에서 실행되며 어휘 색인과 OpenAI 클라이언트는 프로세스 전체에서 공유합니다.
+    OpenAI를 호출하는 요청은 max_concurrent_ai개까지 동시에 처리하고, 대기가 max_queued_ai개를 넘으면 503으로 거절합니다.
+    """
+
+    def __init__(self, host: str = ANALYSIS_API_HOST, port: int = ANALYSIS_API_PORT,
+                 max_concurrent_ai: int = ANALYSIS_API_MAX_CONCURRENT_AI, max_queued_ai: int = ANALYSIS_API_MAX_QUEUED_AI,
+                 worker_threads: int = ANALYSIS_API_WORKER_THREADS):
+        self.host = host
+        self.port = port
+        self.max_concurrent_ai = max_concurrent_ai
+        self.max_queued_ai = max_queued_ai
+        # AI 요청이 모두 진행 중이어도 키워드/어휘 분석이 처리되도록 스레드를 더 둠
+        self._executor = ThreadPoolExecutor(max_workers=max(worker_threads, max_concurrent_ai + 4), thread_name_prefix="analysis-api")
+        self._ai_slots = None
+        self._ai_waiting = 0
+        self._server = None
+        self._started_at = time.monotonic()
+        self._stats = {"requests": 0, "errors": 0, "rejected": 0, "in_flight": 0, "by_route": {}}
+
+    async def start(self):
+        self._ai_slots = asyncio.Semaphore(self.max_concurrent_ai)
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        # port 0이면 실제로 할당된 포트로 갱신
+        self.port = self._server.sockets[0].getsockname()[1]
+        # 첫 요청이 기다리지 않도록 어휘/철자 색인을 미리 로드
+        await asyncio.get_running_loop().run_in_executor(self._executor, get_spelling_index)
+        await asyncio.get_running_loop().run_in_executor(self._executor, get_english_words)
+        return self
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> dict:
+        """서버 요청 수/오류/거절/경로별 평균 처리 시간"""
+        by_route = {
+            path: {"requests": s["requests"], "avg_ms": round(1000 * s["seconds"] / s["requests"]) if s["requests"] else 0}
+            for path, s in self._stats["by_route"].items()
+        }
+        return {
+            "uptime_seconds": round(time.monotonic() - self._started_at),
+            "requests": self._stats["requests"],
+            "errors": self._stats["errors"],
+            "rejected": self._stats["rejected"],
+            "in_flight": self._stats["in_flight"],
+            "ai_waiting": self._ai_waiting,
+            "by_route": by_route
+        }
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), ANALYSIS_API_IDLE_TIMEOUT_SECONDS)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+                try:
+                    keep_alive = await self._handle_request(head, reader, writer)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                if not keep_alive:
+                    return
+        finally:
+            writer.close()
+
+    async def _handle_request(self, head: bytes, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        """요청 하나를 처리하고 연결을 유지할지 반환"""
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ", 2)
+        except ValueError:
+            await self._send(writer, HTTPStatus.BAD_REQUEST, {"error": "잘못된 요청 줄입니다."}, keep_alive=False)
+            return False
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            length = -1
+        if length < 0 or length > ANALYSIS_API_MAX_BODY_BYTES:
+            await self._send(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "요청 본문이 너무 큽니다."}, keep_alive=False)
+            return False
+        raw_body = await reader.readexactly(length) if length else b""
+
+        start = time.monotonic()
+        self._stats["requests"] += 1
+        self._stats["in_flight"] += 1
+        path = target.split("?", 1)[0]
+        try:
+            status, payload, extra_headers = await self._dispatch(method, path, raw_body)
+        finally:
+            self._stats["in_flight"] -= 1
+        if status >= 400:
+            self._stats["errors"] += 1
+        if path in ROUTES:
+            route_stats = self._stats["by_route"].setdefault(path, {"requests": 0, "seconds": 0.0})
+            route_stats["requests"] += 1
+            route_stats["seconds"] += time.monotonic() - start
+
+        await self._send(writer, status, payload, keep_alive, extra_headers)
+        return keep_alive
+
+    async def _dispatch(self, method: str, path: str, raw_body: bytes) -> tuple:
+        """(상태 코드, 응답 JSON, 추가 헤더)"""
+        if path == "/health" and method == "GET":
+            return HTTPStatus.OK, {"status": "ok", "ai_available": OPENAI_OK, "ai_degraded": is_ai_degraded()}, {}
+        if path == "/stats" and method == "GET":
+            return HTTPStatus.OK, {"server": self.stats(), "openai": get_openai_request_stats()}, {}
+        if path not in ROUTES:
+            return HTTPStatus.NOT_FOUND, {"error": f"없는 경로입니다: {path}"}, {}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "POST 요청만 지원합니다."}, {"Allow": "POST"}
+
+        try:
+            body = json.loads(raw_body or b"{}")
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, {"error": "JSON 본문을 읽을 수 없습니다."}, {}
+        if not isinstance(body, dict):
+            return HTTPStatus.BAD_REQUEST, {"error": "JSON 객체가 필요합니다."}, {}
+
+        handler, uses_ai = ROUTES[path]
+        loop = asyncio.get_running_loop()
+        try:
+            if not uses_ai:
+                return HTTPStatus.OK, await loop.run_in_executor(self._executor, handler, body), {}
+            # OpenAI 호출 요청은 동시 처리 수를 제한하고, 대기열이 가득 차면 바로 거절
+            if self._ai_slots.locked() and self._ai_waiting >= self.max_queued_ai:
+                self._stats["rejected"] += 1
+                raise ApiError(HTTPStatus.SERVICE_UNAVAILABLE, "요청이 많아 잠시 후 다시 시도해주세요.", {"Retry-After": "1"})
+            self._ai_waiting += 1
+            try:
+                await self._ai_slots.acquire()
+            finally:
+                self._ai_waiting -= 1
+            try:
+                return HTTPStatus.OK, await loop.run_in_executor(self._executor, handler, body), {}
+            finally:
+                self._ai_slots.release()
+        except ApiError as e:
+            return e.status, {"error": str(e)}, e.headers
+        except Exception as e:
+            logging.getLogger(__name__).exception("분석 API 처리 오류")
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"처리 중 오류 발생: {e}"}, {}
+
+    async def _send(self, writer: asyncio.StreamWriter, status: int, payload: dict, keep_alive: bool, extra_headers: dict = None):
+        status = HTTPStatus(status)
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        headers = {
+            "Content-Type": "application/json; charset=utf-8",
+            "Content-Length": str(len(data)),
+            "Connection": "keep-alive" if keep_alive else "close",
+            **(extra_headers or {})
+        }
+        head = f"HTTP/1.1 {status.value} {status.phrase}\r\n" + "".join(f"{k}: {v}\r\n" for k, v in headers.items()) + "\r\n"
+        writer.write(head.encode("latin-1") + data)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+async def _serve(args):
+    server = await AnalysisApiServer(args.host, args.port, args.max_concurrent_ai, args.max_queued_ai, args.worker_threads).start()
+    print(f"분석 API 실행 중: http://{server.host}:{server.port} (AI 동시 처리 {server.max_concurrent_ai}건)", flush=True)
+    await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Streamlit 없이 키워드/어휘 분석, 모범 요약, 피드백을 제공하는 JSON HTTP API")
+    parser.add_argument("--host", default=ANALYSIS_API_HOST)
+    parser.add_argument("--port", type=int, default=ANALYSIS_API_PORT)
+    parser.add_argument("--max-concurrent-ai", type=int, default=ANALYSIS_API_MAX_CONCURRENT_AI)
+    parser.add_argument("--max-queued-ai", type=int, default=ANALYSIS_API_MAX_QUEUED_AI)
+    parser.add_argument("--worker-threads", type=int, default=ANALYSIS_API_WORKER_THREADS)
+    args = parser.parse_args()
+
+    # Streamlit 실행 환경 밖에서 st.* 호출 시 나오는 경고는 서버 로그에서 제외
+    logging.getLogger("streamlit.runtime.scriptrunner.script_run_context").setLevel(logging.ERROR)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# analysis_api_bench.py
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BENCH_PASSAGE = (
+    "Cities around the world are growing quickly. Many people move to cities to find better jobs. "
+    "They also look for education for their children. However, rapid growth causes problems such as traffic and pollution. "
+    "Governments must plan carefully to make cities good places to live."
+)
+BENCH_SUMMARY = "Cities grow fast because people want jobs and schools, but growth causes traffic and pollution that need careful plans."
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+class FakeModelHandler(BaseHTTPRequestHandler):
+    """Chat Completions 형식으로 고정 응답을 지연 시간 후 돌려주는 가짜 모델 서버"""
+    protocol_version = "HTTP/1.1"
+    delay_seconds = 0.0
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(self.delay_seconds)
+        content = "Cities grow quickly as people seek jobs and schools, but growth brings traffic and pollution problems."
+        response = {
+            "id": "bench", "object": "chat.completion", "created": 0, "model": body.get("model"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120}
+        }
+        data = json.dumps(response).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+def start_fake_model_server(delay_seconds: float) -> ThreadingHTTPServer:
+    handler = type("BenchModelHandler", (FakeModelHandler,), {"delay_seconds": delay_seconds})
+    server = ThreadingHTTPServer(("127.0.0.1", _free_port()), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def start_api_server(port: int, model_port: int, max_concurrent_ai: int) -> subprocess.Popen:
+    """가짜 모델 서버를 보도록 환경 변수를 지정해 분석 API를 별도 프로세스로 실행"""
+    env = {
+        **os.environ,
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{model_port}/v1",
+        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "bench"),
+    }
+    env.pop("OPENAI_CASSETTE_MODE", None)
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "analysis_api.py"),
+         "--port", str(port), "--max-concurrent-ai", str(max_concurrent_ai)],
+        env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    # 시작 메시지가 나올 때까지 대기 (어휘 색인 로드 포함)
+    line = process.stdout.readline()
+    if not line:
+        raise SystemExit("분석 API 서버 시작 실패")
+    return process
+
+def _percentile(values: list, ratio: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * ratio))] if values else 0.0
+
+def run_load(port: int, endpoint: str, requests: int, concurrency: int, same_text: bool) -> dict:
+    """concurrency개 연결(keep-alive)로 requests건을 보내고 처리량/지연 시간 집계"""
+    local = threading.local()
+    latencies = []
+    statuses = Counter()
+    lock = threading.Lock()
+
+    def one(i):
+        if not hasattr(local, "connection"):
+            local.connection = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+        # 같은 지문이면 동시 요청이 합쳐지므로 기본은 요청마다 지문을 조금씩 바꿈
+        text = BENCH_PASSAGE if same_text else f"{BENCH_PASSAGE} Report number {i} was published."
+        body = {"text": text, "grade_level": "고1", "subject_type": "일반선택+진로선택"}
+        if endpoint == "feedback":
+            body["summary"] = BENCH_SUMMARY
+        start = time.monotonic()
+        local.connection.request("POST", f"/v1/{endpoint}", json.dumps(body), {"Content-Type": "application/json"})
+        response = local.connection.getresponse()
+        response.read()
+        elapsed = time.monotonic() - start
+        with lock:
+            latencies.append(elapsed)
+            statuses[response.status] += 1
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    wall = time.monotonic() - start
+    return {
+        "endpoint": endpoint,
+        "requests": requests,
+        "concurrency": concurrency,
+        "seconds": round(wall, 2),
+        "requests_per_second": round(requests / wall, 1),
+        "p50_ms": round(1000 * _percentile(latencies, 0.5)),
+        "p95_ms": round(1000 * _percentile(latencies, 0.95)),
+        "status": dict(statuses)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 모델 서버를 상대로 분석 API 처리량 측정")
+    parser.add_argument("--endpoints", default="keywords,vocabulary,summary,feedback")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--model-delay", type=float, default=0.5, help="가짜 모델 응답 지연 (초)")
+    parser.add_argument("--max-concurrent-ai", type=int, default=16)
+    parser.add_argument("--same-text", action="store_true", help="모든 요청에 같은 지문 사용 (동시 요청 합치기 확인용)")
+    args = parser.parse_args()
+
+    model_server = start_fake_model_server(args.model_delay)
+    port = _free_port()
+    api = start_api_server(port, model_server.server_address[1], args.max_concurrent_ai)
+    try:
+        for endpoint in args.endpoints.split(","):
+            result = run_load(port, endpoint.strip(), args.requests, args.concurrency, args.same_text)
+            print(json.dumps(result, ensure_ascii=False))
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+        connection.request("GET", "/stats")
+        print(json.dumps(json.loads(connection.getresponse().read())["server"], ensure_ascii=False))
+    finally:
+        api.terminate()
+        api.wait()
+        model_server.shutdown()
+
+if __name__ == "__main__":
+    main()
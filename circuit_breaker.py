@@ -0,0 +1,91 @@
+# circuit_breaker.py
+import threading
+import time
+
+class CircuitOpenError(Exception):
+    """차단기가 열려 있어 호출하지 않고 바로 실패"""
+
+class CircuitBreaker:
+    """연속 실패/지연 응답이 쌓이면 호출을 차단하고, 일정 시간 후 시험 호출로 복구 여부를 확인
+
+    - closed: 정상 호출 (연속 실패 또는 느린 응답이 failure_threshold회 이상이면 open)
+    - open: open_seconds 동안 호출하지 않고 바로 CircuitOpenError
+    - half_open: 시험 호출 한 건만 허용 (성공하면 closed, 실패하면 다시 open)
+    """
+
+    def __init__(self, name: str, failure_threshold: int, slow_call_seconds: float, open_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self._state = "closed"
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self._trips = 0
+        self._rejected = 0
+        self._last_error = ""
+
+    def _refresh_locked(self):
+        if self._state == "open" and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = "half_open"
+            self._probe_in_flight = False
+
+    def _trip_locked(self):
+        self._state = "open"
+        self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+        self._trips += 1
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh_locked()
+            return self._state
+
+    def before_call(self):
+        """호출 가능 여부 확인 (차단 중이면 CircuitOpenError)"""
+        with self._lock:
+            self._refresh_locked()
+            if self._state == "closed":
+                return
+            if self._state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            self._rejected += 1
+            remaining = max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+            raise CircuitOpenError(f"{self.name} 일시 차단 중 (약 {remaining:.0f}초 후 재시도)")
+
+    def record_success(self, elapsed_seconds: float, slow_call_seconds: float = None):
+        """성공한 호출 기록 (느린 응답은 실패로 셈, slow_call_seconds로 호출별 기준 지정 가능)"""
+        with self._lock:
+            if elapsed_seconds > (slow_call_seconds or self.slow_call_seconds):
+                self._record_failure_locked(f"느린 응답 ({elapsed_seconds:.1f}초)")
+                return
+            self._state = "closed"
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self, error: str = ""):
+        """실패한 호출 기록"""
+        with self._lock:
+            self._record_failure_locked(error)
+
+    def _record_failure_locked(self, error: str):
+        self._last_error = error
+        self._consecutive_failures += 1
+        if self._state == "half_open" or self._consecutive_failures >= self.failure_threshold:
+            self._trip_locked()
+
+    def stats(self) -> dict:
+        """차단기 상태"""
+        with self._lock:
+            self._refresh_locked()
+            return {
+                "state": self._state,
+                "consecutive_failures": self._consecutive_failures,
+                "trips": self._trips,
+                "rejected": self._rejected,
+                "last_error": self._last_error
+            }
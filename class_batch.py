@@ -0,0 +1,132 @@
+# class_batch.py
+import csv
+import io
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from ai_services import build_class_feedback_context, provide_student_feedback
+from copy_detection import detect_copied_spans
+from data_config import CLASS_BATCH_MAX_SUMMARIES, CLASS_BATCH_MAX_CONCURRENCY, SUMMARY_MIN_WORDS, SUMMARY_MAX_WORDS
+from utils import count_words
+from vocabulary_loader import get_vocabulary_for_grade, analyze_vocabulary_batch
+
+# 결과 표 / CSV 열 순서
+CLASS_BATCH_COLUMNS = [
+    "번호", "학생", "요약문", "단어 수", "길이 적합", "기준 어휘 비율", "기준 외 어휘 수", "기준 외 어휘 예시", "원문 복사 비율", "AI 피드백"
+]
+
+NAME_COLUMNS = ("이름", "학생", "name", "student")
+SUMMARY_COLUMNS = ("요약", "요약문", "summary")
+
+def parse_student_summaries(text: str) -> list:
+    """붙여넣은 학생 요약문 파싱 (한 줄에 한 편, '이름<TAB>요약' 또는 '이름 | 요약' 형식 지원)"""
+    students = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        for separator in ("\t", " | "):
+            if separator in line:
+                name, summary = line.split(separator, 1)
+                students.append({"student": name.strip(), "summary": summary.strip()})
+                break
+        else:
+            students.append({"student": "", "summary": line})
+    return students
+
+def parse_student_summary_file(data: bytes) -> list:
+    """업로드한 CSV/TXT 파일에서 학생 요약문 목록 읽기 (이름/요약 열 자동 인식)"""
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        text = data.decode("cp949")
+
+    rows = [row for row in csv.reader(io.StringIO(text)) if any(cell.strip() for cell in row)]
+    if not rows:
+        return []
+    if max(len(row) for row in rows) == 1:
+        return parse_student_summaries(text)
+
+    header = [cell.strip().lower() for cell in rows[0]]
+    name_index = next((i for i, cell in enumerate(header) if cell in NAME_COLUMNS), None)
+    summary_index = next((i for i, cell in enumerate(header) if cell in SUMMARY_COLUMNS), None)
+    if summary_index is None:
+        # 헤더가 없으면 첫 열 이름, 둘째 열 요약으로 간주
+        name_index, summary_index = 0, 1
+    else:
+        rows = rows[1:]
+
+    students = []
+    for row in rows:
+        summary = row[summary_index].strip() if summary_index < len(row) else ""
+        if not summary:
+            continue
+        name = row[name_index].strip() if name_index is not None and name_index < len(row) else ""
+        students.append({"student": name, "summary": summary})
+    return students
+
+def run_class_batch(students: list, original_text: str, grade_level: str, subject_type: str, keywords: list, ai_summary: str, all_vocabularies: dict, include_feedback: bool = True, max_concurrency: int = CLASS_BATCH_MAX_CONCURRENCY, progress_callback=None) -> list:
+    """학생 요약문 전체를 분석 (어휘 분석은 한 번에, AI 피드백은 동시 요청 수를 제한해 병렬 처리)
+
+    progress_callback(완료 수, 전체 수)는 호출한 스레드에서 실행됩니다.
+    """
+    students = students[:CLASS_BATCH_MAX_SUMMARIES]
+    summaries = [student["summary"] for student in students]
+
+    target_vocab = get_vocabulary_for_grade(grade_level, all_vocabularies)
+    analyses = analyze_vocabulary_batch(summaries, target_vocab, all_vocabularies)
+    # 지문 n-gram 색인은 한 번만 만들고 학생마다 재사용
+    copy_checks = [detect_copied_spans(summary, original_text) for summary in summaries]
+
+    rows = []
+    for index, (student, analysis, copy_check) in enumerate(zip(students, analyses, copy_checks), 1):
+        word_count = count_words(student["summary"])
+        rows.append({
+            "번호": index,
+            "학생": student["student"] or f"학생 {index}",
+            "요약문": student["summary"],
+            "단어 수": word_count,
+            "길이 적합": "O" if SUMMARY_MIN_WORDS <= word_count <= SUMMARY_MAX_WORDS else "X",
+            "기준 어휘 비율": f"{analysis['target_vocab_ratio']:.0%}",
+            "기준 외 어휘 수": analysis["non_target_vocab_words"],
+            "기준 외 어휘 예시": ", ".join(analysis["non_target_examples"][:5]),
+            "원문 복사 비율": f"{copy_check['copied_ratio']:.0%}",
+            "AI 피드백": ""
+        })
+
+    if not include_feedback or not rows:
+        if progress_callback:
+            progress_callback(len(rows), len(rows))
+        return rows
+
+    # 지문/교육과정/키워드/모범 요약은 모든 학생이 공유
+    shared_context = build_class_feedback_context(original_text, grade_level, subject_type, keywords, ai_summary)
+
+    # 작업 스레드에서도 st.* 호출이 현재 세션에 표시되도록 실행 컨텍스트 전달
+    script_ctx = get_script_run_ctx()
+    completed = 0
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency), initializer=lambda: add_script_run_ctx(ctx=script_ctx)) as executor:
+        futures = {
+            executor.submit(provide_student_feedback, row["요약문"], shared_context, analysis, keywords, copy_check=copy_check): row
+            for row, analysis, copy_check in zip(rows, analyses, copy_checks)
+        }
+        for future in as_completed(futures):
+            row = futures[future]
+            try:
+                row["AI 피드백"] = future.result()
+            except Exception as e:
+                row["AI 피드백"] = f"피드백 생성 실패: {e}"
+            completed += 1
+            if progress_callback:
+                progress_callback(completed, len(rows))
+
+    return rows
+
+def class_batch_to_csv(rows: list) -> bytes:
+    """결과 표를 엑셀에서 바로 열 수 있는 CSV(UTF-8 BOM)로 변환"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CLASS_BATCH_COLUMNS)
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode("utf-8-sig")
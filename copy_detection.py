@@ -0,0 +1,115 @@
+# copy_detection.py
+import re
+import threading
+import zlib
+from collections import OrderedDict
+
+from data_config import COPY_NGRAM_WORDS, COPY_INDEX_CACHE_SIZE
+from utils import passage_hash
+
+# 다항식 롤링 해시 (법 2^61-1)
+_HASH_BASE = 1_000_003
+_HASH_MOD = (1 << 61) - 1
+_WORD_PATTERN = re.compile(r"[A-Za-z]+")
+
+_index_cache = OrderedDict()
+_index_lock = threading.Lock()
+
+def _tokens_with_spans(text: str):
+    """소문자 단어 목록과 원문에서의 (시작, 끝) 위치"""
+    matches = list(_WORD_PATTERN.finditer(text))
+    return [m.group().lower() for m in matches], [m.span() for m in matches]
+
+def rolling_ngram_hashes(tokens: list, n: int) -> list:
+    """단어 n-gram마다 해시값 (앞 단어를 빼고 새 단어를 더해 창 하나당 O(1)로 갱신)"""
+    if len(tokens) < n:
+        return []
+    values = [zlib.crc32(token.encode("utf-8")) + 1 for token in tokens]
+    top = pow(_HASH_BASE, n - 1, _HASH_MOD)
+    current = 0
+    for value in values[:n]:
+        current = (current * _HASH_BASE + value) % _HASH_MOD
+    hashes = [current]
+    for i in range(n, len(values)):
+        current = ((current - values[i - n] * top) * _HASH_BASE + values[i]) % _HASH_MOD
+        hashes.append(current)
+    return hashes
+
+class PassageNgramIndex:
+    """지문의 단어 n-gram 해시 집합 (요약문의 각 n-gram이 지문에 그대로 있는지 O(1)로 확인)"""
+
+    def __init__(self, text: str, n: int = COPY_NGRAM_WORDS):
+        self.n = n
+        self.hashes = set(rolling_ngram_hashes(_tokens_with_spans(text)[0], n))
+
+    def __len__(self):
+        return len(self.hashes)
+
+def get_passage_ngram_index(text: str) -> PassageNgramIndex:
+    """지문 해시별로 한 번만 만드는 n-gram 색인 (지문 입력 시 미리 생성)"""
+    key = passage_hash(text)
+    with _index_lock:
+        if key in _index_cache:
+            _index_cache.move_to_end(key)
+            return _index_cache[key]
+
+    index = PassageNgramIndex(text)
+    with _index_lock:
+        _index_cache[key] = index
+        while len(_index_cache) > COPY_INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
+
+def detect_copied_spans(summary: str, passage_text: str) -> dict:
+    """요약문에서 지문을 n단어 이상 그대로 옮긴 구간과 그 단어 비율
+
+    반환: {"total_words", "copied_words", "copied_ratio", "longest_span_words",
+           "spans": [{"start": 글자 위치, "end": 글자 위치, "words": 단어 수, "text": 원문 구간}]}
+    """
+    tokens, positions = _tokens_with_spans(summary)
+    result = {"ngram_words": COPY_NGRAM_WORDS, "total_words": len(tokens), "copied_words": 0,
+              "copied_ratio": 0.0, "longest_span_words": 0, "spans": []}
+    if not tokens or not passage_text:
+        return result
+
+    index = get_passage_ngram_index(passage_text)
+    copied = [False] * len(tokens)
+    covered_until = 0
+    for i, value in enumerate(rolling_ngram_hashes(tokens, index.n)):
+        if value in index.hashes:
+            # 이미 표시한 단어는 건너뛰어 전체 O(단어 수)
+            for j in range(max(i, covered_until), i + index.n):
+                copied[j] = True
+            covered_until = i + index.n
+
+    spans = []
+    i = 0
+    while i < len(tokens):
+        if not copied[i]:
+            i += 1
+            continue
+        j = i
+        while j + 1 < len(tokens) and copied[j + 1]:
+            j += 1
+        start, end = positions[i][0], positions[j][1]
+        spans.append({"start": start, "end": end, "words": j - i + 1, "text": summary[start:end]})
+        i = j + 1
+
+    copied_words = sum(copied)
+    result.update({
+        "copied_words": copied_words,
+        "copied_ratio": round(copied_words / len(tokens), 3),
+        "longest_span_words": max((span["words"] for span in spans), default=0),
+        "spans": spans
+    })
+    return result
+
+def format_copy_check_for_prompt(copy_check: dict) -> str:
+    """프롬프트에 넣을 원문 복사 확인 결과 (모델이 직접 대조하지 않도록 로컬 결과 전달)"""
+    if not copy_check or not copy_check["total_words"]:
+        return ""
+    label = f"원문을 그대로 옮긴 부분 (로컬 확인, {copy_check['ngram_words']}단어 이상 연속 일치)"
+    if not copy_check["spans"]:
+        return f"{label}: 없음"
+    quoted = ", ".join(f'"{span["text"]}"' for span in copy_check["spans"][:3])
+    return f"{label}: 요약문 단어의 {copy_check['copied_ratio']:.0%} - {quoted}"
@@ -16,6 +16,145 @@ VOCAB_FILE_PATH_2022 = DATA_DIR / "2022년 교육부 기본 어휘 3000개_전
 DEFAULT_ENCODING = "utf-8"
 VOCAB_SEPARATOR = " : "
 
+# 세션 공유 저장소 설정 (지문/모범 요약/피드백/어휘 분석을 프로세스 전체에서 공유)
+SESSION_STORE_MEMORY_BUDGET_MB = 64
+SESSION_STORE_IDLE_TTL_SECONDS = 30 * 60
+
+# 공유 지문 라이브러리 (키워드/번역/모범 요약 재사용)
+PASSAGE_LIBRARY_PATH = DATA_DIR / "passage_library.sqlite3"
+# 유사 지문(줄바꿈/따옴표/오탈자 차이)으로 간주할 최소 자카드 유사도
+NEAR_DUPLICATE_JACCARD_THRESHOLD = 0.8
+
+# 학급 일괄 분석 (학생 요약문 수 제한, 동시 피드백 요청 수)
+CLASS_BATCH_MAX_SUMMARIES = 50
+CLASS_BATCH_MAX_CONCURRENCY = 4
+
+# OpenAI 호출 차단기 (연속 실패/느린 응답 횟수, 느린 응답 기준, 차단 유지 시간 - 초)
+AI_CIRCUIT_FAILURE_THRESHOLD = 3
+AI_CIRCUIT_SLOW_CALL_SECONDS = 20
+AI_CIRCUIT_OPEN_SECONDS = 30
+
+# 추가 요청(hedging): 기다릴 지연 시간 백분위수, 추가 요청을 시작할 최소 표본 수/최소 대기(초), 요청 대비 추가 요청 비율 상한
+AI_HEDGE_PERCENTILE = 0.9
+AI_HEDGE_MIN_SAMPLES = 20
+AI_HEDGE_MIN_DELAY_SECONDS = 0.5
+AI_HEDGE_MAX_RATIO = 0.1
+
+# OpenAI 동시 요청 한도 (AIMD: 응답이 빠르면 조금씩 늘리고 429/시간 초과 시 절반으로 줄임)
+AI_CONCURRENCY_INITIAL_LIMIT = 4
+AI_CONCURRENCY_MIN_LIMIT = 1
+AI_CONCURRENCY_MAX_LIMIT = 32
+AI_CONCURRENCY_DECREASE_FACTOR = 0.5
+# 한도를 늘리는 응답 시간 기준 (작업 지연 예산에 대한 비율, 예산이 없는 호출은 기본 초)
+AI_CONCURRENCY_LATENCY_TARGET_RATIO = 0.5
+AI_CONCURRENCY_LATENCY_TARGET_SECONDS = 10
+
+# OpenAI 모델 등급 (비용은 100만 토큰당 USD 추정치, secrets의 [model_routing.tiers.<등급>]으로 덮어쓰기 가능)
+MODEL_TIERS = {
+    "fast": {"model": "gpt-4o-mini", "input_cost_per_1m": 0.15, "output_cost_per_1m": 0.60},
+    "standard": {"model": "gpt-4o", "input_cost_per_1m": 2.50, "output_cost_per_1m": 10.00},
+}
+
+# 작업별 모델 등급/지연 예산(초)/출력 길이/temperature (secrets의 [model_routing.tasks.<작업>]으로 덮어쓰기 가능)
+# 지연 예산을 넘기면 fallback_tier로 한 번 더 요청
+# hedge_tier가 있는 작업(짧고 여러 번 보내도 되는 호출)은 p90 지연 시간까지 응답이 없으면 그 등급으로 같은 요청을 한 번 더 보냄
+MODEL_TASK_ROUTES = {
+    "translation": {"tier": "fast", "fallback_tier": "standard", "hedge_tier": "fast", "latency_budget_seconds": 8, "max_tokens": 300, "temperature": 0.3},
+    "summary": {"tier": "fast", "fallback_tier": "standard", "hedge_tier": "fast", "latency_budget_seconds": 10, "max_tokens": 100, "temperature": 0.3},
+    "feedback": {"tier": "standard", "fallback_tier": "fast", "latency_budget_seconds": 35, "max_tokens": 1500, "temperature": 0.2},
+    # 수정본 비교 피드백은 원문 재전송 없이 짧은 판정만 요청
+    "revision_feedback": {"tier": "standard", "fallback_tier": "fast", "latency_budget_seconds": 15, "max_tokens": 250, "temperature": 0.2},
+    # 학급 일괄 분석 시 학생 1명당 피드백
+    "class_feedback": {"tier": "standard", "fallback_tier": "fast", "latency_budget_seconds": 15, "max_tokens": 300, "temperature": 0.2},
+    # 모범 요약이 길이/어휘 제약을 어겼을 때 요약문만 보내 고쳐 쓰기
+    "summary_rewrite": {"tier": "fast", "fallback_tier": "standard", "latency_budget_seconds": 6, "max_tokens": 80, "temperature": 0.2},
+    # 긴 지문 조각별 부분 요약 (최종 요약 전 단계)
+    "chunk_summary": {"tier": "fast", "fallback_tier": "standard", "latency_budget_seconds": 10, "max_tokens": 150, "temperature": 0.2},
+}
+
+# 요약문 단어 수 기준 (학생 요약 점검, 로컬 요약, 모범 요약 공통)
+SUMMARY_MIN_WORDS = 15
+SUMMARY_MAX_WORDS = 20
+# 모범 요약 제약 (원문에 없는 기준 밖 단어 허용 개수, 위반 시 고쳐 쓰기 요청 최대 횟수)
+SUMMARY_MAX_OFF_LIST_WORDS = 1
+SUMMARY_MAX_REWRITES = 2
+
+# 지문 난이도 프로필 (학년별 FK 읽기 지수 범위, 해당 교육과정 기본 어휘 밖 단어 비율 상한)
+PASSAGE_DIFFICULTY_TARGETS = {
+    "고1": {"min_fk_grade": 5.0, "max_fk_grade": 10.0, "max_out_of_list_density": 0.12},
+    "고2": {"min_fk_grade": 6.0, "max_fk_grade": 11.5, "max_out_of_list_density": 0.15},
+    "고3": {"min_fk_grade": 7.0, "max_fk_grade": 13.0, "max_out_of_list_density": 0.18},
+}
+# 긴 문장 기준 단어 수, 프로필 캐시 크기
+PASSAGE_LONG_SENTENCE_WORDS = 25
+PASSAGE_PROFILE_CACHE_SIZE = 256
+
+# 철자 확인 색인 (최대 편집 거리, 삭제 변형을 만드는 앞부분 글자 수, 검사할 최소 단어 길이)
+# 4글자 이하 단어는 편집 거리 1 안에 정상 단어가 너무 많아(urn → burn, dew → few) 검사하지 않음
+SPELLING_MAX_EDIT_DISTANCE = 2
+SPELLING_PREFIX_LENGTH = 7
+SPELLING_MIN_WORD_LENGTH = 5
+
+# 원문 그대로 옮기기 확인 (연속 일치로 볼 최소 단어 수, 지문별 n-gram 색인 캐시 크기)
+COPY_NGRAM_WORDS = 5
+COPY_INDEX_CACHE_SIZE = 256
+
+# 기준 외 어휘의 대체어 제안 (뜻풀이 역색인)
+SYNONYM_MAX_GLOSS_HEADWORDS = 12  # 표제어가 이보다 많은 뜻풀이는 너무 일반적이라 제외
+SYNONYM_MAX_SUGGESTIONS = 3
+
+# 긴 지문 나눠 요약하기 (이 단어 수를 넘으면 조각별로 요약한 뒤 합쳐서 최종 요약)
+LONG_PASSAGE_THRESHOLD_WORDS = 600
+# 조각 최대/최소 단어 수 (최소보다 짧은 단락은 다음 단락과 합침)
+LONG_PASSAGE_CHUNK_WORDS = 250
+LONG_PASSAGE_MIN_CHUNK_WORDS = 40
+LONG_PASSAGE_MAX_PARALLEL_CHUNKS = 4
+LONG_PASSAGE_CHUNK_CACHE_SIZE = 512
+
+# 요청별 마감 시간 (초, 피드백은 모범 요약 생성부터 피드백까지 전체 흐름 기준)
+AI_TRANSLATION_DEADLINE_SECONDS = 15
+AI_SUMMARY_DEADLINE_SECONDS = 20
+AI_FEEDBACK_DEADLINE_SECONDS = 45
+
+# Google Sheets API 요청 한도 (분당 요청 수, 한 번에 몰아 쓸 수 있는 요청 수)
+SHEETS_REQUESTS_PER_MINUTE = 60
+SHEETS_BURST_REQUESTS = 5
+# 429/5xx 재시도 (최대 횟수, 지터 백오프 기준/최대 대기 - 초)
+SHEETS_MAX_RETRIES = 5
+SHEETS_BACKOFF_BASE_SECONDS = 1
+SHEETS_BACKOFF_MAX_SECONDS = 32
+# 설문 응답 일괄 저장 시 한 번에 보내는 최대 행 수
+SHEETS_APPEND_BATCH_MAX_ROWS = 100
+
+# 설문 데이터 내보내기 (기본 저장 위치, 한 번에 읽는 행 수)
+SURVEY_EXPORT_DIR = DATA_DIR / "exports"
+SURVEY_EXPORT_PAGE_SIZE = 500
+
+# 분석 HTTP API (LMS 연동용, analysis_api.py)
+ANALYSIS_API_HOST = "127.0.0.1"
+ANALYSIS_API_PORT = 8502
+# OpenAI를 호출하는 요청의 동시 처리 수와 최대 대기 수 (넘으면 503)
+ANALYSIS_API_MAX_CONCURRENT_AI = 16
+ANALYSIS_API_MAX_QUEUED_AI = 64
+ANALYSIS_API_WORKER_THREADS = 32
+ANALYSIS_API_MAX_BODY_BYTES = 64 * 1024
+ANALYSIS_API_IDLE_TIMEOUT_SECONDS = 30
+
+# 문제은행 일괄 생성 작업 대기열 (모범 요약/피드백을 세션 밖에서 미리 생성, 항목마다 저장해 중단 후 이어서 실행)
+GENERATION_JOBS_PATH = DATA_DIR / "generation_jobs.sqlite3"
+GENERATION_JOB_WORKERS = 8
+GENERATION_JOB_MAX_ATTEMPTS = 3
+GENERATION_JOB_RETRY_SECONDS = 30  # 실패한 항목은 (시도 횟수 x 이 시간) 뒤에 다시 시도
+GENERATION_JOB_DEADLINE_SECONDS = 60
+GENERATION_JOB_REPORT_SECONDS = 10
+# 저우선 실행 (run --low-priority): 적은 작업자, 분당 시작 항목 수 제한, 느린 응답도 기다림
+GENERATION_JOB_LOW_PRIORITY_WORKERS = 2
+GENERATION_JOB_LOW_PRIORITY_ITEMS_PER_MINUTE = 20
+GENERATION_JOB_LOW_PRIORITY_DEADLINE_SECONDS = 300
+
+# OpenAI 요청/응답 기록·재생 (환경 변수 OPENAI_CASSETTE_MODE가 있을 때만 사용)
+OPENAI_CASSETTE_DIR = DATA_DIR / "cassettes"
+
 def ensure_data_directory():
     """데이터 디렉토리가 존재하는지 확인하고 없으면 생성합니다."""
     DATA_DIR.mkdir(exist_ok=True)
@@ -238,6 +377,12 @@ WRITING_GUIDELINES = {
     }
 }
 
+def get_curriculum_key(grade_level: str, subject_type: str) -> str:
+    """학년/과목유형 조합을 CURRICULUM_STANDARDS 키로 변환 (고2, 고3만 과목유형 구분)"""
+    if grade_level in ["고2", "고3"]:
+        return f"{grade_level}_{subject_type}"
+    return grade_level
+
 # 어휘 파일 경로 설정
 VOCAB_FILE_PATH_2015 = "2015년 교육부 기본 어휘 3000개_전체.txt"
 VOCAB_FILE_PATH_2022 = "2022년 교육부 기본 어휘 3000개_전체.txt"
@@ -0,0 +1,371 @@
+# generation_jobs.py
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from ai_services import FAILED_FEEDBACK_PREFIXES, generate_ai_summary_with_source, make_deadline, provide_feedback
+from data_config import (
+    GENERATION_JOBS_PATH, GENERATION_JOB_WORKERS, GENERATION_JOB_MAX_ATTEMPTS, GENERATION_JOB_RETRY_SECONDS,
+    GENERATION_JOB_DEADLINE_SECONDS, GENERATION_JOB_REPORT_SECONDS, GENERATION_JOB_LOW_PRIORITY_WORKERS,
+    GENERATION_JOB_LOW_PRIORITY_ITEMS_PER_MINUTE, GENERATION_JOB_LOW_PRIORITY_DEADLINE_SECONDS, ensure_data_directory
+)
+from passage_library import PASSAGE_LIBRARY
+from rate_limiter import TokenBucket
+from utils import passage_hash
+from vocabulary_loader import get_moe_vocabularies
+
+class JobItemError(Exception):
+    """항목 처리 실패 (다시 시도할 수 있음)"""
+
+class GenerationJobQueue:
+    """SQLite 작업 대기열 (항목마다 결과를 저장하므로 중단 후 다시 실행하면 끝난 항목은 건너뜀)
+
+    항목 상태: pending → running → done / failed (최대 시도 횟수 초과)
+    """
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    @contextmanager
+    def _connect(self):
+        """커밋 후 닫히는 SQLite 연결 (스레드마다 별도 연결 사용)"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _ensure_schema(self):
+        if self._initialized:
+            return
+        with self._lock:
+            if self._initialized:
+                return
+            ensure_data_directory()
+            with self._connect() as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS job_items (
+                        run_id TEXT NOT NULL,
+                        item_id INTEGER NOT NULL,
+                        item_key TEXT NOT NULL,
+                        task TEXT NOT NULL,
+                        text TEXT NOT NULL,
+                        grade_level TEXT NOT NULL,
+                        subject_type TEXT NOT NULL,
+                        user_summary TEXT NOT NULL DEFAULT '',
+                        item_info TEXT NOT NULL DEFAULT '',
+                        status TEXT NOT NULL DEFAULT 'pending',
+                        attempts INTEGER NOT NULL DEFAULT 0,
+                        not_before REAL NOT NULL DEFAULT 0,
+                        result TEXT NOT NULL DEFAULT '',
+                        error TEXT NOT NULL DEFAULT '',
+                        finished_at REAL,
+                        PRIMARY KEY (run_id, item_id),
+                        UNIQUE (run_id, item_key)
+                    );
+                    CREATE INDEX IF NOT EXISTS idx_job_items_status ON job_items (run_id, status, not_before);
+                """)
+            self._initialized = True
+
+    @staticmethod
+    def item_key(item: dict) -> str:
+        """같은 작업을 두 번 넣지 않도록 작업/지문/학년/과목유형/요약문으로 만든 키"""
+        parts = [item["task"], passage_hash(item["text"]), item["grade_level"], item["subject_type"], item.get("user_summary", "")]
+        return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def add_items(self, run_id: str, items: list) -> int:
+        """작업 항목 추가 (이미 있는 항목은 무시) 후 새로 추가된 수를 반환"""
+        self._ensure_schema()
+        with self._connect() as conn:
+            next_id = conn.execute("SELECT COALESCE(MAX(item_id), 0) + 1 FROM job_items WHERE run_id = ?", (run_id,)).fetchone()[0]
+            added = 0
+            for item in items:
+                cursor = conn.execute(
+                    """INSERT OR IGNORE INTO job_items (run_id, item_id, item_key, task, text, grade_level, subject_type, user_summary, item_info)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (run_id, next_id, self.item_key(item), item["task"], item["text"], item["grade_level"], item["subject_type"],
+                     item.get("user_summary", ""), item.get("item_info", ""))
+                )
+                if cursor.rowcount:
+                    next_id += 1
+                    added += 1
+        return added
+
+    def recover(self, run_id: str) -> int:
+        """이전 실행이 중단되어 running으로 남은 항목을 pending으로 되돌림"""
+        self._ensure_schema()
+        with self._connect() as conn:
+            return conn.execute("UPDATE job_items SET status = 'pending' WHERE run_id = ? AND status = 'running'", (run_id,)).rowcount
+
+    def claim(self, run_id: str):
+        """처리할 항목 하나를 running으로 바꾸고 반환 (지금 처리할 항목이 없으면 None)"""
+        self._ensure_schema()
+        while True:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT * FROM job_items WHERE run_id = ? AND status = 'pending' AND not_before <= ? ORDER BY item_id LIMIT 1",
+                    (run_id, time.time())
+                ).fetchone()
+                if row is None:
+                    return None
+                # 다른 작업자/프로세스가 먼저 가져갔으면 다음 항목으로
+                claimed = conn.execute(
+                    "UPDATE job_items SET status = 'running', attempts = attempts + 1 WHERE run_id = ? AND item_id = ? AND status = 'pending'",
+                    (run_id, row["item_id"])
+                ).rowcount
+            if claimed:
+                item = dict(row)
+                item["attempts"] += 1
+                return item
+
+    def complete(self, run_id: str, item_id: int, result: str):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE job_items SET status = 'done', result = ?, error = '', finished_at = ? WHERE run_id = ? AND item_id = ?",
+                (result, time.time(), run_id, item_id)
+            )
+
+    def fail(self, run_id: str, item_id: int, error: str, attempts: int, max_attempts: int = GENERATION_JOB_MAX_ATTEMPTS):
+        """실패 기록 (최대 시도 횟수 전이면 잠시 뒤 다시 시도하도록 pending으로)"""
+        status = "failed" if attempts >= max_attempts else "pending"
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE job_items SET status = ?, error = ?, not_before = ? WHERE run_id = ? AND item_id = ?",
+                (status, error[:500], time.time() + GENERATION_JOB_RETRY_SECONDS * attempts, run_id, item_id)
+            )
+
+    def next_retry_in(self, run_id: str):
+        """나중에 다시 시도할 pending 항목까지 남은 시간 (초, 없으면 None)"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT MIN(not_before) FROM job_items WHERE run_id = ? AND status = 'pending'", (run_id,)).fetchone()
+        return None if row[0] is None else max(0.0, row[0] - time.time())
+
+    def progress(self, run_id: str) -> dict:
+        """상태별 항목 수"""
+        self._ensure_schema()
+        with self._connect() as conn:
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM job_items WHERE run_id = ? GROUP BY status", (run_id,)).fetchall())
+        counts = {status: counts.get(status, 0) for status in ("pending", "running", "done", "failed")}
+        counts["total"] = sum(counts.values())
+        return counts
+
+    def failed_items(self, run_id: str, limit: int = 20) -> list:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT item_id, task, grade_level, item_info, error FROM job_items WHERE run_id = ? AND status = 'failed' ORDER BY item_id LIMIT ?",
+                (run_id, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+def load_job_items(path, grade_levels: list, subject_type: str) -> list:
+    """JSONL/CSV 문제은행 파일을 작업 항목으로 변환
+
+    각 줄(행)은 text(또는 지문), 선택적으로 grade_level, subject_type, summary(요약문이 있으면 피드백 작업), item_info를 가집니다.
+    grade_level이 없으면 grade_levels의 학년마다 하나씩 만듭니다.
+    """
+    path = Path(path)
+    with open(path, encoding="utf-8-sig") as f:
+        if path.suffix.lower() == ".csv":
+            records = list(csv.DictReader(f))
+        else:
+            records = [json.loads(line) for line in f if line.strip()]
+
+    items = []
+    for record in records:
+        text = (record.get("text") or record.get("지문") or "").strip()
+        if not text:
+            continue
+        user_summary = (record.get("summary") or record.get("요약문") or "").strip()
+        for grade_level in ([record["grade_level"]] if record.get("grade_level") else grade_levels):
+            items.append({
+                "task": "feedback" if user_summary else "summary",
+                "text": text,
+                "grade_level": grade_level,
+                "subject_type": record.get("subject_type") or subject_type,
+                "user_summary": user_summary,
+                "item_info": str(record.get("item_info") or record.get("문항 정보") or "")
+            })
+    return items
+
+def process_item(item: dict, deadline_seconds: float = GENERATION_JOB_DEADLINE_SECONDS) -> str:
+    """항목 하나를 ai_services로 처리하고 결과를 반환 (모범 요약은 공유 지문 라이브러리에도 저장)"""
+    deadline = make_deadline(deadline_seconds)
+    if item["task"] == "summary":
+        # 이미 라이브러리에 있는 지문(교사가 앱에서 생성 등)은 다시 생성하지 않음
+        cached = PASSAGE_LIBRARY.get_summary(passage_hash(item["text"]), item["grade_level"], item["subject_type"])
+        if cached:
+            return cached
+        summary, source = generate_ai_summary_with_source(item["text"], item["grade_level"], item["subject_type"], deadline)
+        if source != "ai":
+            raise JobItemError(summary if source == "error" else "OpenAI를 사용할 수 없어 로컬 요약으로 대체됨")
+        # 교사가 같은 지문을 열면 새로 생성하지 않고 바로 사용
+        PASSAGE_LIBRARY.save_summary(passage_hash(item["text"]), item["grade_level"], item["subject_type"], summary)
+        return summary
+
+    feedback = provide_feedback(item["user_summary"], item["text"], item["grade_level"], item["subject_type"], get_moe_vocabularies(), deadline)
+    if feedback.startswith(FAILED_FEEDBACK_PREFIXES):
+        raise JobItemError(feedback.splitlines()[0])
+    return feedback
+
+class ProgressTracker:
+    """이번 실행에서 끝낸 항목 수로 처리량과 남은 시간 추정"""
+
+    def __init__(self, queue: GenerationJobQueue, run_id: str):
+        self.queue = queue
+        self.run_id = run_id
+        self.started_at = time.monotonic()
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.failed = 0
+
+    def record(self, ok: bool):
+        with self._lock:
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+    def report(self) -> dict:
+        counts = self.queue.progress(self.run_id)
+        elapsed = time.monotonic() - self.started_at
+        with self._lock:
+            completed = self.completed
+        per_minute = 60 * completed / elapsed if elapsed > 0 else 0.0
+        remaining = counts["pending"] + counts["running"]
+        return {
+            **counts,
+            "completed_this_run": completed,
+            "errors_this_run": self.failed,
+            "items_per_minute": round(per_minute, 1),
+            "eta_minutes": round(remaining / per_minute, 1) if per_minute else None,
+            "elapsed_seconds": round(elapsed)
+        }
+
+def format_progress(report: dict) -> str:
+    eta = f"약 {report['eta_minutes']}분" if report["eta_minutes"] is not None else "계산 중"
+    return (f"완료 {report['done']}/{report['total']} (이번 실행 {report['completed_this_run']}건, 오류 {report['errors_this_run']}건), "
+            f"대기 {report['pending']}, 실패 {report['failed']} | "
+            f"{report['items_per_minute']}건/분, 남은 시간 {eta}")
+
+def run_workers(queue: GenerationJobQueue, run_id: str, workers: int = GENERATION_JOB_WORKERS,
+                report_seconds: float = GENERATION_JOB_REPORT_SECONDS, on_report=print,
+                items_per_minute: float = None, deadline_seconds: float = GENERATION_JOB_DEADLINE_SECONDS) -> dict:
+    """작업자 스레드로 pending 항목을 모두 처리 (항목마다 결과 저장, 실패는 잠시 뒤 재시도)
+
+    items_per_minute를 주면 분당 그 수만큼만 항목을 시작합니다 (앱 사용량과 OpenAI 한도를 나눠 쓰는 저우선 실행).
+    """
+    recovered = queue.recover(run_id)
+    if recovered:
+        on_report(f"중단된 항목 {recovered}건을 다시 처리합니다.")
+    tracker = ProgressTracker(queue, run_id)
+    stop = threading.Event()
+    finished = threading.Event()
+    pacing = TokenBucket(items_per_minute / 60, capacity=1) if items_per_minute else None
+
+    def wait_for_turn() -> bool:
+        """속도 제한이 있으면 다음 항목을 시작할 차례까지 대기 (중단 요청 시 False)"""
+        while pacing is not None and not stop.is_set():
+            try:
+                pacing.acquire(timeout=1.0)
+                return True
+            except TimeoutError:
+                continue
+        return not stop.is_set()
+
+    def worker():
+        # 중단 요청(Ctrl+C) 후에는 처리 중인 항목까지만 저장하고 종료
+        while wait_for_turn():
+            item = queue.claim(run_id)
+            if item is None:
+                # 재시도 대기 중인 항목이 있으면 기다렸다가 다시 확인
+                wait = queue.next_retry_in(run_id)
+                if wait is None:
+                    return
+                stop.wait(min(wait, 1.0))
+                continue
+            try:
+                queue.complete(run_id, item["item_id"], process_item(item, deadline_seconds))
+                tracker.record(True)
+            except Exception as e:
+                queue.fail(run_id, item["item_id"], f"{type(e).__name__}: {e}", item["attempts"])
+                tracker.record(False)
+
+    def reporter():
+        while not finished.wait(report_seconds):
+            on_report(format_progress(tracker.report()))
+
+    threads = [threading.Thread(target=worker, name=f"generation-job-{i}") for i in range(workers)]
+    threading.Thread(target=reporter, daemon=True).start()
+    for thread in threads:
+        thread.start()
+    # Thread.join 중 KeyboardInterrupt가 나면 스레드가 끝난 것으로 잘못 표시될 수 있어 sleep으로 대기
+    try:
+        while any(thread.is_alive() for thread in threads):
+            try:
+                time.sleep(0.5)
+            except KeyboardInterrupt:
+                if not stop.is_set():
+                    on_report("중단 요청: 처리 중인 항목을 저장한 뒤 종료합니다. (다시 run 하면 이어서 처리)")
+                stop.set()
+    finally:
+        finished.set()
+    report = tracker.report()
+    on_report(format_progress(report))
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="문제은행 지문의 모범 요약/피드백을 대기열로 일괄 생성 (중단 후 이어서 실행 가능)")
+    parser.add_argument("--db", default=str(GENERATION_JOBS_PATH))
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    add_parser = subparsers.add_parser("add", help="JSONL/CSV 파일의 지문을 작업으로 추가")
+    add_parser.add_argument("--run", required=True, help="작업 묶음 이름")
+    add_parser.add_argument("--input", required=True)
+    add_parser.add_argument("--grade-levels", default="고1,고2,고3", help="grade_level이 없는 지문에 적용할 학년 (쉼표 구분)")
+    add_parser.add_argument("--subject-type", default="일반선택+진로선택")
+
+    run_parser = subparsers.add_parser("run", help="작업자 스레드로 pending 항목 처리")
+    run_parser.add_argument("--run", required=True)
+    run_parser.add_argument("--workers", type=int, help=f"작업자 수 (기본 {GENERATION_JOB_WORKERS}, 저우선 {GENERATION_JOB_LOW_PRIORITY_WORKERS})")
+    run_parser.add_argument("--low-priority", action="store_true",
+                            help="급하지 않은 실행: 작업자 수와 분당 시작 항목 수를 줄이고 느린 응답도 기다림 (수업 중 앱과 함께 실행)")
+    run_parser.add_argument("--items-per-minute", type=float,
+                            help=f"분당 시작할 최대 항목 수 (저우선 기본 {GENERATION_JOB_LOW_PRIORITY_ITEMS_PER_MINUTE})")
+
+    status_parser = subparsers.add_parser("status", help="진행 현황")
+    status_parser.add_argument("--run", required=True)
+    args = parser.parse_args()
+
+    # Streamlit 실행 환경 밖에서 st.* 호출 시 나오는 경고는 출력에서 제외
+    logging.getLogger("streamlit.runtime.scriptrunner.script_run_context").setLevel(logging.ERROR)
+    queue = GenerationJobQueue(args.db)
+
+    if args.command == "add":
+        items = load_job_items(args.input, [g.strip() for g in args.grade_levels.split(",") if g.strip()], args.subject_type)
+        print(f"{len(items)}개 중 {queue.add_items(args.run, items)}개 추가 (이미 있는 항목 제외)")
+    elif args.command == "run":
+        if args.low_priority:
+            run_workers(queue, args.run, args.workers or GENERATION_JOB_LOW_PRIORITY_WORKERS,
+                        items_per_minute=args.items_per_minute or GENERATION_JOB_LOW_PRIORITY_ITEMS_PER_MINUTE,
+                        deadline_seconds=GENERATION_JOB_LOW_PRIORITY_DEADLINE_SECONDS)
+        else:
+            run_workers(queue, args.run, args.workers or GENERATION_JOB_WORKERS, items_per_minute=args.items_per_minute)
+    else:
+        print(json.dumps(queue.progress(args.run), ensure_ascii=False))
+        for item in queue.failed_items(args.run):
+            print(f"실패 #{item['item_id']} ({item['task']}, {item['grade_level']} {item['item_info']}): {item['error']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# hedging.py
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+class HedgeCancellation:
+    """진 쪽 요청에 보내는 취소 신호 (취소되면 등록한 정리 함수를 바로 실행)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._callbacks = []
+
+    @property
+    def cancelled(self) -> bool:
+        with self._lock:
+            return self._cancelled
+
+    def on_cancel(self, callback):
+        """취소 시 실행할 함수 등록 (이미 취소됐으면 바로 실행)"""
+        with self._lock:
+            if not self._cancelled:
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def cancel(self):
+        with self._lock:
+            if self._cancelled:
+                return
+            self._cancelled = True
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+class HedgedRequests:
+    """지연 꼬리 줄이기: 첫 요청이 늦어지면 같은 요청을 한 번 더 보내고 먼저 끝난 응답을 사용
+
+    - 첫 요청이 delay_seconds 안에 끝나면 추가 요청 없음
+    - 추가 요청은 작업별로 요청 수의 max_hedge_ratio 이하로만 보냄 (비용 상한)
+    - 한쪽이 이기면 진 쪽에 취소 신호를 보냄: 아직 보내지 않은 요청은 보내지 않고, 이미 보낸 요청은 응답이 오면 통계에 넣지 않고 결과를 버림
+    """
+
+    def __init__(self, max_hedge_ratio: float, max_workers: int = 32):
+        self.max_hedge_ratio = max_hedge_ratio
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _task_stats_locked(self, task: str) -> dict:
+        if task not in self._stats:
+            self._stats[task] = {"requests": 0, "hedges": 0, "hedge_wins": 0, "capped": 0, "cancelled": 0}
+        return self._stats[task]
+
+    def _reserve_hedge(self, task: str) -> bool:
+        """비율 상한 안이면 추가 요청 한 건을 예약"""
+        with self._lock:
+            stats = self._task_stats_locked(task)
+            if stats["hedges"] + 1 > self.max_hedge_ratio * stats["requests"]:
+                stats["capped"] += 1
+                return False
+            stats["hedges"] += 1
+            return True
+
+    def run(self, task: str, primary, hedge, delay_seconds: float, timeout: float = None):
+        """primary(cancellation)를 실행하고 delay_seconds 안에 끝나지 않으면 hedge(cancellation)도 실행해 먼저 성공한 결과를 반환
+
+        각 함수는 자기 HedgeCancellation을 받아 취소 여부를 확인하거나 취소 시 정리할 일을 등록합니다.
+        둘 다 실패하면 첫 요청의 예외를, timeout 안에 아무것도 끝나지 않으면 TimeoutError를 던집니다.
+        """
+        start = time.monotonic()
+        with self._lock:
+            self._task_stats_locked(task)["requests"] += 1
+
+        def remaining():
+            return None if timeout is None else max(0.0, timeout - (time.monotonic() - start))
+
+        primary_cancellation, hedge_cancellation = HedgeCancellation(), HedgeCancellation()
+        primary_future = self._executor.submit(primary, primary_cancellation)
+        done, _ = wait([primary_future], timeout=delay_seconds if timeout is None else min(delay_seconds, timeout))
+        if done or not self._reserve_hedge(task):
+            return primary_future.result(timeout=remaining())
+
+        hedge_future = self._executor.submit(hedge, hedge_cancellation)
+        pending = {primary_future, hedge_future}
+        while pending:
+            done, pending = wait(pending, timeout=remaining(), return_when=FIRST_COMPLETED)
+            if not done:
+                raise TimeoutError("요청과 추가 요청 모두 시간 안에 끝나지 않았습니다.")
+            for future in done:
+                if future.exception() is None:
+                    won_by_hedge = future is hedge_future
+                    if pending:
+                        # 아직 시작 전이면 실행하지 않고, 실행 중이면 늦은 응답을 통계에 넣지 않도록
+                        for other in pending:
+                            other.cancel()
+                        (primary_cancellation if won_by_hedge else hedge_cancellation).cancel()
+                    with self._lock:
+                        stats = self._task_stats_locked(task)
+                        stats["hedge_wins"] += won_by_hedge
+                        stats["cancelled"] += bool(pending)
+                    return future.result()
+        # 둘 다 실패
+        return primary_future.result()
+
+    def stats(self) -> dict:
+        """작업별 요청/추가 요청/추가 요청이 이긴 횟수/상한으로 막힌 횟수/취소한 진 쪽 요청 수"""
+        with self._lock:
+            return {task: dict(stats) for task, stats in self._stats.items()}
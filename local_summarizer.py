@@ -0,0 +1,150 @@
+# local_summarizer.py
+import re
+
+import numpy as np
+
+from data_config import SUMMARY_MIN_WORDS, SUMMARY_MAX_WORDS
+
+# TextRank 설정
+TEXTRANK_DAMPING = 0.85
+TEXTRANK_MAX_ITERATIONS = 50
+TEXTRANK_TOLERANCE = 1e-6
+
+# 요약 첫머리에서 빼도 뜻이 유지되는 연결어
+LEADING_CONNECTORS = re.compile(
+    r"^(however|moreover|furthermore|in addition|for example|for instance|in fact|therefore|thus|also|"
+    r"as a result|on the other hand|of course|indeed|in other words|in short|in the end|in conclusion|first|second|finally)\s*,?\s+",
+    re.IGNORECASE
+)
+# 문장을 끊어도 되는 절 경계 (이 단어 앞에서 자름)
+CLAUSE_BOUNDARIES = {"and", "but", "because", "which", "who", "that", "when", "while", "although", "so", "since", "where", "as"}
+# 잘린 문장 끝에 남으면 어색한 기능어
+DANGLING_WORDS = {"a", "an", "the", "to", "of", "for", "with", "in", "on", "at", "by", "from", "and", "or", "but", "their", "its", "our", "his", "her", "my", "your"}
+
+def split_sentences(text: str) -> list:
+    """지문을 문장 단위로 분리"""
+    text = re.sub(r"\s+", " ", text).strip()
+    return [s.strip() for s in re.split(r"(?<=[.!?])[\"'”’]?\s+(?=[\"'“‘]?[A-Z0-9])", text) if s.strip()]
+
+def tokenize_words(text: str) -> list:
+    """소문자 영어 단어 목록"""
+    return re.findall(r"[a-z]+", text.lower())
+
+def tfidf_matrix(sentences: list):
+    """문장별 TF-IDF 행렬(행 단위 L2 정규화), 단어→열 번호, 단어별 IDF"""
+    tokenized = [tokenize_words(s) for s in sentences]
+    vocabulary = {word: i for i, word in enumerate(sorted({w for tokens in tokenized for w in tokens}))}
+    counts = np.zeros((len(sentences), len(vocabulary)))
+    for row, tokens in enumerate(tokenized):
+        for word in tokens:
+            counts[row, vocabulary[word]] += 1
+
+    document_frequency = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(sentences)) / (1 + document_frequency)) + 1
+    tfidf = counts * idf
+    norms = np.linalg.norm(tfidf, axis=1, keepdims=True)
+    return tfidf / np.where(norms == 0, 1, norms), vocabulary, idf
+
+def rank_sentences(sentences: list) -> np.ndarray:
+    """TF-IDF 코사인 유사도 그래프에 TextRank를 적용한 문장별 점수"""
+    n = len(sentences)
+    if n == 0:
+        return np.zeros(0)
+    if n == 1:
+        return np.ones(1)
+
+    tfidf, _, _ = tfidf_matrix(sentences)
+    similarity = tfidf @ tfidf.T
+    np.fill_diagonal(similarity, 0)
+
+    # 행 정규화 (연결이 없는 문장은 모든 문장으로 균등 이동)
+    row_sums = similarity.sum(axis=1, keepdims=True)
+    transition = np.where(row_sums > 0, similarity / np.where(row_sums == 0, 1, row_sums), 1.0 / n)
+
+    scores = np.full(n, 1.0 / n)
+    for _ in range(TEXTRANK_MAX_ITERATIONS):
+        updated = (1 - TEXTRANK_DAMPING) / n + TEXTRANK_DAMPING * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < TEXTRANK_TOLERANCE:
+            scores = updated
+            break
+        scores = updated
+    return scores
+
+def _vocab_coverage(words: list, target_vocab) -> float:
+    """기준 어휘 비율 (어휘 목록이 없으면 1)"""
+    if not target_vocab or not words:
+        return 1.0
+    return sum(1 for w in words if w in target_vocab) / len(words)
+
+def _finish_sentence(text: str) -> str:
+    text = text.strip(" ,;:-")
+    if not text:
+        return ""
+    text = text[0].upper() + text[1:]
+    return text if text[-1] in ".!?" else text + "."
+
+def compress_sentence(sentence: str, target_vocab=None, term_weights: dict = None, max_words: int = SUMMARY_MAX_WORDS, allow_truncate: bool = True) -> str:
+    """문장을 max_words 이하로 줄임 (괄호/연결어 → 덜 중요하고 어려운 쉼표 구간 → 절 경계 순으로 제거)
+
+    절 경계가 없으면 allow_truncate일 때만 최대 길이에서 자르고, 아니면 빈 문자열을 반환합니다.
+    """
+    term_weights = term_weights or {}
+    sentence = re.sub(r"\s*\([^)]*\)", "", sentence)
+    sentence = re.sub(r"\s*[—–]\s*[^—–]*[—–]\s*", " ", sentence)
+    sentence = LEADING_CONNECTORS.sub("", sentence.strip())
+
+    # 첫 구간(주절)은 남기고, 나머지 쉼표 구간 중 중요도가 낮은 것부터 제거
+    segments = [s.strip() for s in sentence.rstrip(".!?").split(",") if s.strip()]
+    while len(segments) > 1 and sum(len(s.split()) for s in segments) > max_words:
+        def importance(segment):
+            words = tokenize_words(segment)
+            weight = sum(term_weights.get(w, 0) for w in words) / max(len(words), 1)
+            return weight * (0.5 + 0.5 * _vocab_coverage(words, target_vocab))
+        segments.remove(min(segments[1:], key=importance))
+
+    words = ", ".join(segments).split()
+    if len(words) > max_words:
+        # 최대 길이 안쪽의 마지막 절 경계에서 자르고, 경계가 없으면 최대 길이에서 자름
+        cut = None
+        for i in range(max_words, max_words // 2, -1):
+            if words[i].lower().strip(",;:") in CLAUSE_BOUNDARIES:
+                cut = i
+                break
+        if cut is None:
+            if not allow_truncate:
+                return ""
+            cut = max_words
+            while cut > 1 and words[cut - 1].lower().strip(",;:") in DANGLING_WORDS:
+                cut -= 1
+        words = words[:cut]
+    return _finish_sentence(" ".join(words))
+
+def summarize_locally(text: str, target_vocab=None, min_words: int = SUMMARY_MIN_WORDS, max_words: int = SUMMARY_MAX_WORDS) -> str:
+    """API 없이 지문을 15-20단어 내외로 요약 (TextRank로 고른 핵심 문장을 기준 어휘를 고려해 압축)"""
+    sentences = split_sentences(text)
+    if not sentences:
+        return ""
+
+    textrank = rank_sentences(sentences)
+    # 기준 어휘로 쓰인 문장을 약간 우대 (학생 수준에 맞는 참고 요약)
+    coverage = np.array([_vocab_coverage(tokenize_words(s), target_vocab) for s in sentences])
+    ranking = np.argsort(-(textrank * (0.8 + 0.2 * coverage)), kind="stable")
+
+    _, vocabulary, idf = tfidf_matrix(sentences)
+    term_weights = {word: idf[i] for word, i in vocabulary.items()}
+
+    summary = compress_sentence(sentences[ranking[0]], target_vocab, term_weights, max_words)
+    # 너무 짧으면 다음 순위 문장에서 남은 길이만큼 덧붙임
+    for index in ranking[1:]:
+        length = len(summary.split())
+        if length >= min_words:
+            break
+        # ", and"로 잇는 단어 하나를 빼고 남은 길이만큼만 사용
+        addition = compress_sentence(sentences[index], target_vocab, term_weights, max_words - length - 1, allow_truncate=False)
+        if not addition or len(addition.split()) < 3:
+            continue
+        first_word = addition.split()[0]
+        if first_word != "I" and not first_word.isupper():
+            addition = addition[0].lower() + addition[1:]
+        summary = summary.rstrip(".!?") + ", and " + addition
+    return summary
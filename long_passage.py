@@ -0,0 +1,104 @@
+# long_passage.py
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+from data_config import (
+    LONG_PASSAGE_THRESHOLD_WORDS, LONG_PASSAGE_CHUNK_WORDS, LONG_PASSAGE_MIN_CHUNK_WORDS, LONG_PASSAGE_CHUNK_CACHE_SIZE
+)
+from local_summarizer import split_sentences
+from utils import count_words
+
+def is_long_passage(text: str, threshold_words: int = LONG_PASSAGE_THRESHOLD_WORDS) -> bool:
+    """한 번에 프롬프트에 넣지 않고 나눠서 요약할 긴 지문인지 여부 (교과서 단원, EBS 장문 세트 등)"""
+    return count_words(text) > threshold_words
+
+def split_paragraphs(text: str) -> list:
+    """빈 줄 기준 단락 분리 (빈 줄이 없으면 줄바꿈 기준)"""
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+    if len(paragraphs) == 1:
+        paragraphs = [p.strip() for p in text.splitlines() if p.strip()]
+    return paragraphs
+
+def _split_long_sentence(sentence: str, max_words: int) -> list:
+    """문장 부호 없이 max_words를 넘는 문장(가사, OCR 결과 등)을 단어 수로 나눔"""
+    words = sentence.split()
+    return [" ".join(words[i:i + max_words]) for i in range(0, len(words), max_words)]
+
+def _split_long_paragraph(paragraph: str, max_words: int) -> list:
+    """max_words를 넘는 단락을 문장 경계에서 나눔 (문장 하나가 max_words보다 길면 단어 수로 자름)"""
+    chunks, current, length = [], [], 0
+    sentences = [piece for sentence in split_sentences(paragraph) for piece in _split_long_sentence(sentence, max_words)]
+    for sentence in sentences:
+        words = len(sentence.split())
+        if current and length + words > max_words:
+            chunks.append(" ".join(current))
+            current, length = [], 0
+        current.append(sentence)
+        length += words
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+def chunk_passage(text: str, max_words: int = LONG_PASSAGE_CHUNK_WORDS, min_words: int = LONG_PASSAGE_MIN_CHUNK_WORDS) -> list:
+    """긴 지문을 단락/문장 경계에서 max_words 이하 조각으로 나눔
+
+    단락 하나가 기본 조각이고 min_words보다 짧은 단락만 다음 단락과 합치므로,
+    단락 하나를 고치면 그 단락이 속한 조각만 바뀌고 나머지 조각은 그대로 유지됩니다.
+    """
+    chunks, pending = [], ""
+    for paragraph in split_paragraphs(text):
+        paragraph = re.sub(r"\s+", " ", paragraph)
+        if pending:
+            paragraph = f"{pending} {paragraph}"
+            pending = ""
+        if len(paragraph.split()) < min_words:
+            pending = paragraph
+            continue
+        if len(paragraph.split()) > max_words:
+            chunks.extend(_split_long_paragraph(paragraph, max_words))
+        else:
+            chunks.append(paragraph)
+    if pending:
+        # 마지막 짧은 단락은 앞 조각이 넘치지 않으면 앞 조각에 붙임
+        if chunks and len(chunks[-1].split()) + len(pending.split()) <= max_words:
+            chunks[-1] = f"{chunks[-1]} {pending}"
+        else:
+            chunks.append(pending)
+    return chunks
+
+class ChunkSummaryCache:
+    """조각 원문 해시 → 부분 요약 LRU 캐시 (수정하지 않은 단락은 다시 요약하지 않음)"""
+
+    def __init__(self, max_entries: int = LONG_PASSAGE_CHUNK_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def key(chunk: str, *context) -> str:
+        normalized = re.sub(r"\s+", " ", chunk).strip()
+        return hashlib.sha256("\n".join([normalized, *map(str, context)]).encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._entries[key]
+            self._misses += 1
+            return None
+
+    def put(self, key: str, summary: str):
+        with self._lock:
+            self._entries[key] = summary
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self._hits, "misses": self._misses}
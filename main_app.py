@@ -1,13 +1,22 @@
 # main_app.py
 import datetime
+import re
 import streamlit as st
 st.set_page_config(page_title="AI Summary Tool", layout="wide")
 
 # Import functions and data from other modules
-from data_config import TAM_SURVEY_QUESTIONS, CURRICULUM_STANDARDS
-from vocabulary_loader import MOE_VOCABULARIES, get_vocabulary_for_grade, analyze_vocabulary_level
-from ai_services import extract_keywords, translate_keywords_to_korean, generate_ai_summary, provide_feedback, OPENAI_OK
-from utils import count_words
+from data_config import TAM_SURVEY_QUESTIONS, CURRICULUM_STANDARDS, CLASS_BATCH_MAX_SUMMARIES, AI_FEEDBACK_DEADLINE_SECONDS, SUMMARY_MIN_WORDS, SUMMARY_MAX_WORDS, get_curriculum_key
+from vocabulary_loader import get_moe_vocabularies, is_vocabulary_loaded, get_vocabulary_load_status, get_vocabulary_for_grade, analyze_vocabulary_level, suggest_synonyms
+from ai_services import translate_keywords_to_korean, generate_ai_summary_with_source, generate_local_summary, provide_feedback, provide_revision_feedback, make_deadline, is_ai_degraded, get_openai_request_stats, OPENAI_OK
+from utils import count_words, extract_keywords
+from summary_scoring import score_summary
+from passage_library import PASSAGE_LIBRARY
+from passage_profiler import profile_passage, assess_passage_fit
+from spelling_index import check_spelling
+from copy_detection import detect_copied_spans, get_passage_ngram_index
+from class_batch import parse_student_summaries, parse_student_summary_file, run_class_batch, class_batch_to_csv
+from session_store import get_session_value, set_session_value, clear_session_values, is_session_value_missing, SHARED_STORE
+from startup_profiler import get_startup_timings, run_importtime_report
 
 # Streamlit 앱 설정
 
@@ -16,7 +25,7 @@ if "stage" not in st.session_state:
     st.session_state.update({
         "stage": "input",
         "teacher_info": {"grade": "", "school_type": "", "experience": ""},
-        "original_text": "",
+        "original_text_key": "",
         "source_type": "",
         "year": "",
         "grade_level": "",
@@ -24,13 +33,179 @@ if "stage" not in st.session_state:
         "item_info": "",
         "keywords": [],
         "keyword_translations": {},
+        "passage_hash": "",
+        "library_hit": False,
+        "library_match": {},
         "user_summary": "",
-        "ai_summary": "",
-        "feedback": "",
-        "vocab_analysis": {},
+        "ai_summary_key": "",
+        "ai_summary_source": "",
+        "feedback_key": "",
+        "vocab_analysis_key": "",
+        "revision_feedback": "",
+        "last_reviewed_summary": "",
+        "class_batch_results": [],
         "survey_submitted": False
     })
 
+def analyze_passage(original_text: str, source_type: str, year: str, item_info: str, reuse_library: bool = True):
+    """키워드 추출/번역 (공유 라이브러리에 같은 지문이나 유사 지문이 있으면 재사용)"""
+    library_entry = None
+    if reuse_library:
+        library_entry = PASSAGE_LIBRARY.lookup(original_text) or PASSAGE_LIBRARY.find_similar(original_text)
+    
+    if library_entry and library_entry["keyword_translations"]:
+        keywords = library_entry["keywords"]
+        keyword_translations = library_entry["keyword_translations"]
+    else:
+        keywords = library_entry["keywords"] if library_entry else extract_keywords(original_text, 5)
+        keyword_translations = translate_keywords_to_korean(keywords) if keywords else {}
+    
+    if library_entry and "similarity" in library_entry:
+        # 유사 지문: 기존 지문의 결과를 공유하고 이번 지문은 별칭으로 등록
+        PASSAGE_LIBRARY.add_alias(original_text, library_entry["text_hash"], library_entry["similarity"])
+        st.session_state.passage_hash = library_entry["text_hash"]
+        st.session_state.library_match = {
+            "similarity": library_entry["similarity"],
+            "matched_text": library_entry["normalized_text"]
+        }
+    else:
+        st.session_state.passage_hash = PASSAGE_LIBRARY.save_passage(
+            original_text, keywords, keyword_translations, source_type, year, item_info
+        )
+        st.session_state.library_match = {}
+    
+    st.session_state.library_hit = library_entry is not None
+    # 난이도 프로필/복사 확인용 n-gram 색인은 지문 해시별로 캐시되므로 여기서 미리 계산해 두면 2단계/프롬프트에서 재사용
+    profile_passage(original_text)
+    get_passage_ngram_index(original_text)
+    st.session_state.keywords = keywords
+    st.session_state.keyword_translations = keyword_translations
+    # 지문이 바뀌면 이전 지문 기준의 모범 요약/일괄 분석 결과는 사용하지 않음
+    set_session_value("ai_summary", "")
+    st.session_state.ai_summary_source = ""
+    st.session_state.class_batch_results = []
+
+def get_or_generate_ai_summary(deadline: float = None) -> str:
+    """모범 요약 조회 (세션 → 공유 라이브러리 → 새로 생성 순, 로컬 대체 요약/실패는 다음 요청 때 다시 생성)"""
+    ai_summary = get_session_value("ai_summary")
+    if ai_summary and st.session_state.ai_summary_source == "ai":
+        return ai_summary
+    
+    ai_summary = PASSAGE_LIBRARY.get_summary(st.session_state.passage_hash, st.session_state.grade_level, st.session_state.subject_type)
+    source = "ai"
+    if not ai_summary:
+        ai_summary, source = generate_ai_summary_with_source(get_session_value("original_text"), st.session_state.grade_level, st.session_state.subject_type, deadline)
+        if source == "ai":
+            PASSAGE_LIBRARY.save_summary(st.session_state.passage_hash, st.session_state.grade_level, st.session_state.subject_type, ai_summary)
+    set_session_value("ai_summary", ai_summary)
+    st.session_state.ai_summary_source = source
+    return ai_summary
+
+def display_summary_score(result: dict):
+    """로컬 예비 채점 결과 표시 (AI 피드백 없이 바로 계산한 참고 점수)"""
+    st.metric("예비 점수", f"{result['score']}점 ({result['level']})")
+    st.caption(result["level_desc"])
+    st.caption(" / ".join(f"{name} {value:.0%}" for name, value in result["components"].items()))
+    if result["missing_keywords"]:
+        st.caption(f"빠진 핵심 키워드: {', '.join(result['missing_keywords'])}")
+
+def _escape_markdown(text: str) -> str:
+    return re.sub(r"([\\`*_\[\]#~:|<>$])", r"\\\1", text)
+
+def highlight_copied_spans(summary: str, spans: list) -> str:
+    """원문을 그대로 옮긴 구간을 빨간 굵은 글씨로 표시한 마크다운"""
+    parts, position = [], 0
+    for span in spans:
+        parts.append(_escape_markdown(summary[position:span["start"]]))
+        parts.append(f":red[**{_escape_markdown(summary[span['start']:span['end']])}**]")
+        position = span["end"]
+    parts.append(_escape_markdown(summary[position:]))
+    return "".join(parts)
+
+def display_passage_profile(profile: dict, grade_level: str):
+    """지문 난이도 프로필과 학년 적합도 표시"""
+    if not profile:
+        return
+    curriculum_year = "2022" if grade_level == "고1" else "2015"
+    fit = assess_passage_fit(profile, grade_level)
+    st.markdown(f"**지문 난이도 (자동 분석, {grade_level} 기준: {fit['level']})**")
+    col_a, col_b, col_c, col_d = st.columns(4)
+    with col_a:
+        st.metric("읽기 지수 (FK 학년)", f"{profile['fk_grade']}")
+    with col_b:
+        st.metric("평균 문장 길이", f"{profile['sentence_length']['mean']}단어")
+    with col_c:
+        st.metric(f"{curriculum_year} 기본 어휘 포함률", f"{profile['coverage'][curriculum_year]:.0%}")
+    with col_d:
+        st.metric("기준 밖 어휘 밀도", f"{profile['out_of_list_density'][curriculum_year]:.0%}")
+    if fit["level"] == "어려움":
+        st.warning(f"선택한 학년({grade_level})에 비해 어려운 지문일 수 있습니다: " + "; ".join(fit["reasons"]))
+    elif fit["level"] == "쉬움":
+        st.info(f"선택한 학년({grade_level})에 비해 쉬운 지문일 수 있습니다: " + "; ".join(fit["reasons"]))
+    if profile["out_of_list_examples"]:
+        st.caption(f"기본 어휘 밖 단어 예시: {', '.join(profile['out_of_list_examples'][:8])} | "
+                   f"{profile['sentences']}문장, 최장 {profile['sentence_length']['max']}단어, 분석 {profile['elapsed_ms']}ms")
+
+def display_class_batch():
+    """학급 일괄 분석: 학생 요약문 여러 편을 같은 지문 기준으로 분석"""
+    st.markdown("---")
+    with st.expander("학급 일괄 분석 (학생 요약문 여러 편)", expanded=bool(st.session_state.class_batch_results)):
+        st.caption(f"같은 지문에 대한 학생 요약문을 한 줄에 한 편씩 붙여넣거나 파일로 올려주세요. (최대 {CLASS_BATCH_MAX_SUMMARIES}편, '이름<TAB>요약' 또는 '이름 | 요약' 형식 가능)")
+        
+        pasted = st.text_area("학생 요약문 붙여넣기", height=150, key="class_batch_input")
+        uploaded = st.file_uploader("또는 CSV/TXT 파일 업로드 (이름, 요약 열)", type=["csv", "txt"], key="class_batch_file")
+        include_feedback = st.checkbox("학생별 AI 피드백 포함", value=True, key="class_batch_feedback")
+        
+        if st.button("일괄 분석 시작", use_container_width=True):
+            students = parse_student_summary_file(uploaded.getvalue()) if uploaded else parse_student_summaries(pasted)
+            if not students:
+                st.error("분석할 학생 요약문을 입력해주세요.")
+            else:
+                if len(students) > CLASS_BATCH_MAX_SUMMARIES:
+                    st.warning(f"최대 {CLASS_BATCH_MAX_SUMMARIES}편까지만 분석합니다.")
+                
+                ai_summary = ""
+                if include_feedback:
+                    with st.spinner("모범 요약을 준비하는 중입니다..."):
+                        ai_summary = get_or_generate_ai_summary()
+                
+                progress_bar = st.progress(0.0, text="학생 요약문을 분석하는 중입니다...")
+                
+                def update_progress(done, total):
+                    progress_bar.progress(done / total if total else 1.0, text=f"분석 완료: {done}/{total}")
+                
+                st.session_state.class_batch_results = run_class_batch(
+                    students,
+                    get_session_value("original_text"),
+                    st.session_state.grade_level,
+                    st.session_state.subject_type,
+                    st.session_state.keywords,
+                    ai_summary,
+                    get_moe_vocabularies(),
+                    include_feedback=include_feedback,
+                    progress_callback=update_progress
+                )
+        
+        results = st.session_state.class_batch_results
+        if results:
+            word_counts = [row["단어 수"] for row in results]
+            col_a, col_b, col_c = st.columns(3)
+            with col_a:
+                st.metric("분석한 요약문", f"{len(results)}편")
+            with col_b:
+                st.metric("길이 기준 충족", f"{sum(1 for row in results if row['길이 적합'] == 'O')}편")
+            with col_c:
+                st.metric("평균 단어 수", f"{sum(word_counts) / len(word_counts):.1f}")
+            
+            st.dataframe(results, hide_index=True, use_container_width=True)
+            st.download_button(
+                "결과 표 내려받기 (CSV)",
+                data=class_batch_to_csv(results),
+                file_name="class_summary_analysis.csv",
+                mime="text/csv",
+                use_container_width=True
+            )
+
 def display_tam_survey():
     """TAM 설문조사 표시 및 수집"""
     st.markdown("---")
@@ -133,8 +308,8 @@ def display_tam_survey():
                         "subject_type": st.session_state.get("subject_type", ""),
                         "source_type": st.session_state.get("source_type", ""),
                         "completed_summary": bool(st.session_state.get("user_summary", "")),
-                        "received_feedback": bool(st.session_state.get("feedback", "")),
-                        "vocab_analysis_completed": bool(st.session_state.get("vocab_analysis", {}))
+                        "received_feedback": bool(get_session_value("feedback")),
+                        "vocab_analysis_completed": bool(get_session_value("vocab_analysis"))
                     },
                     "tam_scores": {
                         **usefulness_scores,
@@ -180,9 +355,16 @@ st.markdown("*수능, 내신, 모의고사 지문 요약에 최적화된 교사
 
 if not OPENAI_OK:
     st.warning("OpenAI API 키가 설정되지 않았거나 문제가 있습니다. 일부 기능이 제한됩니다.")
-if not MOE_VOCABULARIES.get("combined"):
+# 어휘 목록은 첫 분석 시 로드되므로 이미 로드된 경우에만 확인
+if is_vocabulary_loaded() and not get_moe_vocabularies().get("combined"):
     st.warning("교육부 기본 어휘 목록을 로드하지 못하여 어휘 수준 평가 기능이 제한될 수 있습니다.")
 
+# 공유 저장소 메모리 예산 초과로 지문이 제거된 세션은 처음 단계로 복귀
+if st.session_state.stage != "input" and is_session_value_missing("original_text"):
+    st.warning("오랫동안 사용하지 않아 세션 데이터가 만료되었습니다. 지문을 다시 입력해주세요.")
+    clear_session_values()
+    st.session_state.stage = "input"
+
 # 1단계: 교사 정보 및 텍스트 입력
 if st.session_state.stage == "input":
     st.subheader("1단계: 교사 정보 및 영어 지문 입력")
@@ -222,7 +404,7 @@ if st.session_state.stage == "input":
     st.markdown("**영어 지문 입력**")
     original_text = st.text_area(
         "요약하고 싶은 영어 텍스트를 입력하세요",
-        value=st.session_state.original_text,
+        value=get_session_value("original_text"),
         height=200,
         key="text_input",
         help="수능, 모의고사, 교과서 지문 등을 입력해주세요"
@@ -290,7 +472,7 @@ if st.session_state.stage == "input":
                 "experience": teaching_experience
             }
             
-            st.session_state.original_text = original_text
+            set_session_value("original_text", original_text)
             st.session_state.source_type = source_type
             st.session_state.year = year
             st.session_state.grade_level = grade_level
@@ -298,11 +480,7 @@ if st.session_state.stage == "input":
             st.session_state.item_info = item_info
             
             with st.spinner("지문을 분석하고 주요 키워드를 추출하는 중입니다..."):
-                keywords = extract_keywords(original_text, 5)
-                keyword_translations = translate_keywords_to_korean(keywords) if keywords else {}
-                
-                st.session_state.keywords = keywords
-                st.session_state.keyword_translations = keyword_translations
+                analyze_passage(original_text, source_type, year, item_info)
             
             st.session_state.stage = "summary"
             st.rerun()
@@ -324,7 +502,20 @@ elif st.session_state.stage == "summary":
                    f" | 과목: {st.session_state.subject_type}" +
                    (f" | {st.session_state.item_info}" if st.session_state.item_info else ""))
         st.markdown("**지문:**")
-        st.info(st.session_state.original_text)
+        st.info(get_session_value("original_text"))
+    
+    if st.session_state.library_match:
+        st.info(f"공유 지문 라이브러리에서 유사한 지문을 찾았습니다 (유사도 {st.session_state.library_match['similarity']:.0%}). 저장된 키워드와 모범 요약을 재사용합니다.")
+        with st.expander("일치한 지문 보기"):
+            st.write(st.session_state.library_match["matched_text"])
+            if st.button("다른 지문입니다 (새로 분석하기)"):
+                with st.spinner("지문을 새로 분석하는 중입니다..."):
+                    analyze_passage(get_session_value("original_text"), st.session_state.source_type, st.session_state.year, st.session_state.item_info, reuse_library=False)
+                st.rerun()
+    elif st.session_state.library_hit:
+        st.caption("공유 지문 라이브러리에 등록된 지문입니다. 저장된 키워드와 모범 요약을 재사용합니다.")
+    
+    display_passage_profile(profile_passage(get_session_value("original_text")), st.session_state.grade_level)
     
     if st.session_state.keywords:
         st.markdown("**주요 키워드**")
@@ -351,10 +542,23 @@ elif st.session_state.stage == "summary":
     word_count = count_words(user_summary)
     if word_count == 0:
         st.caption("단어 수: 0")
-    elif 15 <= word_count <= 20:
+    elif SUMMARY_MIN_WORDS <= word_count <= SUMMARY_MAX_WORDS:
         st.success(f"단어 수: {word_count} (적절)")
     else:
-        st.warning(f"단어 수: {word_count} (15-20단어 권장)")
+        st.warning(f"단어 수: {word_count} ({SUMMARY_MIN_WORDS}-{SUMMARY_MAX_WORDS}단어 권장)")
+    
+    # 철자 오류 의심 단어는 기준 외 어휘와 구분해 바로 표시
+    misspellings = check_spelling(user_summary, get_session_value("original_text")) if word_count else []
+    if misspellings:
+        st.caption("철자 확인: " + ", ".join(f"{m['word']} → {' / '.join(m['suggestions'])}" for m in misspellings))
+    
+    # 원문을 그대로 옮긴 구간 (5단어 이상 연속 일치)
+    copy_check = detect_copied_spans(user_summary, get_session_value("original_text")) if word_count else None
+    if copy_check and copy_check["spans"]:
+        st.caption(f"원문 그대로 옮긴 부분 {copy_check['copied_ratio']:.0%}: " + ", ".join(f'"{span["text"]}"' for span in copy_check["spans"]))
+    
+    if is_ai_degraded():
+        st.warning("AI 서비스 응답이 원활하지 않아 잠시 동안 자동 점검 결과와 임시 요약으로 대신합니다.")
     
     col1, col2 = st.columns([1, 1])
     
@@ -369,22 +573,40 @@ elif st.session_state.stage == "summary":
                 st.error("요약문을 작성해주세요.")
             else:
                 st.session_state.user_summary = user_summary
+                original_text = get_session_value("original_text")
+                
+                # 어휘 분석 수행 (로컬 계산이므로 AI 호출 전에 바로 처리)
+                moe_vocabularies = get_moe_vocabularies()
+                target_vocab = get_vocabulary_for_grade(st.session_state.grade_level, moe_vocabularies)
+                vocab_analysis = analyze_vocabulary_level(user_summary, target_vocab, moe_vocabularies)
+                set_session_value("vocab_analysis", vocab_analysis)
+                
+                # AI 피드백을 기다리는 동안 예비 채점과 로컬 추출 요약을 먼저 보여줌
+                cached_ai_summary = get_session_value("ai_summary") if st.session_state.ai_summary_source == "ai" else ""
+                display_summary_score(score_summary(
+                    user_summary, original_text, st.session_state.grade_level, st.session_state.subject_type,
+                    cached_ai_summary, st.session_state.keywords, vocab_analysis
+                ))
+                if not cached_ai_summary:
+                    draft = generate_local_summary(original_text, st.session_state.grade_level)
+                    if draft:
+                        st.info(f"**빠른 참고 요약 (자동 추출, AI 모범 요약 생성 중)**\n\n{draft}")
                 
                 with st.spinner("AI 피드백과 모범 요약을 생성하는 중입니다..."):
-                    ai_summary = generate_ai_summary(st.session_state.original_text, st.session_state.grade_level, st.session_state.subject_type)
-                    st.session_state.ai_summary = ai_summary
+                    # 모범 요약 생성부터 피드백까지 하나의 마감 시간 안에서 처리
+                    deadline = make_deadline(AI_FEEDBACK_DEADLINE_SECONDS)
+                    ai_summary = get_or_generate_ai_summary(deadline)
                     
-                    # 어휘 분석 수행
-                    target_vocab = get_vocabulary_for_grade(st.session_state.grade_level, MOE_VOCABULARIES)
-                    vocab_analysis = analyze_vocabulary_level(user_summary, target_vocab, MOE_VOCABULARIES)
-                    st.session_state.vocab_analysis = vocab_analysis
+                    feedback = provide_feedback(user_summary, original_text, st.session_state.grade_level, st.session_state.subject_type, moe_vocabularies, deadline)
+                    set_session_value("feedback", feedback)
                     
-                    feedback = provide_feedback(user_summary, st.session_state.original_text, st.session_state.grade_level, st.session_state.subject_type, MOE_VOCABULARIES)
-                    st.session_state.feedback = feedback
+                    # 새 피드백 기준으로 수정 비교 상태 초기화
+                    st.session_state.revision_feedback = ""
+                    st.session_state.last_reviewed_summary = user_summary
                 
                 st.rerun()
     
-    if st.session_state.feedback:
+    if get_session_value("feedback"):
         st.markdown("---")
         st.subheader("AI 피드백 및 개선 제안")
         
@@ -393,10 +615,14 @@ elif st.session_state.stage == "summary":
         with col1:
             st.markdown("**당신의 요약문**")
             st.info(st.session_state.user_summary)
+            copy_check = detect_copied_spans(st.session_state.user_summary, get_session_value("original_text"))
+            if copy_check["spans"]:
+                st.markdown(highlight_copied_spans(st.session_state.user_summary, copy_check["spans"]))
+                st.caption(f"빨간 부분은 원문을 {copy_check['ngram_words']}단어 이상 그대로 옮긴 구간입니다. (요약문 단어의 {copy_check['copied_ratio']:.0%})")
             
             # 어휘 분석 결과 표시
-            if st.session_state.vocab_analysis:
-                analysis = st.session_state.vocab_analysis
+            analysis = get_session_value("vocab_analysis")
+            if analysis:
                 curriculum_year = "2022" if st.session_state.grade_level == "고1" else "2015"
                 
                 st.markdown(f"**어휘 수준 분석 ({curriculum_year}년 교육부 기본 어휘 기준)**")
@@ -417,17 +643,36 @@ elif st.session_state.stage == "summary":
                 with col_22:
                     st.caption(f"2022년 기준: {analysis['vocab_2022_words']}개 ({analysis['vocab_2022_ratio']:.0%})")
                 
-                if analysis['non_target_examples']:
+                non_target_examples = analysis['non_target_examples']
+                if misspellings:
+                    st.caption("철자 오류 의심: " + ", ".join(f"{m['word']} → {m['suggestions'][0]}" for m in misspellings))
+                if non_target_examples:
+                    # 뜻풀이 역색인으로 찾은 기준 어휘 안의 대체어 (AI 호출 없음)
+                    moe_vocabularies = get_moe_vocabularies()
+                    synonyms = suggest_synonyms(non_target_examples, get_vocabulary_for_grade(st.session_state.grade_level, moe_vocabularies), moe_vocabularies)
                     with st.expander("기준 외 어휘 예시"):
-                        st.write(", ".join(analysis['non_target_examples']))
+                        st.write(", ".join(non_target_examples))
+                        if synonyms:
+                            st.markdown("**기준 어휘 안의 대체어:**")
+                            for word, alternatives in synonyms.items():
+                                st.write(f"- {word} → {', '.join(alternatives)}")
+            
+            st.markdown("**예비 채점 (자동)**")
+            display_summary_score(score_summary(
+                st.session_state.user_summary, get_session_value("original_text"), st.session_state.grade_level, st.session_state.subject_type,
+                get_session_value("ai_summary") if st.session_state.ai_summary_source == "ai" else "", st.session_state.keywords, analysis
+            ))
             
             st.markdown("**AI 피드백**")
-            st.markdown(st.session_state.feedback)
+            st.markdown(get_session_value("feedback"))
         
         with col2:
             st.markdown("**AI 모범 요약 (참고용)**")
-            st.success(st.session_state.ai_summary)
-            ai_word_count = count_words(st.session_state.ai_summary)
+            ai_summary = get_session_value("ai_summary")
+            st.success(ai_summary)
+            if st.session_state.ai_summary_source == "local":
+                st.caption("AI 응답이 지연되어 지문에서 뽑은 임시 요약을 표시합니다. 피드백을 다시 받으면 AI 요약으로 바뀝니다.")
+            ai_word_count = count_words(ai_summary)
             st.caption(f"단어 수: {ai_word_count}")
             curriculum_year = "2022" if st.session_state.grade_level == "고1" else "2015"
             st.caption(f"수준: {st.session_state.grade_level} ({st.session_state.subject_type}) 맞춤")
@@ -436,9 +681,7 @@ elif st.session_state.stage == "summary":
         st.markdown("---")
         st.markdown("**교육과정 기준 활용 팁**")
         
-        current_curriculum_key = st.session_state.grade_level
-        if st.session_state.grade_level in ["고2", "고3"]:
-            current_curriculum_key = f"{st.session_state.grade_level}_{st.session_state.subject_type}"
+        current_curriculum_key = get_curriculum_key(st.session_state.grade_level, st.session_state.subject_type)
 
         if current_curriculum_key in CURRICULUM_STANDARDS:
             standard = CURRICULUM_STANDARDS[current_curriculum_key]
@@ -487,15 +730,16 @@ elif st.session_state.stage == "summary":
         revised_word_count = count_words(revised_summary)
         if revised_word_count == 0:
             st.caption("단어 수: 0")
-        elif 15 <= revised_word_count <= 20:
+        elif SUMMARY_MIN_WORDS <= revised_word_count <= SUMMARY_MAX_WORDS:
             st.success(f"단어 수: {revised_word_count} (적절)")
         else:
-            st.warning(f"단어 수: {revised_word_count} (15-20단어 권장)")
+            st.warning(f"단어 수: {revised_word_count} ({SUMMARY_MIN_WORDS}-{SUMMARY_MAX_WORDS}단어 권장)")
         
         # 수정된 요약문에 대한 실시간 어휘 분석
         if revised_summary.strip() and revised_summary != st.session_state.user_summary:
-            target_vocab = get_vocabulary_for_grade(st.session_state.grade_level, MOE_VOCABULARIES)
-            revised_analysis = analyze_vocabulary_level(revised_summary, target_vocab, MOE_VOCABULARIES)
+            moe_vocabularies = get_moe_vocabularies()
+            target_vocab = get_vocabulary_for_grade(st.session_state.grade_level, moe_vocabularies)
+            revised_analysis = analyze_vocabulary_level(revised_summary, target_vocab, moe_vocabularies)
             
             st.markdown("**수정된 요약문 어휘 분석:**")
             col_r1, col_r2 = st.columns(2)
@@ -504,14 +748,41 @@ elif st.session_state.stage == "summary":
             with col_r2:
                 st.caption(f"기준 외 어휘: {revised_analysis['non_target_vocab_words']}개")
         
+        # 수정본 비교 피드백 (원문 재전송 없이 변경 내용만 평가)
+        previous_summary = st.session_state.last_reviewed_summary or st.session_state.user_summary
+        if st.button("수정본 피드백 받기", use_container_width=True, disabled=not revised_summary.strip() or revised_summary.strip() == previous_summary.strip()):
+            with st.spinner("수정된 부분을 비교하는 중입니다..."):
+                previous_context = get_session_value("feedback")
+                if st.session_state.revision_feedback:
+                    previous_context += "\n\n직전 수정 피드백:\n" + st.session_state.revision_feedback
+                
+                revision_feedback = provide_revision_feedback(
+                    previous_summary,
+                    revised_summary,
+                    previous_context,
+                    get_session_value("ai_summary"),
+                    st.session_state.keywords,
+                    st.session_state.grade_level,
+                    st.session_state.subject_type,
+                    get_moe_vocabularies()
+                )
+                st.session_state.revision_feedback = revision_feedback
+                st.session_state.last_reviewed_summary = revised_summary
+            st.rerun()
+        
+        if st.session_state.revision_feedback:
+            st.markdown("**수정본 비교 피드백**")
+            st.caption(f"평가한 수정본: {st.session_state.last_reviewed_summary}")
+            st.markdown(st.session_state.revision_feedback)
+        
         col1, col2, col3 = st.columns([1, 1, 1])
         
         with col1:
             if st.button("처음부터 다시", use_container_width=True):
+                clear_session_values()
                 st.session_state.update({
                     "stage": "input",
                     "teacher_info": {"grade": "", "school_type": "", "experience": ""},
-                    "original_text": "",
                     "source_type": "",
                     "year": "",
                     "grade_level": "",
@@ -519,19 +790,23 @@ elif st.session_state.stage == "summary":
                     "item_info": "",
                     "keywords": [],
                     "keyword_translations": {},
+                    "passage_hash": "",
+                    "library_hit": False,
+                    "library_match": {},
                     "user_summary": "",
-                    "ai_summary": "",
-                    "feedback": "",
-                    "vocab_analysis": {},
+                    "ai_summary_source": "",
+                    "revision_feedback": "",
+                    "last_reviewed_summary": "",
+                    "class_batch_results": [],
                     "survey_submitted": False
                 })
                 st.rerun()
         
         with col2:
             if st.button("새 지문으로", use_container_width=True):
+                clear_session_values()
                 st.session_state.update({
                     "stage": "input",
-                    "original_text": "",
                     "source_type": "",
                     "year": "",
                     "grade_level": "",
@@ -539,10 +814,14 @@ elif st.session_state.stage == "summary":
                     "item_info": "",
                     "keywords": [],
                     "keyword_translations": {},
+                    "passage_hash": "",
+                    "library_hit": False,
+                    "library_match": {},
                     "user_summary": "",
-                    "ai_summary": "",
-                    "feedback": "",
-                    "vocab_analysis": {},
+                    "ai_summary_source": "",
+                    "revision_feedback": "",
+                    "last_reviewed_summary": "",
+                    "class_batch_results": [],
                     "survey_submitted": False
                 })
                 st.rerun()
@@ -552,6 +831,8 @@ elif st.session_state.stage == "summary":
                 if st.button("TAM 설문조사 시작하기", type="secondary", use_container_width=True):
                     st.session_state.stage = "survey"
                     st.rerun()
+    
+    display_class_batch()
 
 # 3단계: TAM 설문조사
 elif st.session_state.stage == "survey":
@@ -564,9 +845,9 @@ elif st.session_state.stage == "survey":
             st.rerun()
     with col2:
         if st.button("새로운 요약 시작하기", use_container_width=True):
+            clear_session_values()
             st.session_state.update({
                 "stage": "input",
-                "original_text": "",
                 "source_type": "",
                 "year": "",
                 "grade_level": "",
@@ -574,10 +855,14 @@ elif st.session_state.stage == "survey":
                 "item_info": "",
                 "keywords": [],
                 "keyword_translations": {},
+                "passage_hash": "",
+                "library_hit": False,
+                "library_match": {},
                 "user_summary": "",
-                "ai_summary": "",
-                "feedback": "",
-                "vocab_analysis": {},
+                "ai_summary_source": "",
+                "revision_feedback": "",
+                "last_reviewed_summary": "",
+                "class_batch_results": [],
                 "survey_submitted": False
             })
             st.rerun()
@@ -622,29 +907,86 @@ with st.sidebar:
     else:
         st.error("AI 기능 제한")
     
-    if MOE_VOCABULARIES.get("combined"):
+    if not is_vocabulary_loaded():
+        st.caption("교육부 기본 어휘 목록은 첫 어휘 분석 시 로드됩니다.")
+    elif get_moe_vocabularies().get("combined"):
+        moe_vocabularies = get_moe_vocabularies()
         st.success(f"교육부 기본 어휘 목록 로드됨")
         vocab_info = f"""
 **어휘 통계:**
-- 2015년: {len(MOE_VOCABULARIES.get('2015', set()))}개
-- 2022년: {len(MOE_VOCABULARIES.get('2022', set()))}개  
-- 통합: {len(MOE_VOCABULARIES.get('combined', set()))}개
+- 2015년: {len(moe_vocabularies.get('2015', set()))}개
+- 2022년: {len(moe_vocabularies.get('2022', set()))}개  
+- 통합: {len(moe_vocabularies.get('combined', set()))}개
         """
         st.caption(vocab_info)
     else:
         st.warning("교육부 기본 어휘 목록 로드 안됨")
+    
+    if st.secrets.get("debug_mode", False):
+        from sheets_service import display_debug_info
+        display_debug_info()
+        
+        with st.expander("시작 성능 (지연 초기화)"):
+            timings = get_startup_timings()
+            if timings:
+                for name, seconds in timings.items():
+                    st.caption(f"{name}: {seconds * 1000:.0f}ms")
+            else:
+                st.caption("아직 초기화된 항목이 없습니다.")
+            
+            store_stats = SHARED_STORE.stats()
+            st.caption(f"공유 저장소: {store_stats['entries']}개 항목, "
+                       f"{store_stats['memory_used_bytes'] / 1024 / 1024:.1f}/{store_stats['memory_budget_bytes'] / 1024 / 1024:.0f}MB, "
+                       f"참조 {store_stats['total_refs']}개")
+            
+            if st.button("import 시간 측정 (-X importtime)"):
+                with st.spinner("새 프로세스에서 모듈 import 시간을 측정하는 중입니다..."):
+                    st.session_state.importtime_report = run_importtime_report()
+            if st.session_state.get("importtime_report"):
+                st.dataframe(st.session_state.importtime_report, hide_index=True)
+        
+        with st.expander("OpenAI 요청 현황"):
+            request_stats = get_openai_request_stats()
+            flight_stats = request_stats["single_flight"]
+            st.caption(f"실제 요청 {flight_stats['executions']}회, 동시 요청 합치기 {flight_stats['coalesced']}회 "
+                       f"(최대 {flight_stats['max_waiters']}명 대기), 진행 중 {flight_stats['in_flight']}건")
+            breaker_stats = request_stats["circuit_breaker"]
+            st.caption(f"차단기: {breaker_stats['state']} (연속 실패 {breaker_stats['consecutive_failures']}회, "
+                       f"차단 {breaker_stats['trips']}회, 즉시 대체 {breaker_stats['rejected']}건)")
+            if breaker_stats["last_error"]:
+                st.caption(f"마지막 오류: {breaker_stats['last_error']}")
+            concurrency_stats = request_stats["concurrency"]
+            st.caption(f"동시 요청 한도: {concurrency_stats['limit']}건 (진행 중 {concurrency_stats['in_flight']}건, 대기 {concurrency_stats['waiting']}건, "
+                       f"늘림 {concurrency_stats['increases']}회/줄임 {concurrency_stats['decreases']}회), "
+                       f"대기 {concurrency_stats['queued']}회 평균 {concurrency_stats['avg_wait_ms']}ms (최대 {concurrency_stats['max_wait_ms']}ms)")
+            for task, hedge_stats in request_stats["hedging"].items():
+                st.caption(f"추가 요청 ({task}): 요청 {hedge_stats['requests']}건 중 {hedge_stats['hedges']}건 추가 요청, "
+                           f"추가 요청이 먼저 응답 {hedge_stats['hedge_wins']}건, 비율 상한으로 생략 {hedge_stats['capped']}건")
+            chunk_stats = request_stats["chunk_cache"]
+            st.caption(f"긴 지문 조각 요약 캐시: {chunk_stats['entries']}개 (재사용 {chunk_stats['hits']}회, 새로 요약 {chunk_stats['misses']}회)")
+            constraint_stats = request_stats["summary_constraints"]
+            st.caption(f"모범 요약 제약 검사: {constraint_stats['checked']}회 (바로 통과 {constraint_stats['passed_first']}, "
+                       f"고쳐 쓰기 요청 {constraint_stats['rewrites']}, 수정 성공 {constraint_stats['fixed']}, "
+                       f"로컬 줄이기 {constraint_stats['trimmed']}, 미해결 {constraint_stats['unfixed']})")
+            if request_stats["tasks"]:
+                st.caption("작업별 모델 등급/지연 시간/추정 비용")
+                st.dataframe(request_stats["tasks"], use_container_width=True)
+        
+        with st.expander("어휘 로드 상태"):
+            for status in get_vocabulary_load_status():
+                getattr(st, status["level"])(status["message"])
 
     if st.session_state.get("teacher_info", {}).get("grade"):
         st.success("교사 정보 입력 완료")
-    if st.session_state.get("original_text"):
+    if get_session_value("original_text"):
         st.success("지문 입력 완료")
     if st.session_state.get("keywords"):
         st.success("키워드 분석 완료")
     if st.session_state.get("user_summary"):
         st.success("요약문 작성 완료")
-    if st.session_state.get("vocab_analysis"):
+    if get_session_value("vocab_analysis"):
         st.success("어휘 수준 분석 완료")
-    if st.session_state.get("feedback"):
+    if get_session_value("feedback"):
         st.success("교육과정 피드백 완료")
     if st.session_state.get("survey_submitted"):
         st.success("TAM 설문조사 완료")
@@ -0,0 +1,108 @@
+# model_router.py
+import threading
+from collections import deque
+
+# 작업별 최근 지연 시간 보관 개수 (p95 계산용)
+LATENCY_SAMPLE_SIZE = 200
+
+class ModelRouter:
+    """작업(번역/요약/피드백 등)을 설정된 모델 등급으로 연결하고 작업별 지연 시간/비용 통계를 기록"""
+
+    def __init__(self, tiers: dict, task_routes: dict, overrides: dict = None):
+        overrides = overrides or {}
+        self.tiers = {name: {**tier, **overrides.get("tiers", {}).get(name, {})} for name, tier in tiers.items()}
+        for name, tier in overrides.get("tiers", {}).items():
+            self.tiers.setdefault(name, dict(tier))
+        self.task_routes = {
+            task: {**route, **overrides.get("tasks", {}).get(task, {})} for task, route in task_routes.items()
+        }
+        for task, route in self.task_routes.items():
+            for key in ("tier", "fallback_tier", "hedge_tier"):
+                if route.get(key) and route[key] not in self.tiers:
+                    raise ValueError(f"'{task}' 작업의 {key} '{route[key]}'가 모델 등급 설정에 없습니다.")
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def route(self, task: str) -> dict:
+        """작업 설정 (tier, fallback_tier, hedge_tier, latency_budget_seconds, max_tokens, temperature)"""
+        return self.task_routes[task]
+
+    def model_for(self, tier: str) -> str:
+        return self.tiers[tier]["model"]
+
+    def latency_percentile(self, task: str, ratio: float, min_samples: int = 1):
+        """작업의 최근 성공 호출 지연 시간 백분위수 (초, 표본이 min_samples보다 적으면 None)
+
+        빨리 실패한 호출(429 등)이나 시간 초과로 끝난 호출은 정상 응답 시간 분포를 흐리므로 제외합니다.
+        """
+        with self._lock:
+            stats = self._stats.get(task)
+            latencies = sorted(stats["success_latencies"]) if stats else []
+        if len(latencies) < max(1, min_samples):
+            return None
+        return latencies[min(len(latencies) - 1, int(len(latencies) * ratio))]
+
+    def _task_stats_locked(self, task: str) -> dict:
+        if task not in self._stats:
+            self._stats[task] = {
+                "calls": 0, "errors": 0, "fallbacks": 0, "discarded": 0,
+                "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0,
+                "tiers": {}, "latencies": deque(maxlen=LATENCY_SAMPLE_SIZE), "success_latencies": deque(maxlen=LATENCY_SAMPLE_SIZE)
+            }
+        return self._stats[task]
+
+    def record_call(self, task: str, tier: str, latency_seconds: float, usage=None, error: bool = False, discarded: bool = False):
+        """실제 API 호출 한 건의 결과를 기록 (usage는 응답의 토큰 사용량)
+
+        discarded는 추가 요청 경쟁에서 진 쪽의 늦은 응답으로, 토큰 비용만 기록하고 호출 수/오류/지연 시간에는 넣지 않습니다.
+        """
+        tier_config = self.tiers[tier]
+        with self._lock:
+            stats = self._task_stats_locked(task)
+            if discarded:
+                stats["discarded"] += 1
+            else:
+                stats["calls"] += 1
+                stats["tiers"][tier] = stats["tiers"].get(tier, 0) + 1
+                stats["latencies"].append(latency_seconds)
+                if error:
+                    stats["errors"] += 1
+                else:
+                    stats["success_latencies"].append(latency_seconds)
+            if usage is not None:
+                stats["prompt_tokens"] += usage.prompt_tokens
+                stats["completion_tokens"] += usage.completion_tokens
+                stats["cost_usd"] += (
+                    usage.prompt_tokens * tier_config.get("input_cost_per_1m", 0)
+                    + usage.completion_tokens * tier_config.get("output_cost_per_1m", 0)
+                ) / 1_000_000
+
+    def record_fallback(self, task: str):
+        """지연 예산 초과로 대체 등급을 사용한 경우 기록"""
+        with self._lock:
+            self._task_stats_locked(task)["fallbacks"] += 1
+
+    def stats(self) -> list:
+        """작업별 호출 수/오류/대체/버린 늦은 응답/지연 시간(평균, p95)/토큰/추정 비용"""
+        rows = []
+        with self._lock:
+            for task, stats in self._stats.items():
+                latencies = sorted(stats["latencies"])
+                route = self.task_routes.get(task, {})
+                rows.append({
+                    "task": task,
+                    "tier": route.get("tier", ""),
+                    "model": self.tiers[route["tier"]]["model"] if route.get("tier") else "",
+                    "calls": stats["calls"],
+                    "errors": stats["errors"],
+                    "fallbacks": stats["fallbacks"],
+                    "discarded": stats["discarded"],
+                    "avg_ms": round(1000 * sum(latencies) / len(latencies)) if latencies else 0,
+                    "p95_ms": round(1000 * latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]) if latencies else 0,
+                    "budget_ms": round(1000 * route.get("latency_budget_seconds", 0)),
+                    "prompt_tokens": stats["prompt_tokens"],
+                    "completion_tokens": stats["completion_tokens"],
+                    "cost_usd": round(stats["cost_usd"], 4),
+                    "by_tier": ", ".join(f"{tier} {count}" for tier, count in sorted(stats["tiers"].items()))
+                })
+        return rows
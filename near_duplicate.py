@@ -0,0 +1,83 @@
+# near_duplicate.py
+import re
+import threading
+import zlib
+
+import numpy as np
+
+from utils import normalize_passage_text
+
+# MinHash/LSH 설정 (128개 해시 = 16밴드 x 8행, 유사도 약 0.7 이상에서 후보가 잡힘)
+MINHASH_NUM_PERM = 128
+LSH_BANDS = 16
+LSH_ROWS = MINHASH_NUM_PERM // LSH_BANDS
+SHINGLE_SIZE = 5
+MINHASH_SEED = 20240501
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_rng = np.random.RandomState(MINHASH_SEED)
+# a < 2^31, 해시값 < 2^32 이므로 a * h 가 uint64 범위를 넘지 않음
+_PERM_A = _rng.randint(1, 1 << 31, size=MINHASH_NUM_PERM, dtype=np.int64).astype(np.uint64)
+_PERM_B = _rng.randint(0, 1 << 31, size=MINHASH_NUM_PERM, dtype=np.int64).astype(np.uint64)
+
+def shingle_text(text: str) -> set:
+    """정규화한 지문을 문자 단위 5-gram 집합으로 변환 (줄바꿈/따옴표/오탈자에 강함)"""
+    text = normalize_passage_text(text).lower()
+    text = " ".join(re.findall(r"[a-z0-9]+", text))
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+def minhash_signature(text: str) -> np.ndarray:
+    """지문의 MinHash 서명 (uint64 배열) 계산"""
+    shingles = shingle_text(text)
+    if not shingles:
+        return np.full(MINHASH_NUM_PERM, _MERSENNE_PRIME, dtype=np.uint64)
+
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+    permuted = (hashes[:, None] * _PERM_A[None, :] + _PERM_B[None, :]) % _MERSENNE_PRIME
+    return permuted.min(axis=0)
+
+def estimate_jaccard(signature_a: np.ndarray, signature_b: np.ndarray) -> float:
+    """두 MinHash 서명으로 자카드 유사도 추정"""
+    return float(np.count_nonzero(signature_a == signature_b)) / MINHASH_NUM_PERM
+
+class NearDuplicateIndex:
+    """MinHash 서명에 대한 LSH 색인 (밴드별 버킷으로 후보만 비교)"""
+
+    def __init__(self):
+        self._signatures = {}
+        self._buckets = [dict() for _ in range(LSH_BANDS)]
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def __contains__(self, item_id):
+        return item_id in self._signatures
+
+    def _band_keys(self, signature: np.ndarray) -> list:
+        return [signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes() for band in range(LSH_BANDS)]
+
+    def add(self, item_id: str, signature: np.ndarray):
+        """서명을 색인에 추가"""
+        with self._lock:
+            if item_id in self._signatures:
+                return
+            self._signatures[item_id] = signature
+            for band, key in enumerate(self._band_keys(signature)):
+                self._buckets[band].setdefault(key, set()).add(item_id)
+
+    def query(self, signature: np.ndarray, threshold: float):
+        """임계값 이상으로 가장 유사한 항목의 (id, 추정 유사도) 반환 (없으면 None)"""
+        with self._lock:
+            candidates = set()
+            for band, key in enumerate(self._band_keys(signature)):
+                candidates.update(self._buckets[band].get(key, ()))
+
+            best = None
+            for item_id in candidates:
+                similarity = estimate_jaccard(signature, self._signatures[item_id])
+                if similarity >= threshold and (best is None or similarity > best[1]):
+                    best = (item_id, similarity)
+            return best
@@ -0,0 +1,149 @@
+# openai_cassette.py
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+
+import httpx
+
+# record: 항상 실제 API 호출 후 저장 / replay: 저장된 응답 사용, 없으면 실제 호출 후 저장 / offline: 저장된 응답만 사용 (없으면 오류)
+CASSETTE_MODES = ("record", "replay", "offline")
+
+# 카세트에 남길 응답 헤더 (인증 등 나머지 헤더는 저장하지 않음)
+KEPT_RESPONSE_HEADERS = ("content-type", "openai-model", "openai-processing-ms", "x-request-id")
+
+class CassetteMissError(httpx.TransportError):
+    """offline 모드에서 저장된 응답이 없는 요청
+
+    openai 클라이언트는 이 오류를 APIConnectionError로 감싸므로, ai_services는 원인을 확인해 이 오류로 다시 던집니다
+    (연결 실패처럼 로컬 결과로 대체하거나 차단기 실패로 세지 않음).
+    """
+
+def request_key(method: str, path: str, body: bytes) -> str:
+    """요청 메서드/경로/본문(JSON은 키 정렬)으로 만든 카세트 키 (호스트와 인증 헤더는 제외)"""
+    try:
+        canonical = json.dumps(json.loads(body), ensure_ascii=False, sort_keys=True)
+    except ValueError:
+        canonical = body.decode("utf-8", errors="replace")
+    return hashlib.sha256(f"{method.upper()} {path}\n{canonical}".encode("utf-8")).hexdigest()
+
+class CassetteTransport(httpx.BaseTransport):
+    """OpenAI 클라이언트 아래에서 요청/응답 쌍을 요청 해시별 JSON 파일로 기록하거나 재생하는 httpx 전송 계층
+
+    latency_seconds를 주면 재생할 때 그만큼 기다리고, use_recorded_latency면 기록 당시 응답 시간만큼 기다립니다.
+    요청의 읽기 제한 시간보다 오래 기다려야 하면 httpx.ReadTimeout을 내서 마감/차단기 동작도 재현합니다.
+    """
+
+    def __init__(self, cassette_dir, mode: str = "replay", latency_seconds: float = 0.0,
+                 use_recorded_latency: bool = False, transport: httpx.BaseTransport = None):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"카세트 모드는 {', '.join(CASSETTE_MODES)} 중 하나여야 합니다: {mode}")
+        self.cassette_dir = Path(cassette_dir)
+        self.mode = mode
+        self.latency_seconds = latency_seconds
+        self.use_recorded_latency = use_recorded_latency
+        self._transport = transport
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "recorded": 0}
+
+    def _live_transport(self) -> httpx.BaseTransport:
+        if self._transport is None:
+            self._transport = httpx.HTTPTransport()
+        return self._transport
+
+    def _path(self, key: str) -> Path:
+        return self.cassette_dir / f"{key}.json"
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        body = request.read()
+        key = request_key(request.method, request.url.raw_path.decode("ascii"), body)
+        path = self._path(key)
+
+        if self.mode != "record" and path.exists():
+            self._count("hits")
+            return self._replay(request, json.loads(path.read_text(encoding="utf-8")))
+
+        if self.mode == "offline":
+            self._count("misses")
+            raise CassetteMissError(f"저장된 응답이 없습니다 ({request.method} {request.url.path}, 키 {key[:12]})", request=request)
+
+        if self.mode == "replay":
+            self._count("misses")
+        return self._record(request, body, path)
+
+    def _replay(self, request: httpx.Request, entry: dict) -> httpx.Response:
+        delay = entry.get("elapsed_seconds", 0.0) if self.use_recorded_latency else self.latency_seconds
+        read_timeout = request.extensions.get("timeout", {}).get("read")
+        if read_timeout is not None and delay > read_timeout:
+            time.sleep(read_timeout)
+            raise httpx.ReadTimeout("재생 지연 시간이 요청 제한 시간을 넘었습니다.", request=request)
+        if delay > 0:
+            time.sleep(delay)
+
+        response = entry["response"]
+        content = response["body"] if isinstance(response["body"], str) else json.dumps(response["body"], ensure_ascii=False)
+        return httpx.Response(
+            status_code=response["status_code"],
+            headers=response["headers"],
+            content=content.encode("utf-8"),
+            request=request
+        )
+
+    def _record(self, request: httpx.Request, body: bytes, path: Path) -> httpx.Response:
+        start = time.monotonic()
+        response = self._live_transport().handle_request(request)
+        content = response.read()
+        elapsed = time.monotonic() - start
+
+        text = content.decode("utf-8", errors="replace")
+        try:
+            stored_body = json.loads(text)
+        except ValueError:
+            stored_body = text
+        try:
+            stored_request = json.loads(body)
+        except ValueError:
+            stored_request = body.decode("utf-8", errors="replace")
+
+        entry = {
+            "request": {"method": request.method, "path": request.url.path, "body": stored_request},
+            "response": {
+                "status_code": response.status_code,
+                "headers": {name: response.headers[name] for name in KEPT_RESPONSE_HEADERS if name in response.headers},
+                "body": stored_body
+            },
+            "elapsed_seconds": round(elapsed, 3),
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+        }
+        # 오류 응답은 재생하면 결과가 고정되므로 성공 응답만 저장
+        if response.is_success:
+            self.cassette_dir.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            temp_path.write_text(json.dumps(entry, ensure_ascii=False, indent=2), encoding="utf-8")
+            temp_path.replace(path)
+            self._count("recorded")
+
+        # content는 이미 압축을 푼 본문이므로 압축/길이 헤더는 다시 계산하도록 뺌
+        headers = [(name, value) for name, value in response.headers.multi_items()
+                   if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")]
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=headers,
+            content=content,
+            request=request,
+            extensions=response.extensions
+        )
+
+    def close(self):
+        if self._transport is not None:
+            self._transport.close()
+
+    def stats(self) -> dict:
+        """재생 적중/누락/새로 기록한 응답 수"""
+        with self._lock:
+            return {"mode": self.mode, **self._stats}
@@ -0,0 +1,244 @@
+# passage_library.py
+import datetime
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+from data_config import PASSAGE_LIBRARY_PATH, NEAR_DUPLICATE_JACCARD_THRESHOLD, ensure_data_directory, get_curriculum_key
+from near_duplicate import NearDuplicateIndex, minhash_signature
+from utils import normalize_passage_text, passage_hash
+
+# 오류 메시지가 결과로 저장되지 않도록 걸러내는 접두어
+FAILED_SUMMARY_PREFIXES = ("GPT 요약 불가", "GPT 요약 실패")
+
+class PassageLibrary:
+    """교사들이 함께 쓰는 지문 라이브러리 (정규화 지문 해시 + 출처 정보 색인)"""
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        self._lock = threading.Lock()
+        self._initialized = False
+        self._near_duplicate_index = None
+
+    @contextmanager
+    def _connect(self):
+        """커밋 후 닫히는 SQLite 연결 (스레드마다 별도 연결 사용)"""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _ensure_schema(self):
+        if self._initialized:
+            return
+        with self._lock:
+            if self._initialized:
+                return
+            ensure_data_directory()
+            with self._connect() as conn:
+                conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS passages (
+                        text_hash TEXT PRIMARY KEY,
+                        normalized_text TEXT NOT NULL,
+                        keywords TEXT NOT NULL DEFAULT '[]',
+                        keyword_translations TEXT NOT NULL DEFAULT '{}',
+                        created_at TEXT NOT NULL,
+                        hit_count INTEGER NOT NULL DEFAULT 0
+                    );
+                    CREATE TABLE IF NOT EXISTS passage_sources (
+                        text_hash TEXT NOT NULL,
+                        source_type TEXT NOT NULL,
+                        year TEXT NOT NULL,
+                        item_info TEXT NOT NULL,
+                        PRIMARY KEY (text_hash, source_type, year, item_info)
+                    );
+                    CREATE INDEX IF NOT EXISTS idx_passage_sources_meta
+                        ON passage_sources (source_type, year, item_info);
+                    CREATE TABLE IF NOT EXISTS passage_summaries (
+                        text_hash TEXT NOT NULL,
+                        curriculum_key TEXT NOT NULL,
+                        ai_summary TEXT NOT NULL,
+                        created_at TEXT NOT NULL,
+                        PRIMARY KEY (text_hash, curriculum_key)
+                    );
+                    CREATE TABLE IF NOT EXISTS passage_signatures (
+                        text_hash TEXT PRIMARY KEY,
+                        signature BLOB NOT NULL
+                    );
+                    CREATE TABLE IF NOT EXISTS passage_aliases (
+                        alias_hash TEXT PRIMARY KEY,
+                        text_hash TEXT NOT NULL,
+                        similarity REAL NOT NULL
+                    );
+                """)
+            self._initialized = True
+
+    def lookup(self, text: str):
+        """지문으로 저장된 키워드/번역을 조회 (유사 지문 별칭 포함, 없으면 None)"""
+        self._ensure_schema()
+        text_hash = passage_hash(text)
+        entry = self.lookup_by_hash(text_hash)
+        if entry is not None:
+            return entry
+
+        with self._connect() as conn:
+            alias = conn.execute("SELECT text_hash, similarity FROM passage_aliases WHERE alias_hash = ?", (text_hash,)).fetchone()
+        if alias is None:
+            return None
+        entry = self.lookup_by_hash(alias["text_hash"])
+        if entry is not None:
+            entry["similarity"] = alias["similarity"]
+        return entry
+
+    def lookup_by_hash(self, text_hash: str):
+        """해시로 저장된 지문 정보를 조회하고 사용 횟수를 기록"""
+        self._ensure_schema()
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM passages WHERE text_hash = ?", (text_hash,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE passages SET hit_count = hit_count + 1 WHERE text_hash = ?", (text_hash,))
+
+        return {
+            "text_hash": row["text_hash"],
+            "normalized_text": row["normalized_text"],
+            "keywords": json.loads(row["keywords"]),
+            "keyword_translations": json.loads(row["keyword_translations"]),
+            "hit_count": row["hit_count"] + 1
+        }
+
+    def save_passage(self, text: str, keywords: list, keyword_translations: dict, source_type: str = "", year: str = "", item_info: str = "") -> str:
+        """지문 분석 결과와 출처 정보를 저장하고 해시를 반환"""
+        self._ensure_schema()
+        text_hash = passage_hash(text)
+        now = datetime.datetime.now().isoformat()
+
+        with self._connect() as conn:
+            conn.execute(
+                """INSERT INTO passages (text_hash, normalized_text, keywords, keyword_translations, created_at)
+                   VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT(text_hash) DO UPDATE SET
+                       keywords = excluded.keywords,
+                       keyword_translations = CASE
+                           WHEN excluded.keyword_translations != '{}' THEN excluded.keyword_translations
+                           ELSE passages.keyword_translations END""",
+                (text_hash, normalize_passage_text(text), json.dumps(keywords, ensure_ascii=False),
+                 json.dumps(keyword_translations, ensure_ascii=False), now)
+            )
+            if source_type or year or item_info:
+                conn.execute(
+                    "INSERT OR IGNORE INTO passage_sources VALUES (?, ?, ?, ?)",
+                    (text_hash, source_type, year, item_info.strip())
+                )
+            # 직접 저장된 지문은 유사 지문 별칭보다 우선
+            conn.execute("DELETE FROM passage_aliases WHERE alias_hash = ?", (text_hash,))
+
+        self._index_passage(text_hash, text)
+        return text_hash
+
+    def _get_near_duplicate_index(self) -> NearDuplicateIndex:
+        """저장된 서명으로 LSH 색인을 최초 사용 시 한 번만 구성"""
+        if self._near_duplicate_index is not None:
+            return self._near_duplicate_index
+        self._ensure_schema()
+        with self._lock:
+            if self._near_duplicate_index is None:
+                index = NearDuplicateIndex()
+                with self._connect() as conn:
+                    for row in conn.execute("SELECT text_hash, signature FROM passage_signatures"):
+                        index.add(row["text_hash"], np.frombuffer(row["signature"], dtype=np.uint64))
+                    # 서명 없이 저장된 기존 지문 보완
+                    missing = conn.execute(
+                        "SELECT text_hash, normalized_text FROM passages WHERE text_hash NOT IN (SELECT text_hash FROM passage_signatures)"
+                    ).fetchall()
+                    for row in missing:
+                        signature = minhash_signature(row["normalized_text"])
+                        conn.execute("INSERT OR IGNORE INTO passage_signatures VALUES (?, ?)", (row["text_hash"], signature.tobytes()))
+                        index.add(row["text_hash"], signature)
+                self._near_duplicate_index = index
+        return self._near_duplicate_index
+
+    def _index_passage(self, text_hash: str, text: str):
+        """지문의 MinHash 서명을 저장하고 색인에 추가"""
+        index = self._get_near_duplicate_index()
+        if text_hash in index:
+            return
+        signature = minhash_signature(text)
+        with self._connect() as conn:
+            conn.execute("INSERT OR IGNORE INTO passage_signatures VALUES (?, ?)", (text_hash, signature.tobytes()))
+        index.add(text_hash, signature)
+
+    def find_similar(self, text: str, threshold: float = NEAR_DUPLICATE_JACCARD_THRESHOLD):
+        """줄바꿈/따옴표/누락 문장/오탈자가 다른 유사 지문을 찾아 저장 정보와 유사도를 반환 (없으면 None)"""
+        match = self._get_near_duplicate_index().query(minhash_signature(text), threshold)
+        if match is None:
+            return None
+        entry = self.lookup_by_hash(match[0])
+        if entry is not None:
+            entry["similarity"] = match[1]
+        return entry
+
+    def add_alias(self, text: str, text_hash: str, similarity: float):
+        """유사 지문을 기존 지문의 별칭으로 등록 (다음부터 정확 일치로 조회됨)"""
+        self._ensure_schema()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO passage_aliases VALUES (?, ?, ?)",
+                (passage_hash(text), text_hash, similarity)
+            )
+
+    def get_summary(self, text_hash: str, grade_level: str, subject_type: str):
+        """학년/과목유형별로 저장된 모범 요약을 조회 (없으면 None)"""
+        self._ensure_schema()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT ai_summary FROM passage_summaries WHERE text_hash = ? AND curriculum_key = ?",
+                (text_hash, get_curriculum_key(grade_level, subject_type))
+            ).fetchone()
+        return row["ai_summary"] if row else None
+
+    def save_summary(self, text_hash: str, grade_level: str, subject_type: str, ai_summary: str) -> bool:
+        """정상 생성된 모범 요약만 저장"""
+        if not ai_summary.strip() or ai_summary.startswith(FAILED_SUMMARY_PREFIXES):
+            return False
+
+        self._ensure_schema()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO passage_summaries VALUES (?, ?, ?, ?)",
+                (text_hash, get_curriculum_key(grade_level, subject_type), ai_summary,
+                 datetime.datetime.now().isoformat())
+            )
+        return True
+
+    def find_by_source(self, source_type: str, year: str = "", item_info: str = "") -> list:
+        """출처 정보(출처 유형/연도/상세 정보)로 저장된 지문 해시 목록 조회"""
+        self._ensure_schema()
+        query = "SELECT DISTINCT text_hash FROM passage_sources WHERE source_type = ?"
+        params = [source_type]
+        if year:
+            query += " AND year = ?"
+            params.append(year)
+        if item_info:
+            query += " AND item_info = ?"
+            params.append(item_info.strip())
+
+        with self._connect() as conn:
+            return [row["text_hash"] for row in conn.execute(query, params)]
+
+    def stats(self) -> dict:
+        """라이브러리 규모 및 재사용 현황"""
+        self._ensure_schema()
+        with self._connect() as conn:
+            passages, hits = conn.execute("SELECT COUNT(*), COALESCE(SUM(hit_count), 0) FROM passages").fetchone()
+            summaries = conn.execute("SELECT COUNT(*) FROM passage_summaries").fetchone()[0]
+        return {"passages": passages, "summaries": summaries, "reuse_count": hits}
+
+# 프로세스 전역 라이브러리 (모든 세션이 공유, 파일로 영속화)
+PASSAGE_LIBRARY = PassageLibrary(PASSAGE_LIBRARY_PATH)
@@ -0,0 +1,128 @@
+# passage_profiler.py
+import re
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+from data_config import PASSAGE_DIFFICULTY_TARGETS, PASSAGE_PROFILE_CACHE_SIZE, PASSAGE_LONG_SENTENCE_WORDS
+from local_summarizer import split_sentences, tokenize_words
+from utils import passage_hash
+from vocabulary_loader import VOCAB_BIT_2015, VOCAB_BIT_2022, get_moe_vocabularies, word_mask_with_inflections
+
+_profile_cache = OrderedDict()
+_profile_lock = threading.Lock()
+_syllable_table = None
+
+@lru_cache(maxsize=20000)
+def estimate_syllables(word: str) -> int:
+    """모음 묶음 수로 추정한 음절 수 (끝의 묵음 e 제외, 최소 1)"""
+    count = len(re.findall(r"[aeiouy]+", word))
+    if word.endswith("e") and not word.endswith(("le", "ee", "ye")) and count > 1:
+        count -= 1
+    return max(1, count)
+
+def get_syllable_table() -> dict:
+    """기본 어휘 전체의 음절 수 표 (최초 사용 시 한 번만 계산)"""
+    global _syllable_table
+    if _syllable_table is None:
+        with _profile_lock:
+            if _syllable_table is None:
+                _syllable_table = {word: estimate_syllables(word) for word in get_moe_vocabularies().word_masks}
+    return _syllable_table
+
+def _compute_profile(text: str) -> dict:
+    start = time.perf_counter()
+    sentences = split_sentences(text)
+    tokens = tokenize_words(text)
+    if not tokens:
+        return {}
+
+    # 고유 단어별로 한 번만 조회하고 역색인으로 전체 단어에 펼침
+    unique_words, inverse, frequency = np.unique(np.array(tokens), return_inverse=True, return_counts=True)
+    word_masks = get_moe_vocabularies().word_masks
+    syllable_table = get_syllable_table()
+    unique_masks = np.array([word_mask_with_inflections(w, word_masks) for w in unique_words], dtype=np.int64)
+    unique_syllables = np.array([syllable_table.get(w) or estimate_syllables(w) for w in unique_words], dtype=np.int64)
+    token_masks = unique_masks[inverse]
+    total_syllables = int(unique_syllables[inverse].sum())
+
+    sentence_lengths = np.array([len(tokenize_words(s)) for s in sentences] or [len(tokens)])
+    sentence_lengths = sentence_lengths[sentence_lengths > 0]
+    words_per_sentence = len(tokens) / len(sentence_lengths)
+    syllables_per_word = total_syllables / len(tokens)
+
+    in_2015 = (token_masks & VOCAB_BIT_2015) != 0
+    in_2022 = (token_masks & VOCAB_BIT_2022) != 0
+    off_list = unique_masks == 0
+    order = np.argsort(-frequency[off_list], kind="stable")
+
+    return {
+        "words": len(tokens),
+        "unique_words": len(unique_words),
+        "sentences": len(sentence_lengths),
+        "sentence_length": {
+            "mean": round(float(sentence_lengths.mean()), 1),
+            "median": float(np.median(sentence_lengths)),
+            "p90": float(np.percentile(sentence_lengths, 90)),
+            "max": int(sentence_lengths.max()),
+            "long_ratio": round(float((sentence_lengths > PASSAGE_LONG_SENTENCE_WORDS).mean()), 3)
+        },
+        "syllables_per_word": round(syllables_per_word, 2),
+        # Flesch-Kincaid 학년 / Flesch 읽기 쉬움 지수
+        "fk_grade": round(0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59, 1),
+        "reading_ease": round(206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word, 1),
+        "coverage": {"2015": round(float(in_2015.mean()), 3), "2022": round(float(in_2022.mean()), 3)},
+        "out_of_list_density": {"2015": round(float(1 - in_2015.mean()), 3), "2022": round(float(1 - in_2022.mean()), 3)},
+        "out_of_list_examples": [str(w) for w in unique_words[off_list][order][:10]],
+        "elapsed_ms": round(1000 * (time.perf_counter() - start), 2)
+    }
+
+def profile_passage(text: str) -> dict:
+    """지문 난이도 프로필 (기본 어휘 포함률, 기준 밖 어휘 밀도, 문장 길이 분포, 읽기 지수), 지문 해시별 캐시"""
+    key = passage_hash(text)
+    with _profile_lock:
+        if key in _profile_cache:
+            _profile_cache.move_to_end(key)
+            return _profile_cache[key]
+
+    profile = _compute_profile(text)
+    with _profile_lock:
+        _profile_cache[key] = profile
+        while len(_profile_cache) > PASSAGE_PROFILE_CACHE_SIZE:
+            _profile_cache.popitem(last=False)
+    return profile
+
+def assess_passage_fit(profile: dict, grade_level: str) -> dict:
+    """프로필을 학년 기준과 비교해 적합/쉬움/어려움 판정과 이유를 반환"""
+    targets = PASSAGE_DIFFICULTY_TARGETS.get(grade_level)
+    if not profile or not targets:
+        return {"level": "판정 불가", "reasons": []}
+
+    curriculum_year = "2022" if grade_level == "고1" else "2015"
+    density = profile["out_of_list_density"][curriculum_year]
+    reasons = []
+    if profile["fk_grade"] > targets["max_fk_grade"]:
+        reasons.append(f"읽기 지수(FK {profile['fk_grade']})가 {grade_level} 기준({targets['max_fk_grade']} 이하)보다 높음")
+    if density > targets["max_out_of_list_density"]:
+        reasons.append(f"{curriculum_year} 기본 어휘 밖 단어 비율({density:.0%})이 기준({targets['max_out_of_list_density']:.0%} 이하)보다 높음")
+    if reasons:
+        return {"level": "어려움", "reasons": reasons}
+    if profile["fk_grade"] < targets["min_fk_grade"]:
+        return {"level": "쉬움", "reasons": [f"읽기 지수(FK {profile['fk_grade']})가 {grade_level} 기준({targets['min_fk_grade']} 이상)보다 낮음"]}
+    return {"level": "적합", "reasons": []}
+
+def format_profile_for_prompt(profile: dict, grade_level: str) -> str:
+    """프롬프트에 넣을 지문 난이도 요약 (모델이 난이도를 따로 추정하지 않도록 로컬 분석 결과 전달)"""
+    if not profile:
+        return ""
+    curriculum_year = "2022" if grade_level == "고1" else "2015"
+    fit = assess_passage_fit(profile, grade_level)
+    return (
+        f"지문 난이도 (로컬 분석): {profile['words']}단어, {profile['sentences']}문장, "
+        f"평균 문장 길이 {profile['sentence_length']['mean']}단어 (최대 {profile['sentence_length']['max']}), "
+        f"FK 학년 {profile['fk_grade']}, {curriculum_year} 기본 어휘 포함률 {profile['coverage'][curriculum_year]:.0%}, "
+        f"기준 밖 어휘 밀도 {profile['out_of_list_density'][curriculum_year]:.0%} → {grade_level} 기준 '{fit['level']}'"
+    )
@@ -0,0 +1,197 @@
+# rate_limiter.py
+import threading
+import time
+
+class TokenBucket:
+    """토큰 버킷 속도 제한기 (초당 rate_per_second개 충전, 최대 capacity개까지 몰아서 사용 가능)"""
+
+    def __init__(self, rate_per_second: float, capacity: float):
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._max_waiting = 0
+        self._acquired = 0
+        self._throttled = 0
+        self._total_wait_seconds = 0.0
+
+    def _refill_locked(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_second)
+        self._updated_at = now
+
+    def acquire(self, tokens: float = 1, timeout: float = None) -> float:
+        """토큰을 얻을 때까지 기다린 뒤 대기 시간(초)을 반환 (timeout 초과 시 TimeoutError)"""
+        start = time.monotonic()
+        waited = False
+        try:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    self._refill_locked(now)
+                    if self._tokens >= tokens:
+                        self._tokens -= tokens
+                        self._acquired += 1
+                        elapsed = now - start
+                        if waited:
+                            self._throttled += 1
+                            self._total_wait_seconds += elapsed
+                        return elapsed
+                    wait_seconds = (tokens - self._tokens) / self.rate_per_second
+                    if not waited:
+                        waited = True
+                        self._waiting += 1
+                        self._max_waiting = max(self._max_waiting, self._waiting)
+
+                if timeout is not None:
+                    remaining = timeout - (time.monotonic() - start)
+                    if remaining <= 0:
+                        raise TimeoutError("요청 한도 대기 시간이 초과되었습니다.")
+                    wait_seconds = min(wait_seconds, remaining)
+                time.sleep(wait_seconds)
+        finally:
+            if waited:
+                with self._lock:
+                    self._waiting -= 1
+
+    def stats(self) -> dict:
+        """토큰 잔량과 대기 현황"""
+        with self._lock:
+            self._refill_locked(time.monotonic())
+            return {
+                "tokens": round(self._tokens, 2),
+                "capacity": self.capacity,
+                "rate_per_minute": self.rate_per_second * 60,
+                "waiting": self._waiting,
+                "max_waiting": self._max_waiting,
+                "acquired": self._acquired,
+                "throttled": self._throttled,
+                "total_wait_seconds": round(self._total_wait_seconds, 2)
+            }
+
+class LimiterSlot:
+    """동시 요청 한도에서 얻은 자리 하나 (release/abandon 중 처음 한 번만 반영되므로 다른 스레드에서 먼저 반환해도 안전)"""
+
+    def __init__(self, limiter):
+        self._limiter = limiter
+        self._lock = threading.Lock()
+        self._held = True
+
+    def _give_up(self) -> bool:
+        with self._lock:
+            held, self._held = self._held, False
+            return held
+
+    def release(self, latency_seconds: float, overloaded: bool = False, latency_target_seconds: float = None):
+        if self._give_up():
+            self._limiter.release(latency_seconds, overloaded, latency_target_seconds)
+
+    def abandon(self):
+        if self._give_up():
+            self._limiter.abandon()
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD 방식 동시 요청 한도 (한도가 찬 요청은 대기열에서 기다림)
+
+    - 한도를 다 쓰는 중에 응답이 latency_target 안에 오면 한도를 1/한도씩 늘림 (한도만큼 성공하면 약 +1)
+    - 429/시간 초과가 오면 한도를 decrease_factor배로 줄임
+    - 마지막으로 줄이기 전에 시작한 요청의 결과는 한도 조정에 쓰지 않음 (같은 혼잡으로 연달아 줄이거나 바로 다시 늘리지 않도록)
+    """
+
+    def __init__(self, initial_limit: float, min_limit: float, max_limit: float, latency_target_seconds: float,
+                 decrease_factor: float = 0.5):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target_seconds = latency_target_seconds
+        self.decrease_factor = decrease_factor
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        self._last_decrease_at = 0.0
+        self._waiting = 0
+        self._max_waiting = 0
+        self._acquired = 0
+        self._queued = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        self._increases = 0
+        self._decreases = 0
+
+    @property
+    def limit(self) -> int:
+        """현재 동시 요청 한도 (정수)"""
+        with self._condition:
+            return int(self._limit)
+
+    def acquire(self, timeout: float = None) -> float:
+        """자리가 날 때까지 기다린 뒤 대기 시간(초)을 반환 (timeout 초과 시 TimeoutError)"""
+        start = time.monotonic()
+        with self._condition:
+            if self._in_flight >= int(self._limit):
+                self._waiting += 1
+                self._max_waiting = max(self._max_waiting, self._waiting)
+                try:
+                    while self._in_flight >= int(self._limit):
+                        remaining = None if timeout is None else timeout - (time.monotonic() - start)
+                        if remaining is not None and remaining <= 0:
+                            raise TimeoutError("동시 요청 한도 대기 시간이 초과되었습니다.")
+                        self._condition.wait(remaining)
+                finally:
+                    self._waiting -= 1
+                waited = time.monotonic() - start
+                self._queued += 1
+                self._total_wait_seconds += waited
+                self._max_wait_seconds = max(self._max_wait_seconds, waited)
+            else:
+                waited = 0.0
+            self._in_flight += 1
+            self._acquired += 1
+            return waited
+
+    def acquire_slot(self, timeout: float = None) -> LimiterSlot:
+        """acquire 후 반환용 자리 객체를 돌려줌"""
+        self.acquire(timeout)
+        return LimiterSlot(self)
+
+    def release(self, latency_seconds: float, overloaded: bool = False, latency_target_seconds: float = None):
+        """요청 완료 기록 (latency_seconds: 자리를 얻은 뒤 걸린 시간, overloaded: 429/시간 초과) 후 한도 조정"""
+        with self._condition:
+            saturated = self._in_flight >= int(self._limit)
+            self._in_flight -= 1
+            now = time.monotonic()
+            started_before_decrease = now - latency_seconds < self._last_decrease_at
+            if overloaded and not started_before_decrease:
+                self._limit = max(self.min_limit, self._limit * self.decrease_factor)
+                self._last_decrease_at = now
+                self._decreases += 1
+            elif saturated and not overloaded and not started_before_decrease \
+                    and latency_seconds <= (latency_target_seconds or self.latency_target_seconds):
+                # 한도를 다 쓰지 않는 동안에는 늘리지 않음 (한가할 때 한도만 커지는 것 방지)
+                new_limit = min(self.max_limit, self._limit + 1 / self._limit)
+                if int(new_limit) > int(self._limit):
+                    self._increases += 1
+                self._limit = new_limit
+            self._condition.notify_all()
+
+    def abandon(self):
+        """요청을 보내지 않고 자리만 반환 (한도 조정 없음)"""
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def stats(self) -> dict:
+        """현재 한도와 대기 현황"""
+        with self._condition:
+            return {
+                "limit": int(self._limit),
+                "in_flight": self._in_flight,
+                "waiting": self._waiting,
+                "max_waiting": self._max_waiting,
+                "acquired": self._acquired,
+                "queued": self._queued,
+                "avg_wait_ms": round(1000 * self._total_wait_seconds / self._queued) if self._queued else 0,
+                "max_wait_ms": round(1000 * self._max_wait_seconds),
+                "increases": self._increases,
+                "decreases": self._decreases
+            }
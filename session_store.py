@@ -0,0 +1,152 @@
+# session_store.py
+import copy
+import hashlib
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import streamlit as st
+
+from data_config import SESSION_STORE_MEMORY_BUDGET_MB, SESSION_STORE_IDLE_TTL_SECONDS
+
+# 세션에는 키만 두고 실제 값은 공유 저장소에 보관하는 필드와 기본값
+SHARED_SESSION_FIELDS = {
+    "original_text": "",
+    "ai_summary": "",
+    "feedback": "",
+    "vocab_analysis": {},
+}
+
+def _serialize(value) -> bytes:
+    """값을 해시/크기 계산용 바이트열로 직렬화"""
+    if isinstance(value, str):
+        return value.encode("utf-8")
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")
+
+class SharedValueStore:
+    """해시 키 기반 참조 카운트 공유 저장소 (전역 메모리 예산 + LRU 제거)"""
+
+    def __init__(self, memory_budget_bytes: int, idle_ttl_seconds: float):
+        self.memory_budget_bytes = memory_budget_bytes
+        self.idle_ttl_seconds = idle_ttl_seconds
+        # key -> {"value", "size", "refs", "last_access"} (앞쪽이 가장 오래 사용되지 않은 항목)
+        self._entries = OrderedDict()
+        self._memory_used = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def intern(self, value) -> str:
+        """값을 저장소에 넣고(이미 있으면 공유) 참조를 하나 늘린 뒤 키를 반환"""
+        data = _serialize(value)
+        key = f"{type(value).__name__}:{hashlib.sha256(data).hexdigest()}"
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry["refs"] += 1
+                entry["last_access"] = time.monotonic()
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return key
+
+            size = sys.getsizeof(value) if isinstance(value, str) else len(data) * 2
+            self._entries[key] = {
+                "value": value,
+                "size": size,
+                "refs": 1,
+                "last_access": time.monotonic()
+            }
+            self._memory_used += size
+            self._evict_locked(protect_key=key)
+            return key
+
+    def get(self, key: str, default=None):
+        """키로 값을 조회 (제거된 경우 default 반환)"""
+        if not key:
+            return default
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return default
+            entry["last_access"] = time.monotonic()
+            self._entries.move_to_end(key)
+            return entry["value"]
+
+    def release(self, key: str):
+        """참조를 하나 줄임 (0이 되면 다음 제거 대상이 됨)"""
+        if not key:
+            return
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry["refs"] = max(0, entry["refs"] - 1)
+            self._evict_locked()
+
+    def _remove_locked(self, key: str):
+        entry = self._entries.pop(key)
+        self._memory_used -= entry["size"]
+        self._evictions += 1
+
+    def _evict_locked(self, protect_key: str = ""):
+        """예산을 넘으면 참조 없는 항목 → 방치된 세션 항목 → 오래된 항목 순으로 제거"""
+        if self._memory_used <= self.memory_budget_bytes:
+            return
+
+        now = time.monotonic()
+        candidates = [
+            lambda e: e["refs"] == 0,
+            lambda e: now - e["last_access"] > self.idle_ttl_seconds,
+            lambda e: True,
+        ]
+        for is_evictable in candidates:
+            for key in [k for k, e in self._entries.items() if k != protect_key and is_evictable(e)]:
+                if self._memory_used <= self.memory_budget_bytes:
+                    return
+                self._remove_locked(key)
+
+    def stats(self) -> dict:
+        """저장소 사용 현황"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "memory_used_bytes": self._memory_used,
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "total_refs": sum(e["refs"] for e in self._entries.values()),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions
+            }
+
+# 프로세스 전역 저장소 (모든 Streamlit 세션이 공유)
+SHARED_STORE = SharedValueStore(
+    memory_budget_bytes=SESSION_STORE_MEMORY_BUDGET_MB * 1024 * 1024,
+    idle_ttl_seconds=SESSION_STORE_IDLE_TTL_SECONDS
+)
+
+def get_session_value(field: str):
+    """세션에 저장된 키로 공유 저장소의 값을 조회 (값이 없으면 기본값의 복사본)"""
+    default = copy.copy(SHARED_SESSION_FIELDS[field])
+    return SHARED_STORE.get(st.session_state.get(f"{field}_key", ""), default)
+
+def set_session_value(field: str, value):
+    """값을 공유 저장소에 넣고 세션에는 키만 저장 (이전 값의 참조는 해제)"""
+    old_key = st.session_state.get(f"{field}_key", "")
+    new_key = SHARED_STORE.intern(value) if value else ""
+    SHARED_STORE.release(old_key)
+    st.session_state[f"{field}_key"] = new_key
+
+def clear_session_values(*fields):
+    """지정한 공유 필드(기본: 전체)의 참조를 해제하고 세션 키를 비움"""
+    for field in fields or SHARED_SESSION_FIELDS:
+        set_session_value(field, SHARED_SESSION_FIELDS[field])
+
+def is_session_value_missing(field: str) -> bool:
+    """세션에는 키가 있으나 저장소에서 제거된 경우 True"""
+    key = st.session_state.get(f"{field}_key", "")
+    return bool(key) and SHARED_STORE.get(key) is None
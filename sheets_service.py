@@ -1,11 +1,19 @@
 # sheets_service.py
-import gspread
-from google.oauth2.service_account import Credentials
 import streamlit as st
 import json
 import datetime
+import random
+import threading
+import time
 import traceback
 
+from data_config import (
+    SHEETS_REQUESTS_PER_MINUTE, SHEETS_BURST_REQUESTS, SHEETS_MAX_RETRIES,
+    SHEETS_BACKOFF_BASE_SECONDS, SHEETS_BACKOFF_MAX_SECONDS, SHEETS_APPEND_BATCH_MAX_ROWS
+)
+from rate_limiter import TokenBucket
+from startup_profiler import record_startup_timing
+
 # 상수 정의
 WORKSHEET_NAME = "TAM_Survey_Data"
 BACKUP_WORKSHEET_NAME = "TAM_Survey_Backup"
@@ -47,6 +55,138 @@ SURVEY_HEADERS = [
     "feedback_text"
 ]
 
+# 모든 Sheets API 요청이 공유하는 분당 한도
+SHEETS_RATE_LIMITER = TokenBucket(SHEETS_REQUESTS_PER_MINUTE / 60, SHEETS_BURST_REQUESTS)
+
+_sheets_metrics = {
+    "requests": 0,
+    "retries": 0,
+    "rate_limited_responses": 0,
+    "server_errors": 0,
+    "failed_after_retries": 0,
+    "append_batches": 0,
+    "appended_rows": 0,
+    "max_batch_rows": 0
+}
+_sheets_metrics_lock = threading.Lock()
+
+def _record_metric(name: str, amount: int = 1):
+    with _sheets_metrics_lock:
+        _sheets_metrics[name] += amount
+
+def _retry_delay(error, attempt: int) -> float:
+    """재시도 대기 시간 (Retry-After가 있으면 따르고, 없으면 지수 백오프 범위에서 무작위)"""
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), SHEETS_BACKOFF_MAX_SECONDS)
+    return random.uniform(0, min(SHEETS_BACKOFF_MAX_SECONDS, SHEETS_BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+def _is_retryable(error, idempotent: bool = True) -> bool:
+    """429(한도 초과)/5xx/네트워크 오류만 재시도
+
+    행 추가처럼 두 번 실행하면 결과가 달라지는 요청은 429만 재시도합니다.
+    5xx/시간 초과/연결 끊김은 서버가 이미 처리했을 수 있어 다시 보내면 같은 행이 중복 저장될 수 있습니다.
+    """
+    import gspread
+    import requests
+    if isinstance(error, gspread.exceptions.APIError):
+        status = error.response.status_code
+        if status == 429:
+            _record_metric("rate_limited_responses")
+            return True
+        if status >= 500:
+            _record_metric("server_errors")
+            return idempotent
+        return False
+    return idempotent and isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+def sheets_call(fn, *args, idempotent: bool = True, **kwargs):
+    """Sheets API 요청 실행 (공유 토큰 버킷으로 속도 제한, 429/5xx는 지터 백오프로 재시도)
+
+    idempotent=False인 요청(행 추가, 워크시트 생성)은 429일 때만 재시도합니다.
+    """
+    for attempt in range(SHEETS_MAX_RETRIES + 1):
+        SHEETS_RATE_LIMITER.acquire()
+        _record_metric("requests")
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if not _is_retryable(e, idempotent):
+                raise
+            if attempt == SHEETS_MAX_RETRIES:
+                _record_metric("failed_after_retries")
+                raise
+            _record_metric("retries")
+            time.sleep(_retry_delay(e, attempt))
+
+class _PendingAppend:
+    """일괄 저장을 기다리는 설문 응답 한 행"""
+
+    def __init__(self, row: list):
+        self.row = row
+        self.done = threading.Event()
+        self.error = None
+
+_pending_appends = []
+_append_lock = threading.Lock()
+_append_flushing = False
+
+def append_row_batched(worksheet, row: list):
+    """행 추가 요청을 모아 append_rows 한 번으로 저장 (먼저 온 요청이 그동안 쌓인 행을 함께 저장)
+
+    같은 워크시트(설문 워크시트)에만 사용합니다. 저장에 실패하면 해당 배치의 모든 호출자에게 예외가 전달됩니다.
+    """
+    global _append_flushing
+    pending = _PendingAppend(row)
+    with _append_lock:
+        _pending_appends.append(pending)
+        leader = not _append_flushing
+        _append_flushing = True
+
+    if not leader:
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return
+
+    try:
+        while True:
+            with _append_lock:
+                batch = _pending_appends[:SHEETS_APPEND_BATCH_MAX_ROWS]
+                del _pending_appends[:len(batch)]
+                if not batch:
+                    _append_flushing = False
+                    break
+            try:
+                sheets_call(worksheet.append_rows, [item.row for item in batch], idempotent=False)
+                _record_metric("append_batches")
+                _record_metric("appended_rows", len(batch))
+                with _sheets_metrics_lock:
+                    _sheets_metrics["max_batch_rows"] = max(_sheets_metrics["max_batch_rows"], len(batch))
+            except Exception as e:
+                for item in batch:
+                    item.error = e
+            for item in batch:
+                item.done.set()
+    except BaseException:
+        # 예기치 않은 중단 시 다음 요청이 다시 저장을 맡도록 상태 복구
+        with _append_lock:
+            _append_flushing = False
+        raise
+
+    if pending.error is not None:
+        raise pending.error
+
+def get_sheets_metrics() -> dict:
+    """Sheets API 요청/재시도/일괄 저장 현황과 대기열 길이"""
+    with _sheets_metrics_lock:
+        metrics = dict(_sheets_metrics)
+    with _append_lock:
+        metrics["pending_appends"] = len(_pending_appends)
+    metrics["rate_limiter"] = SHEETS_RATE_LIMITER.stats()
+    return metrics
+
 def check_secrets_configuration():
     """Secrets 설정 상태 확인"""
     missing_configs = []
@@ -67,6 +207,11 @@ def check_secrets_configuration():
 def setup_google_sheets():
     """Google Sheets 연결 설정 (개선된 오류 처리)"""
     try:
+        # gspread/google-auth는 실제 연결 시점에만 로드
+        with record_startup_timing("Google Sheets 모듈 로드"):
+            import gspread
+            from google.oauth2.service_account import Credentials
+        
         # Secrets 설정 확인
         missing_configs = check_secrets_configuration()
         if missing_configs:
@@ -94,7 +239,7 @@ def setup_google_sheets():
         spreadsheet_id = st.secrets["google_sheets"]["spreadsheet_id"]
         
         try:
-            spreadsheet = client.open_by_key(spreadsheet_id)
+            spreadsheet = sheets_call(client.open_by_key, spreadsheet_id)
             return spreadsheet
         except gspread.SpreadsheetNotFound:
             st.error("❌ 지정된 Google Sheets를 찾을 수 없습니다.")
@@ -115,13 +260,15 @@ def setup_google_sheets():
 
 def initialize_survey_worksheet(spreadsheet):
     """설문 데이터 워크시트 초기화 (개선된 버전)"""
+    import gspread
+    
     try:
         # 기존 워크시트 확인
         try:
-            worksheet = spreadsheet.worksheet(WORKSHEET_NAME)
+            worksheet = sheets_call(spreadsheet.worksheet, WORKSHEET_NAME)
             
             # 헤더 확인 (첫 번째 행이 올바른 헤더인지 체크)
-            existing_headers = worksheet.row_values(1)
+            existing_headers = sheets_call(worksheet.row_values, 1)
             if existing_headers == SURVEY_HEADERS:
                 return worksheet
             else:
@@ -129,25 +276,27 @@ def initialize_survey_worksheet(spreadsheet):
                 # 백업 워크시트 생성 후 새로 만들기
                 timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
                 backup_name = f"{BACKUP_WORKSHEET_NAME}_{timestamp}"
-                worksheet.update_title(backup_name)
+                sheets_call(worksheet.update_title, backup_name)
                 st.info(f"💾 기존 데이터를 '{backup_name}'으로 백업했습니다.")
                 
         except gspread.WorksheetNotFound:
             pass
         
         # 새 워크시트 생성
-        worksheet = spreadsheet.add_worksheet(
+        worksheet = sheets_call(
+            spreadsheet.add_worksheet,
             title=WORKSHEET_NAME,
             rows=SPREADSHEET_ROWS,
-            cols=SPREADSHEET_COLS
+            cols=SPREADSHEET_COLS,
+            idempotent=False
         )
         
         # 헤더 추가
-        worksheet.append_row(SURVEY_HEADERS)
+        sheets_call(worksheet.append_row, SURVEY_HEADERS, idempotent=False)
         
         # 헤더 행 서식 설정
         try:
-            worksheet.format('A1:AI1', {
+            sheets_call(worksheet.format, 'A1:AI1', {
                 "backgroundColor": {"red": 0.8, "green": 0.9, "blue": 1.0},
                 "textFormat": {"bold": True, "fontSize": 10},
                 "horizontalAlignment": "CENTER"
@@ -163,18 +312,41 @@ def initialize_survey_worksheet(spreadsheet):
         st.error(f"❌ 워크시트 초기화 실패: {str(e)}")
         return None
 
-def save_survey_to_sheets(survey_data):
-    """설문 데이터를 Google Sheets에 저장 (개선된 버전)"""
-    try:
-        # Google Sheets 연결
+# 헤더 확인을 마친 설문 워크시트 (저장할 때마다 연결/헤더 확인 요청을 반복하지 않도록 재사용)
+_survey_worksheet = None
+_survey_worksheet_lock = threading.Lock()
+
+def get_survey_worksheet():
+    """설문 워크시트를 (워크시트, 오류 메시지) 형태로 반환 (동시에 여러 명이 저장해도 초기화는 한 번만)"""
+    global _survey_worksheet
+    with _survey_worksheet_lock:
+        if _survey_worksheet is not None:
+            return _survey_worksheet, ""
+        
         spreadsheet = setup_google_sheets()
         if not spreadsheet:
-            return False, "Google Sheets 연결 실패"
+            return None, "Google Sheets 연결 실패"
         
-        # 워크시트 준비
         worksheet = initialize_survey_worksheet(spreadsheet)
         if not worksheet:
-            return False, "워크시트 초기화 실패"
+            return None, "워크시트 초기화 실패"
+        
+        _survey_worksheet = worksheet
+        return worksheet, ""
+
+def reset_survey_worksheet():
+    """재사용 중인 설문 워크시트를 버림 (저장 실패 시 다음 저장에서 다시 연결/확인)"""
+    global _survey_worksheet
+    with _survey_worksheet_lock:
+        _survey_worksheet = None
+
+def save_survey_to_sheets(survey_data):
+    """설문 데이터를 Google Sheets에 저장 (개선된 버전)"""
+    try:
+        # 워크시트 준비 (연결 및 헤더 확인은 최초 한 번)
+        worksheet, error_msg = get_survey_worksheet()
+        if not worksheet:
+            return False, error_msg
         
         # 참여자 고유 ID 생성 (더 안전한 방식)
         timestamp = datetime.datetime.now()
@@ -213,12 +385,13 @@ def save_survey_to_sheets(survey_data):
         if len(row_data) != len(SURVEY_HEADERS):
             return False, f"데이터 길이 불일치: 예상 {len(SURVEY_HEADERS)}, 실제 {len(row_data)}"
         
-        # 데이터 저장
-        worksheet.append_row(row_data)
+        # 데이터 저장 (동시에 제출된 응답은 한 번의 append_rows로 묶어 저장)
+        append_row_batched(worksheet, row_data)
         
         return True, participant_id
         
     except Exception as e:
+        reset_survey_worksheet()
         error_msg = f"데이터 저장 실패: {str(e)}"
         
         # 디버그 모드에서만 상세 오류 표시
@@ -229,14 +402,16 @@ def save_survey_to_sheets(survey_data):
 
 def get_survey_statistics():
     """저장된 설문 통계 조회 (관리자용)"""
+    import gspread
+    
     try:
         spreadsheet = setup_google_sheets()
         if not spreadsheet:
             return None
         
         try:
-            worksheet = spreadsheet.worksheet(WORKSHEET_NAME)
-            records = worksheet.get_all_records()
+            worksheet = sheets_call(spreadsheet.worksheet, WORKSHEET_NAME)
+            records = sheets_call(worksheet.get_all_records)
             
             if not records:
                 return {"total_responses": 0, "message": "아직 응답이 없습니다."}
@@ -304,14 +479,15 @@ def test_sheets_connection():
             st.success(f"✅ 스프레드시트 연결 성공: **{spreadsheet.title}**")
             
             # 3. 워크시트 목록 표시
-            worksheets = spreadsheet.worksheets()
+            worksheets = sheets_call(spreadsheet.worksheets)
             worksheet_names = [ws.title for ws in worksheets]
             st.info(f"📋 사용 가능한 워크시트: {', '.join(worksheet_names)}")
             
             # 4. 설문 워크시트 확인
+            import gspread
             try:
-                survey_worksheet = spreadsheet.worksheet(WORKSHEET_NAME)
-                record_count = len(survey_worksheet.get_all_records())
+                survey_worksheet = sheets_call(spreadsheet.worksheet, WORKSHEET_NAME)
+                record_count = len(sheets_call(survey_worksheet.get_all_records))
                 st.success(f"✅ 설문 워크시트 확인: **{record_count}**개 응답 저장됨")
             except gspread.WorksheetNotFound:
                 st.warning(f"⚠️ 설문 워크시트('{WORKSHEET_NAME}')가 없습니다. 첫 설문 제출 시 자동 생성됩니다.")
@@ -353,6 +529,18 @@ def display_debug_info():
         if st.button("전체 연결 테스트 실행"):
             test_sheets_connection()
     
+    with st.expander("Sheets API 요청 현황"):
+        metrics = get_sheets_metrics()
+        limiter = metrics.pop("rate_limiter")
+        st.write(f"요청 {metrics['requests']}회, 재시도 {metrics['retries']}회 "
+                 f"(429 {metrics['rate_limited_responses']}회, 5xx {metrics['server_errors']}회), "
+                 f"재시도 후 실패 {metrics['failed_after_retries']}회")
+        st.write(f"속도 제한 대기 {limiter['throttled']}회 (누적 {limiter['total_wait_seconds']}초), "
+                 f"현재 대기 {limiter['waiting']}건 / 최대 {limiter['max_waiting']}건, "
+                 f"남은 토큰 {limiter['tokens']}/{limiter['capacity']}")
+        st.write(f"일괄 저장 {metrics['append_batches']}회 ({metrics['appended_rows']}행, 최대 {metrics['max_batch_rows']}행), "
+                 f"저장 대기열 {metrics['pending_appends']}행")
+    
     with st.expander("통계 정보"):
         if st.button("설문 통계 조회"):
             stats = get_survey_statistics()
@@ -0,0 +1,71 @@
+# single_flight.py
+import threading
+
+class _InFlightCall:
+    """진행 중인 호출 하나 (결과/예외를 기다리는 호출자들과 공유)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 호출을 하나로 합쳐 실행하고 결과를 공유
+
+    완료된 결과는 보관하지 않으므로, 호출이 끝난 뒤 들어온 같은 키는 새로 실행됩니다.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._executions = 0
+        self._coalesced = 0
+        self._max_waiters = 0
+
+    def do(self, key: str, fn, timeout: float = None):
+        """key로 진행 중인 호출이 있으면 그 결과를 기다리고, 없으면 fn()을 실행
+
+        fn()이 예외를 던지면 기다리던 호출자 모두에게 같은 예외가 전달됩니다.
+        timeout은 기다리는 쪽에만 적용되며, 초과하면 TimeoutError가 발생합니다.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._coalesced += 1
+                self._max_waiters = max(self._max_waiters, call.waiters)
+                leader = False
+            else:
+                call = _InFlightCall()
+                self._calls[key] = call
+                self._executions += 1
+                leader = True
+
+        if not leader:
+            if not call.done.wait(timeout):
+                raise TimeoutError("진행 중인 같은 요청의 응답을 기다리다 시간이 초과되었습니다.")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def stats(self) -> dict:
+        """실행/합쳐진 호출 수"""
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "executions": self._executions,
+                "coalesced": self._coalesced,
+                "max_waiters": self._max_waiters
+            }
@@ -0,0 +1,137 @@
+# spelling_index.py
+import threading
+from functools import lru_cache
+
+from data_config import SPELLING_MAX_EDIT_DISTANCE, SPELLING_PREFIX_LENGTH, SPELLING_MIN_WORD_LENGTH
+from local_summarizer import tokenize_words
+from vocabulary_loader import get_moe_vocabularies, in_vocabulary
+
+_index = None
+_english_words = None
+_index_lock = threading.Lock()
+
+def _deletes(word: str, max_distance: int) -> set:
+    """단어에서 최대 max_distance개 글자를 지운 변형 전체 (자기 자신 포함)"""
+    variants = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier if len(w) > 1 for i in range(len(w))}
+        variants |= frontier
+    return variants
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """인접 글자 바꿈을 포함한 편집 거리 (max_distance를 넘으면 max_distance + 1)"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+class SymSpellIndex:
+    """대칭 삭제(SymSpell) 철자 색인: 사전 단어와 입력 단어의 삭제 변형만 비교해 편집 거리 2 이내 후보를 찾음
+
+    단어 앞 prefix_length글자만 변형을 만들어 색인 크기를 줄이고, 후보는 실제 편집 거리로 확인합니다.
+    """
+
+    def __init__(self, words=(), max_distance: int = SPELLING_MAX_EDIT_DISTANCE, prefix_length: int = SPELLING_PREFIX_LENGTH):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.words = set()
+        self._deletes = {}
+        self.add_words(words)
+
+    def add_words(self, words):
+        for word in words:
+            if not word.isalpha() or word in self.words:
+                continue
+            self.words.add(word)
+            for variant in _deletes(word[:self.prefix_length], self.max_distance):
+                self._deletes.setdefault(variant, []).append(word)
+
+    def lookup(self, word: str, max_distance: int = None) -> list:
+        """편집 거리 max_distance 이내 후보 [(단어, 거리)] (거리 → 첫 글자 일치 → 알파벳 순)"""
+        max_distance = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        if word in self.words:
+            return [(word, 0)]
+        candidates = set()
+        for variant in _deletes(word[:self.prefix_length], max_distance):
+            candidates.update(self._deletes.get(variant, ()))
+        matches = []
+        for candidate in candidates:
+            distance = edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                matches.append((candidate, distance))
+        return sorted(matches, key=lambda m: (m[1], m[0][0] != word[0], m[0]))
+
+    def __len__(self):
+        return len(self.words)
+
+def get_spelling_index() -> SymSpellIndex:
+    """2015/2022 기본 어휘 전체로 만든 철자 색인 (최초 사용 시 한 번만 생성)"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = SymSpellIndex(get_moe_vocabularies().word_masks)
+    return _index
+
+def get_english_words() -> frozenset:
+    """일반 영어 단어 목록 (pyspellchecker 영어 사전, 최초 사용 시 한 번만 로드, 설치되지 않았으면 빈 집합)"""
+    global _english_words
+    if _english_words is None:
+        with _index_lock:
+            if _english_words is None:
+                try:
+                    from spellchecker import SpellChecker
+                    _english_words = frozenset(SpellChecker(language="en", distance=1).word_frequency.dictionary)
+                except ImportError:
+                    _english_words = frozenset()
+    return _english_words
+
+@lru_cache(maxsize=32)
+def _passage_index(passage_text: str) -> SymSpellIndex:
+    """지문에 나온 단어로 만든 작은 철자 색인 (지문의 고유명사/전문어 오타용)"""
+    return SymSpellIndex(set(tokenize_words(passage_text)))
+
+def _allowed_distance(word: str) -> int:
+    """짧은 단어는 편집 거리 1까지만 허용 (짧은 정상 단어가 오타로 잡히지 않도록)"""
+    return 1 if len(word) <= 8 else SPELLING_MAX_EDIT_DISTANCE
+
+def check_spelling(text: str, passage_text: str = "", max_suggestions: int = 3) -> list:
+    """기본 어휘/지문/일반 영어 단어 목록 어디에도 없고 가까운 단어가 있는 단어를 철자 오류 의심으로 반환
+
+    기본 어휘 밖의 정상 단어(cafe, oath 등)를 오타로 잡지 않도록 일반 영어 단어 목록에 있는 단어는 건너뛰며,
+    그 목록을 불러올 수 없으면 아무 단어도 표시하지 않습니다.
+    반환: [{"word": 입력 단어, "suggestions": [후보 단어, ...]}] (후보가 없는 단어는 실제 기준 밖 어휘로 봄)
+    """
+    english_words = get_english_words()
+    if not english_words:
+        return []
+    vocabulary = get_moe_vocabularies()
+    combined = vocabulary["combined"]
+    passage_words = set(tokenize_words(passage_text)) if passage_text else set()
+    passage_index = _passage_index(passage_text) if passage_text else None
+    index = get_spelling_index()
+
+    results = []
+    for word in dict.fromkeys(tokenize_words(text)):
+        if len(word) < SPELLING_MIN_WORD_LENGTH or word in passage_words or in_vocabulary(word, combined) \
+                or in_vocabulary(word, english_words):
+            continue
+        distance = _allowed_distance(word)
+        # 같은 거리면 지문 단어를 먼저 제안
+        matches = (passage_index.lookup(word, distance) if passage_index else []) + index.lookup(word, distance)
+        suggestions = [w for w, _ in sorted(matches, key=lambda m: m[1])]
+        if suggestions:
+            results.append({"word": word, "suggestions": list(dict.fromkeys(suggestions))[:max_suggestions]})
+    return results
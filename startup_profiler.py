@@ -0,0 +1,60 @@
+# startup_profiler.py
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+# 지연 초기화 항목별 최초 소요 시간 (초)
+STARTUP_TIMINGS = {}
+
+# 앱이 사용하는 주요 모듈 (import 시간 보고서 대상)
+APP_MODULES = [
+    "streamlit", "numpy", "openai", "gspread", "google.oauth2.service_account",
+    "data_config", "utils", "vocabulary_loader", "ai_services", "session_store",
+    "passage_library", "near_duplicate", "sheets_service", "class_batch", "single_flight", "circuit_breaker", "local_summarizer", "summary_scoring", "rate_limiter", "model_router", "openai_cassette", "analysis_api", "long_passage", "passage_profiler", "spelling_index", "hedging", "copy_detection", "generation_jobs",
+]
+
+@contextmanager
+def record_startup_timing(name: str):
+    """지연 초기화 구간의 소요 시간을 기록"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STARTUP_TIMINGS[name] = time.perf_counter() - start
+
+def get_startup_timings() -> dict:
+    """지금까지 기록된 지연 초기화 소요 시간"""
+    return dict(STARTUP_TIMINGS)
+
+def run_importtime_report(modules: list = None, top_n: int = 25, cwd: str = None) -> list:
+    """새 인터프리터에서 `python -X importtime`으로 모듈 import 시간을 측정
+
+    반환값: 누적 시간 순으로 정렬된 {"module", "self_ms", "cumulative_ms", "depth"} 목록
+    """
+    modules = modules or APP_MODULES
+    code = "\n".join(
+        f"try:\n    import {name}\nexcept Exception:\n    pass" for name in modules
+    )
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=cwd, timeout=120
+    )
+
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        except ValueError:
+            continue
+        rows.append({
+            "module": name.strip(),
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+            "depth": (len(name) - len(name.lstrip())) // 2
+        })
+
+    rows.sort(key=lambda row: row["cumulative_ms"], reverse=True)
+    return rows[:top_n]
@@ -0,0 +1,109 @@
+# summary_scoring.py
+from copy_detection import detect_copied_spans
+from data_config import CURRICULUM_STANDARDS, SUMMARY_MIN_WORDS, SUMMARY_MAX_WORDS, get_curriculum_key
+from local_summarizer import split_sentences, tokenize_words, tfidf_matrix
+from utils import count_words, extract_keywords
+
+# 예비 점수 항목별 가중치 (합계 1)
+SCORE_WEIGHTS = {"내용": 0.4, "유사도": 0.15, "길이": 0.15, "어휘": 0.15, "표현": 0.15}
+
+# 유사도 항목 만점 기준 (요약문은 원문/모범 요약과 표현이 달라도 되므로 이 정도면 충분히 가까운 것으로 봄)
+AI_SUMMARY_SIMILARITY_TARGET = 0.5
+PASSAGE_SIMILARITY_TARGET = 0.4
+
+# 표현 항목: 원문을 그대로 옮긴 단어 비율이 이 이하면 만점, 100%면 0점
+COPIED_RATIO_ALLOWED = 0.3
+
+# 예비 수준 구분 (점수 하한, 수준)
+LEVEL_CUTOFFS = [(80, "A"), (60, "B"), (0, "C")]
+LEVEL_LABELS = {"A": "기준 충족", "B": "부분 충족", "C": "보완 필요"}
+
+_SUFFIXES = ("ing", "ed", "es", "ly", "s")
+
+def _stem(word: str) -> str:
+    """키워드 대조용 간단한 어간 (grows/growing/grew 중 앞의 둘을 같은 단어로 봄)"""
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+def keyword_coverage(summary: str, keywords: list) -> dict:
+    """요약문에 포함된 핵심 키워드 비율"""
+    summary_stems = {_stem(w) for w in tokenize_words(summary)}
+    matched = [k for k in keywords if _stem(k.lower()) in summary_stems]
+    return {
+        "ratio": len(matched) / len(keywords) if keywords else 1.0,
+        "matched": matched,
+        "missing": [k for k in keywords if k not in matched]
+    }
+
+def similarity_scores(summary: str, original_text: str, ai_summary: str = "") -> dict:
+    """원문 문장별/모범 요약과의 TF-IDF 코사인 유사도 (원문은 가장 가까운 세 문장의 평균)"""
+    passage_sentences = split_sentences(original_text)
+    documents = passage_sentences + [summary] + ([ai_summary] if ai_summary else [])
+    vectors, _, _ = tfidf_matrix(documents)
+    summary_vector = vectors[len(passage_sentences)]
+
+    sentence_similarity = vectors[:len(passage_sentences)] @ summary_vector
+    top = sorted(sentence_similarity, reverse=True)[:3]
+    return {
+        "passage": float(sum(top) / len(top)) if top else 0.0,
+        "best_sentence": int(sentence_similarity.argmax()) if len(passage_sentences) else -1,
+        "ai_summary": float(vectors[-1] @ summary_vector) if ai_summary else None
+    }
+
+def length_score(word_count: int, min_words: int = SUMMARY_MIN_WORDS, max_words: int = SUMMARY_MAX_WORDS) -> float:
+    """기준 단어 수 안이면 1, 벗어난 만큼 단어당 0.1씩 감점"""
+    if min_words <= word_count <= max_words:
+        return 1.0
+    distance = min_words - word_count if word_count < min_words else word_count - max_words
+    return max(0.0, 1.0 - 0.1 * distance)
+
+def paraphrase_score(copied_ratio: float) -> float:
+    """원문을 그대로 옮긴 단어 비율에 따른 표현 점수 (허용 비율을 넘는 만큼 비례 감점)"""
+    if copied_ratio <= COPIED_RATIO_ALLOWED:
+        return 1.0
+    return max(0.0, 1.0 - (copied_ratio - COPIED_RATIO_ALLOWED) / (1.0 - COPIED_RATIO_ALLOWED))
+
+def score_summary(summary: str, original_text: str, grade_level: str, subject_type: str, ai_summary: str = "", keywords: list = None, vocab_analysis: dict = None) -> dict:
+    """요약문 예비 채점 (키워드 포함, 원문/모범 요약 유사도, 길이, 기준 어휘, 원문 복사 여부를 교육과정 수준에 대응)"""
+    if keywords is None:
+        keywords = extract_keywords(original_text, 5)
+    coverage = keyword_coverage(summary, keywords)
+    similarity = similarity_scores(summary, original_text, ai_summary)
+    word_count = count_words(summary)
+    copy_check = detect_copied_spans(summary, original_text)
+
+    if similarity["ai_summary"] is not None:
+        similarity_component = min(1.0, similarity["ai_summary"] / AI_SUMMARY_SIMILARITY_TARGET)
+    else:
+        similarity_component = min(1.0, similarity["passage"] / PASSAGE_SIMILARITY_TARGET)
+
+    components = {
+        "내용": coverage["ratio"],
+        "유사도": similarity_component,
+        "길이": length_score(word_count),
+        "어휘": vocab_analysis["target_vocab_ratio"] if vocab_analysis else 1.0,
+        "표현": paraphrase_score(copy_check["copied_ratio"])
+    }
+    score = round(100 * sum(SCORE_WEIGHTS[name] * value for name, value in components.items()))
+    level = next(level for cutoff, level in LEVEL_CUTOFFS if score >= cutoff)
+
+    # 2022 개정(고1)은 성취수준 문구, 2015 개정은 요약 수준 기준으로 설명
+    curriculum_info = CURRICULUM_STANDARDS.get(get_curriculum_key(grade_level, subject_type), {})
+    level_desc = curriculum_info.get("achievement_level_desc", {}).get(level)
+    if not level_desc:
+        level_desc = f"'{curriculum_info.get('summary_level_desc', '요약')}' 기준 {LEVEL_LABELS[level]}"
+
+    return {
+        "score": score,
+        "level": level,
+        "level_desc": level_desc,
+        "components": components,
+        "word_count": word_count,
+        "matched_keywords": coverage["matched"],
+        "missing_keywords": coverage["missing"],
+        "passage_similarity": similarity["passage"],
+        "ai_summary_similarity": similarity["ai_summary"],
+        "copy_check": copy_check
+    }
@@ -0,0 +1,210 @@
+# survey_export.py
+import argparse
+import csv
+import json
+import shutil
+from pathlib import Path
+
+from data_config import SURVEY_EXPORT_DIR, SURVEY_EXPORT_PAGE_SIZE
+from sheets_service import SURVEY_HEADERS, WORKSHEET_NAME, setup_google_sheets, sheets_call
+
+# SURVEY_HEADERS 열별 자료형 (나머지는 문자열)
+BOOLEAN_COLUMNS = {"completed_summary", "received_feedback", "vocab_analysis_completed"}
+INTEGER_COLUMNS = {f"{category}_{i}" for category in ["PU", "PEOU", "SE", "BI", "AD"] for i in range(1, 6)}
+
+def _column_letter(index: int) -> str:
+    """1부터 시작하는 열 번호를 A1 표기 열 이름으로 변환"""
+    letters = ""
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+LAST_COLUMN = _column_letter(len(SURVEY_HEADERS))
+
+def _to_bool(value):
+    if isinstance(value, bool) or value is None:
+        return value
+    text = str(value).strip().lower()
+    if text in ("true", "1", "yes"):
+        return True
+    if text in ("false", "0", "no"):
+        return False
+    return None
+
+def _to_int(value):
+    if isinstance(value, int) or value is None:
+        return value
+    text = str(value).strip()
+    return int(text) if text.lstrip("-").isdigit() else None
+
+def convert_row(values: list) -> dict:
+    """시트 한 행(문자열 목록)을 SURVEY_HEADERS 기준 자료형으로 변환 (빈 칸은 None)"""
+    values = list(values) + [""] * (len(SURVEY_HEADERS) - len(values))
+    record = {}
+    for name, value in zip(SURVEY_HEADERS, values):
+        if value == "":
+            record[name] = None
+        elif name in BOOLEAN_COLUMNS:
+            record[name] = _to_bool(value)
+        elif name in INTEGER_COLUMNS:
+            record[name] = _to_int(value)
+        else:
+            record[name] = str(value)
+    return record
+
+def iter_sheet_pages(worksheet, start_row: int = 2, page_size: int = SURVEY_EXPORT_PAGE_SIZE):
+    """워크시트를 page_size행 범위로 나눠 읽으며 (시트 행 번호, 값 목록) 페이지를 차례로 반환"""
+    row_number = start_row
+    # 시트 크기(row_count)를 넘는 범위는 요청하지 않음
+    while row_number <= worksheet.row_count:
+        end_row = min(row_number + page_size - 1, worksheet.row_count)
+        values = sheets_call(worksheet.get, f"A{row_number}:{LAST_COLUMN}{end_row}")
+        page = [(row_number + offset, row) for offset, row in enumerate(values) if any(cell != "" for cell in row)]
+        if page:
+            yield page
+        # 범위 끝까지 채워지지 않았으면 마지막 페이지
+        if len(values) < end_row - row_number + 1:
+            return
+        row_number = end_row + 1
+
+def iter_csv_pages(path, start_row: int = 2, page_size: int = SURVEY_EXPORT_PAGE_SIZE):
+    """시트를 내려받은 CSV(첫 행 헤더)를 시트와 같은 행 번호 기준 페이지로 읽음 (오프라인/테스트용)"""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        page = []
+        for row_number, row in enumerate(csv.reader(f), 1):
+            if row_number < max(start_row, 2) or not any(cell != "" for cell in row):
+                continue
+            page.append((row_number, row))
+            if len(page) >= page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+
+class CsvExportWriter:
+    """CSV로 이어 쓰기 (파일이 없을 때만 헤더 작성)"""
+
+    def __init__(self, output_path: Path):
+        self.output_path = output_path
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        is_new = not self.output_path.exists() or self.output_path.stat().st_size == 0
+        self._file = open(self.output_path, "a", newline="", encoding="utf-8-sig" if is_new else "utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=SURVEY_HEADERS)
+        if is_new:
+            self._writer.writeheader()
+
+    def write_page(self, records: list, first_row: int, last_row: int):
+        self._writer.writerows(records)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+class ParquetExportWriter:
+    """Parquet 데이터셋 폴더에 실행마다 part 파일 하나를 추가 (페이지마다 row group 하나)"""
+
+    def __init__(self, output_path: Path):
+        import pyarrow as pa
+
+        self._pa = pa
+        self.output_dir = output_path
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.schema = pa.schema([
+            (name, pa.bool_() if name in BOOLEAN_COLUMNS else pa.int64() if name in INTEGER_COLUMNS else pa.string())
+            for name in SURVEY_HEADERS
+        ])
+        self._writer = None
+        self._temp_path = None
+        self._first_row = None
+        self._last_row = None
+
+    def write_page(self, records: list, first_row: int, last_row: int):
+        import pyarrow.parquet as pq
+
+        if self._writer is None:
+            self._first_row = first_row
+            self._temp_path = self.output_dir / f".part-{first_row:07d}.parquet.tmp"
+            self._writer = pq.ParquetWriter(str(self._temp_path), self.schema)
+        table = self._pa.Table.from_pylist(records, schema=self.schema)
+        self._writer.write_table(table)
+        self._last_row = last_row
+
+    def close(self):
+        if self._writer is None:
+            return
+        self._writer.close()
+        # 끝까지 쓴 파일만 데이터셋에 포함되도록 완료 후 이름 변경
+        self._temp_path.rename(self.output_dir / f"part-{self._first_row:07d}-{self._last_row:07d}.parquet")
+
+def _state_path(output_path: Path) -> Path:
+    return output_path.parent / f"{output_path.name}.state.json"
+
+def load_export_state(output_path: Path) -> dict:
+    """마지막으로 내보낸 시트 행 번호 등 내보내기 상태"""
+    path = _state_path(output_path)
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8"))
+    return {"last_row": 1, "exported_rows": 0}
+
+def export_survey_data(pages, output_path, fmt: str = "parquet", incremental: bool = True) -> dict:
+    """페이지 단위로 읽은 설문 데이터를 자료형을 맞춰 CSV/Parquet로 내보내기 (메모리에는 한 페이지만 유지)
+
+    pages는 start_row부터 읽는 페이지 생성기를 받는 함수입니다. 예: lambda start: iter_sheet_pages(ws, start)
+    incremental이면 지난번 마지막 행 다음부터 이어서 내보냅니다.
+    """
+    output_path = Path(output_path)
+    if incremental:
+        state = load_export_state(output_path)
+    else:
+        # 전체 내보내기는 기존 출력(CSV 파일 또는 Parquet 폴더)과 상태를 지우고 첫 행부터 다시 씀
+        if output_path.is_dir():
+            shutil.rmtree(output_path)
+        elif output_path.exists():
+            output_path.unlink()
+        _state_path(output_path).unlink(missing_ok=True)
+        state = {"last_row": 1, "exported_rows": 0}
+
+    writer = CsvExportWriter(output_path) if fmt == "csv" else ParquetExportWriter(output_path)
+    exported = 0
+    last_row = state["last_row"]
+    try:
+        for page in pages(last_row + 1):
+            records = [convert_row(values) for _, values in page]
+            writer.write_page(records, page[0][0], page[-1][0])
+            exported += len(records)
+            last_row = page[-1][0]
+    finally:
+        writer.close()
+        # 실제로 쓴 행까지만 상태에 기록 (중간에 실패해도 다음 실행에서 이어서 진행)
+        state = {"last_row": last_row, "exported_rows": state["exported_rows"] + exported, "format": fmt}
+        _state_path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        _state_path(output_path).write_text(json.dumps(state), encoding="utf-8")
+
+    return {"exported_rows": exported, "last_row": last_row, "total_exported_rows": state["exported_rows"]}
+
+def main():
+    parser = argparse.ArgumentParser(description="TAM 설문 데이터를 페이지 단위로 CSV/Parquet 내보내기")
+    parser.add_argument("--format", choices=["parquet", "csv"], default="parquet")
+    parser.add_argument("--output", help="출력 경로 (parquet는 폴더, csv는 파일)")
+    parser.add_argument("--page-size", type=int, default=SURVEY_EXPORT_PAGE_SIZE)
+    parser.add_argument("--source-csv", help="Google Sheets 대신 읽을 로컬 CSV (시트와 같은 열 구성)")
+    parser.add_argument("--full", action="store_true", help="처음부터 전체 내보내기 (기본: 지난번 이후 행만)")
+    args = parser.parse_args()
+
+    output = Path(args.output) if args.output else SURVEY_EXPORT_DIR / ("survey_data.csv" if args.format == "csv" else "survey_data")
+
+    if args.source_csv:
+        pages = lambda start: iter_csv_pages(args.source_csv, start, args.page_size)
+    else:
+        spreadsheet = setup_google_sheets()
+        if not spreadsheet:
+            raise SystemExit("Google Sheets 연결 실패")
+        worksheet = sheets_call(spreadsheet.worksheet, WORKSHEET_NAME)
+        pages = lambda start: iter_sheet_pages(worksheet, start, args.page_size)
+
+    result = export_survey_data(pages, output, args.format, incremental=not args.full)
+    print(f"{result['exported_rows']}행 내보냄 (마지막 행 {result['last_row']}, 누적 {result['total_exported_rows']}행) → {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 저장소 루트의 모듈(평면 구조)을 테스트에서 import
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
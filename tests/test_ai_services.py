@@ -0,0 +1,162 @@
+import threading
+import time
+from concurrent.futures import CancelledError
+from types import SimpleNamespace
+
+import pytest
+
+import ai_services
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from hedging import HedgeCancellation
+from rate_limiter import AdaptiveConcurrencyLimiter
+
+class FakeClient:
+    """Chat Completions 응답만 흉내 내는 클라이언트"""
+
+    def __init__(self, content="ok"):
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self.content = content
+
+    def with_options(self, **kwargs):
+        return self
+
+    def _create(self, **request):
+        self.calls += 1
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=self.content))],
+            usage=SimpleNamespace(prompt_tokens=1, completion_tokens=1)
+        )
+
+@pytest.fixture
+def guards(monkeypatch):
+    """테스트마다 새 차단기와 동시 요청 한도 사용"""
+    breaker = CircuitBreaker("test", failure_threshold=1, slow_call_seconds=10, open_seconds=0.05)
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, min_limit=1, max_limit=1, latency_target_seconds=10)
+    monkeypatch.setattr(ai_services, "OPENAI_CIRCUIT_BREAKER", breaker)
+    monkeypatch.setattr(ai_services, "OPENAI_CONCURRENCY_LIMITER", limiter)
+    return breaker, limiter
+
+def _call(client, deadline=None, cancellation=None):
+    route = ai_services.MODEL_ROUTER.route("summary")
+    request = ai_services._build_request("prompt", route, route["tier"])
+    return ai_services._call_model(client, request, "summary", route["tier"], deadline, cancellation=cancellation)
+
+def test_limiter_timeout_does_not_hold_half_open_probe(guards):
+    breaker, limiter = guards
+    breaker.record_failure("장애")
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+
+    limiter.acquire()
+    with pytest.raises(TimeoutError):
+        _call(FakeClient(), ai_services.make_deadline(0.05))
+    limiter.abandon()
+
+    assert _call(FakeClient()) == "ok"
+    assert breaker.state == "closed"
+    assert limiter.stats()["in_flight"] == 0
+
+def test_expired_deadline_is_not_a_service_failure(guards):
+    breaker, limiter = guards
+    client = FakeClient()
+    with pytest.raises(ai_services.DeadlineExceededError):
+        _call(client, deadline=time.monotonic() - 1)
+    assert client.calls == 0
+    assert breaker.state == "closed"
+    assert limiter.stats()["in_flight"] == 0
+    assert not ai_services._is_service_failure(ai_services.DeadlineExceededError("마감"))
+    assert not ai_services._is_service_failure(TimeoutError("대기 초과"))
+
+def test_open_breaker_returns_limiter_slot(guards):
+    breaker, limiter = guards
+    breaker.record_failure("장애")
+    with pytest.raises(CircuitOpenError):
+        _call(FakeClient())
+    assert limiter.stats()["in_flight"] == 0
+
+class SlowClient(FakeClient):
+    """gate가 열릴 때까지 응답하지 않는 클라이언트"""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+
+    def _create(self, **request):
+        self.gate.wait(5)
+        return super()._create(**request)
+
+def test_cancelled_hedge_loser_keeps_slot_until_response(guards, monkeypatch):
+    breaker, limiter = guards
+    router = ai_services.ModelRouter(ai_services.MODEL_ROUTER.tiers, ai_services.MODEL_ROUTER.task_routes)
+    monkeypatch.setattr(ai_services, "MODEL_ROUTER", router)
+    client = SlowClient()
+    cancellation = HedgeCancellation()
+    loser = threading.Thread(target=lambda: _call(client, cancellation=cancellation))
+    loser.start()
+    try:
+        while limiter.stats()["in_flight"] == 0:
+            time.sleep(0.01)
+        cancellation.cancel()
+        # 이미 보낸 요청은 응답이 올 때까지 동시 요청 자리를 차지
+        assert limiter.stats()["in_flight"] == 1
+    finally:
+        client.gate.set()
+        loser.join(5)
+    assert limiter.stats()["in_flight"] == 0
+    # 늦은 응답은 지연/호출 통계에 넣지 않고 토큰 비용만 기록
+    stats = next(row for row in router.stats() if row["task"] == "summary")
+    assert (stats["calls"], stats["discarded"], stats["prompt_tokens"]) == (0, 1, 1)
+    assert router.latency_percentile("summary", 0.9) is None
+    assert breaker.state == "closed"
+
+def test_cancelled_before_sending_skips_the_request(guards):
+    client = FakeClient()
+    cancellation = HedgeCancellation()
+    cancellation.cancel()
+    with pytest.raises(CancelledError):
+        _call(client, cancellation=cancellation)
+    assert client.calls == 0
+    assert guards[1].stats()["in_flight"] == 0
+
+class FailingClient(FakeClient):
+    """모든 요청에 지정한 오류를 던지는 클라이언트"""
+
+    def __init__(self, error):
+        super().__init__()
+        self.error = error
+
+    def _create(self, **request):
+        self.calls += 1
+        raise self.error
+
+def _status_error(status_code):
+    import httpx
+    from openai import APIStatusError
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    return APIStatusError("오류", response=httpx.Response(status_code, request=request), body=None)
+
+def test_chunk_api_error_falls_back_to_local_summary(guards, monkeypatch):
+    monkeypatch.setattr(ai_services, "LONG_PASSAGE_CHUNK_CACHE", ai_services.ChunkSummaryCache())
+    client = FailingClient(_status_error(400))
+    chunk = "Bees visit many flowers every day. They carry pollen from one plant to another. This helps fruit grow."
+    summary, source = ai_services._summarize_chunk(client, chunk)
+    assert source == "local" and summary
+    assert client.calls == 1
+
+LONG_SUMMARY = ("Bees visit many flowers every day and carry pollen from one plant to another plant, "
+                "which helps fruit and seeds grow in the garden.")
+GOOD_SUMMARY = "Bees carry pollen between flowers every day, and this helps plants grow fruit and seeds in gardens."
+
+def test_rewrite_error_keeps_best_summary(guards):
+    client = FailingClient(_status_error(500))
+    result = ai_services.enforce_summary_constraints(client, LONG_SUMMARY, LONG_SUMMARY, "고1", "2022 기본 어휘")
+    # 고쳐 쓰기가 실패해도 요약을 버리지 않고 절 경계에서 로컬로 줄임
+    assert client.calls == 1
+    assert result == "Bees visit many flowers every day and carry pollen from one plant to another plant."
+
+def test_rewrite_loop_accepts_fixed_summary(guards):
+    client = FakeClient(GOOD_SUMMARY)
+    result = ai_services.enforce_summary_constraints(client, LONG_SUMMARY, LONG_SUMMARY, "고1", "2022 기본 어휘")
+    assert result == GOOD_SUMMARY
+    assert client.calls == 1
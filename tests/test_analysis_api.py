@@ -0,0 +1,25 @@
+from http import HTTPStatus
+
+import pytest
+
+import analysis_api
+from ai_services import LOCAL_FEEDBACK_PREFIX
+
+BODY = {"summary": "Cities grow fast.", "text": "Cities grow fast because people move.", "grade_level": "고1"}
+
+def _feedback(monkeypatch, message):
+    monkeypatch.setattr(analysis_api, "provide_feedback", lambda *args: message)
+    return analysis_api.handle_feedback(dict(BODY))
+
+def test_ai_feedback_is_returned_with_source(monkeypatch):
+    assert _feedback(monkeypatch, "좋은 요약입니다.") == {"feedback": "좋은 요약입니다.", "source": "ai"}
+
+def test_local_feedback_is_marked_as_local(monkeypatch):
+    message = f"{LOCAL_FEEDBACK_PREFIX} (OpenAI 일시 차단 중)\n\n- 길이: 3단어"
+    assert _feedback(monkeypatch, message)["source"] == "local"
+
+@pytest.mark.parametrize("message", ["피드백 제공 불가: API 오류", "피드백 생성 실패: OpenAI API 오류: 500"])
+def test_failed_feedback_is_an_error(monkeypatch, message):
+    with pytest.raises(analysis_api.ApiError) as error:
+        _feedback(monkeypatch, message)
+    assert error.value.status == HTTPStatus.BAD_GATEWAY
@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+
+def _breaker(open_seconds=0.05):
+    return CircuitBreaker("test", failure_threshold=2, slow_call_seconds=1.0, open_seconds=open_seconds)
+
+def test_opens_after_consecutive_failures():
+    breaker = _breaker()
+    breaker.before_call()
+    breaker.record_failure("500")
+    assert breaker.state == "closed"
+    breaker.record_failure("500")
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    assert breaker.stats()["rejected"] == 1
+
+def test_success_resets_failure_count():
+    breaker = _breaker()
+    breaker.record_failure("500")
+    breaker.record_success(0.1)
+    breaker.record_failure("500")
+    assert breaker.state == "closed"
+
+def test_slow_calls_count_as_failures():
+    breaker = _breaker()
+    breaker.record_success(2.0)
+    breaker.record_success(0.5, slow_call_seconds=0.2)
+    assert breaker.state == "open"
+
+def test_half_open_allows_a_single_probe():
+    breaker = _breaker()
+    breaker.record_failure()
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success(0.1)
+    assert breaker.state == "closed"
+    breaker.before_call()
+
+def test_failed_probe_reopens():
+    breaker = _breaker()
+    breaker.record_failure()
+    breaker.record_failure()
+    time.sleep(0.06)
+    breaker.before_call()
+    breaker.record_failure("여전히 장애")
+    assert breaker.state == "open"
+    assert breaker.stats()["trips"] == 2
+    assert breaker.stats()["last_error"] == "여전히 장애"
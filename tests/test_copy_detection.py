@@ -0,0 +1,30 @@
+from copy_detection import detect_copied_spans, format_copy_check_for_prompt, rolling_ngram_hashes
+
+PASSAGE = (
+    "Scientists have found that honeybees can recognize human faces. "
+    "They learn to link a picture of a face with a sweet reward."
+)
+
+def test_rolling_hash_matches_same_ngram_at_any_position():
+    hashes = rolling_ngram_hashes(["a", "b", "c", "x", "a", "b", "c"], 3)
+    assert len(hashes) == 5
+    assert hashes[0] == hashes[4]
+    assert len(set(hashes)) == 4
+    assert rolling_ngram_hashes(["a", "b"], 3) == []
+
+def test_detects_copied_span_with_positions():
+    summary = "Bees can do surprising things: honeybees can recognize human faces, studies show."
+    check = detect_copied_spans(summary, PASSAGE)
+    assert check["total_words"] == 12
+    assert check["copied_words"] == 5
+    assert check["longest_span_words"] == 5
+    span = check["spans"][0]
+    assert span["text"] == "honeybees can recognize human faces"
+    assert summary[span["start"]:span["end"]] == span["text"]
+    assert "42%" in format_copy_check_for_prompt(check)
+
+def test_paraphrase_has_no_copied_spans():
+    check = detect_copied_spans("Bees are able to tell people apart by looking at their faces.", PASSAGE)
+    assert check["copied_words"] == 0 and check["spans"] == []
+    assert format_copy_check_for_prompt(check).endswith(": 없음")
+    assert format_copy_check_for_prompt(detect_copied_spans("", PASSAGE)) == ""
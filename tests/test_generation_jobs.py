@@ -0,0 +1,84 @@
+import time
+
+import pytest
+
+import generation_jobs
+from generation_jobs import GenerationJobQueue, JobItemError
+
+def _item(text, task="summary", grade_level="고1", user_summary=""):
+    return {"task": task, "text": text, "grade_level": grade_level, "subject_type": "일반선택+진로선택",
+            "user_summary": user_summary, "item_info": ""}
+
+@pytest.fixture
+def queue(tmp_path):
+    return GenerationJobQueue(tmp_path / "jobs.sqlite3")
+
+def test_add_items_is_idempotent(queue):
+    items = [_item("Passage one."), _item("Passage two."), _item("Passage one.", grade_level="고2")]
+    assert queue.add_items("run", items) == 3
+    assert queue.add_items("run", items + [_item("Passage three.")]) == 1
+    assert queue.progress("run") == {"pending": 4, "running": 0, "done": 0, "failed": 0, "total": 4}
+    assert queue.progress("other")["total"] == 0
+
+def test_claim_hands_out_each_item_once(queue):
+    queue.add_items("run", [_item("Passage one."), _item("Passage two.")])
+    first, second = queue.claim("run"), queue.claim("run")
+    assert {first["item_id"], second["item_id"]} == {1, 2}
+    assert first["attempts"] == 1
+    assert queue.claim("run") is None
+    queue.complete("run", first["item_id"], "summary")
+    assert queue.progress("run")["done"] == 1
+
+def test_fail_retries_later_then_gives_up(queue, monkeypatch):
+    monkeypatch.setattr(generation_jobs, "GENERATION_JOB_RETRY_SECONDS", 0.05)
+    queue.add_items("run", [_item("Passage one.")])
+    for attempt in range(1, 3):
+        item = queue.claim("run")
+        assert item["attempts"] == attempt
+        queue.fail("run", item["item_id"], "오류", item["attempts"], max_attempts=2)
+        if attempt == 1:
+            # 재시도 대기 시간 전에는 가져가지 않음
+            assert queue.claim("run") is None
+            assert 0 < queue.next_retry_in("run") <= 0.05
+            time.sleep(0.06)
+    assert queue.progress("run")["failed"] == 1
+    assert queue.next_retry_in("run") is None
+    assert queue.failed_items("run")[0]["error"] == "오류"
+
+def test_recover_returns_interrupted_items(queue):
+    queue.add_items("run", [_item("Passage one."), _item("Passage two.")])
+    queue.claim("run")
+    # 새 연결(다른 프로세스)에서 다시 열어도 running 항목을 되돌림
+    reopened = GenerationJobQueue(queue.db_path)
+    assert reopened.recover("run") == 1
+    assert reopened.progress("run")["pending"] == 2
+
+def test_run_workers_processes_and_retries(queue, monkeypatch):
+    monkeypatch.setattr(generation_jobs, "GENERATION_JOB_RETRY_SECONDS", 0)
+    failures = {"Passage two.": 1}
+
+    def fake_process(item, deadline_seconds):
+        if failures.get(item["text"]):
+            failures[item["text"]] -= 1
+            raise JobItemError("일시 오류")
+        return f"summary of {item['text']}"
+
+    monkeypatch.setattr(generation_jobs, "process_item", fake_process)
+    queue.add_items("run", [_item(f"Passage {n}.") for n in ("one", "two", "three")])
+    report = generation_jobs.run_workers(queue, "run", workers=2, report_seconds=60, on_report=lambda message: None)
+    assert (report["done"], report["completed_this_run"], report["errors_this_run"]) == (3, 3, 1)
+
+def test_low_priority_pacing_limits_start_rate(queue, monkeypatch):
+    monkeypatch.setattr(generation_jobs, "process_item", lambda item, deadline_seconds: "ok")
+    queue.add_items("run", [_item(f"Passage {n}.") for n in range(4)])
+    start = time.monotonic()
+    generation_jobs.run_workers(queue, "run", workers=4, report_seconds=60, on_report=lambda message: None, items_per_minute=600)
+    # 분당 600건 = 0.1초마다 한 건 (첫 건은 바로 시작)
+    assert time.monotonic() - start >= 0.28
+    assert queue.progress("run")["done"] == 4
+
+def test_load_job_items_expands_grades(tmp_path):
+    path = tmp_path / "bank.jsonl"
+    path.write_text('{"text": "Passage one."}\n{"text": "Passage two.", "grade_level": "고3", "summary": "Short."}\n', encoding="utf-8")
+    items = generation_jobs.load_job_items(path, ["고1", "고2"], "일반선택+진로선택")
+    assert [(item["task"], item["grade_level"]) for item in items] == [("summary", "고1"), ("summary", "고2"), ("feedback", "고3")]
@@ -0,0 +1,75 @@
+import threading
+import time
+
+import pytest
+
+from hedging import HedgeCancellation, HedgedRequests
+
+def _answer(value, delay=0.0, gate: threading.Event = None):
+    """delay초 뒤(또는 gate가 열릴 때까지 기다린 뒤) value를 반환하는 요청 함수"""
+    def call(cancellation):
+        if gate is not None:
+            gate.wait(5)
+        time.sleep(delay)
+        return value
+    return call
+
+def test_fast_primary_sends_no_hedge():
+    hedging = HedgedRequests(max_hedge_ratio=1.0)
+    assert hedging.run("summary", _answer("primary"), _answer("hedge"), delay_seconds=1.0) == "primary"
+    assert hedging.stats()["summary"] == {"requests": 1, "hedges": 0, "hedge_wins": 0, "capped": 0, "cancelled": 0}
+
+def test_hedge_wins_and_cancels_slow_primary():
+    hedging = HedgedRequests(max_hedge_ratio=1.0)
+    gate = threading.Event()
+    cancelled = threading.Event()
+
+    def slow_primary(cancellation):
+        cancellation.on_cancel(cancelled.set)
+        gate.wait(5)
+        return "primary"
+
+    try:
+        assert hedging.run("summary", slow_primary, _answer("hedge"), delay_seconds=0.05) == "hedge"
+        # 진 쪽 요청이 아직 실행 중이어도 취소 신호는 이미 보냄
+        assert cancelled.is_set()
+    finally:
+        gate.set()
+    stats = hedging.stats()["summary"]
+    assert (stats["hedges"], stats["hedge_wins"], stats["cancelled"]) == (1, 1, 1)
+
+def test_hedge_ratio_cap():
+    hedging = HedgedRequests(max_hedge_ratio=0.0)
+    assert hedging.run("summary", _answer("primary", delay=0.1), _answer("hedge"), delay_seconds=0.01) == "primary"
+    assert hedging.stats()["summary"]["capped"] == 1
+
+def test_both_failing_raises_primary_error():
+    hedging = HedgedRequests(max_hedge_ratio=1.0)
+
+    def failing(message, delay):
+        def call(cancellation):
+            time.sleep(delay)
+            raise ValueError(message)
+        return call
+
+    with pytest.raises(ValueError, match="primary"):
+        hedging.run("summary", failing("primary", 0.1), failing("hedge", 0.0), delay_seconds=0.01)
+
+def test_timeout_when_neither_finishes():
+    hedging = HedgedRequests(max_hedge_ratio=1.0)
+    gate = threading.Event()
+    try:
+        with pytest.raises(TimeoutError):
+            hedging.run("summary", _answer("primary", gate=gate), _answer("hedge", gate=gate), delay_seconds=0.01, timeout=0.1)
+    finally:
+        gate.set()
+
+def test_cancellation_runs_late_callbacks_immediately():
+    cancellation = HedgeCancellation()
+    calls = []
+    cancellation.on_cancel(lambda: calls.append("early"))
+    cancellation.cancel()
+    cancellation.cancel()
+    cancellation.on_cancel(lambda: calls.append("late"))
+    assert calls == ["early", "late"]
+    assert cancellation.cancelled
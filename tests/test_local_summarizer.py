@@ -0,0 +1,35 @@
+from local_summarizer import compress_sentence, rank_sentences, split_sentences, summarize_locally
+
+PASSAGE = (
+    "Sleep is important for students because it helps the brain store new information. "
+    "During deep sleep, the brain replays what was learned during the day and builds stronger memories. "
+    "However, many teenagers go to bed late because they use their phones at night. "
+    "Researchers suggest that students who sleep at least eight hours remember more of what they study."
+)
+
+def test_split_sentences_on_terminal_punctuation():
+    text = "He stopped. Then he left.\n2 hours later it rained!  Was it cold? yes, very."
+    assert split_sentences(text) == ["He stopped.", "Then he left.", "2 hours later it rained!", "Was it cold? yes, very."]
+    assert split_sentences("   ") == []
+
+def test_rank_sentences_prefers_central_sentence():
+    scores = rank_sentences(split_sentences(PASSAGE))
+    assert len(scores) == 4
+    assert abs(scores.sum() - 1.0) < 1e-6
+    # 다른 문장과 겹치는 단어가 거의 없는 문장이 가장 낮음
+    assert scores.argmin() == 2
+
+def test_compress_sentence_drops_asides_and_respects_limit():
+    sentence = "However, the library (built in 1920) is old, and many students study there every weekend because it is quiet."
+    compressed = compress_sentence(sentence, max_words=8)
+    assert "1920" not in compressed and not compressed.startswith("However")
+    assert len(compressed.split()) <= 8
+    assert compressed.endswith(".")
+    # 절 경계가 없으면 자르지 않고 빈 문자열
+    assert compress_sentence("one two three four five six seven eight nine ten", max_words=4, allow_truncate=False) == ""
+
+def test_summarize_locally_stays_within_word_limits():
+    summary = summarize_locally(PASSAGE, min_words=15, max_words=20)
+    assert 3 <= len(summary.split()) <= 20
+    assert summary[0].isupper() and summary.endswith(".")
+    assert summarize_locally("") == ""
@@ -0,0 +1,44 @@
+from long_passage import ChunkSummaryCache, chunk_passage, is_long_passage
+
+def _paragraph(label, sentences, words_per_sentence=10):
+    sentence = " ".join([label.capitalize()] + [label] * (words_per_sentence - 2)) + " end."
+    return " ".join([sentence] * sentences)
+
+def test_is_long_passage_threshold():
+    assert not is_long_passage("word " * 600)
+    assert is_long_passage("word " * 601)
+
+def test_paragraphs_stay_separate_and_short_ones_merge():
+    text = "\n\n".join([_paragraph("alpha", 6), _paragraph("beta", 1), _paragraph("gamma", 6)])
+    chunks = chunk_passage(text, max_words=100, min_words=40)
+    # 짧은 beta 단락은 다음 단락과 합쳐짐
+    assert len(chunks) == 2
+    assert chunks[0].startswith("Alpha") and chunks[1].startswith("Beta") and "gamma" in chunks[1]
+
+def test_long_paragraph_splits_at_sentence_boundaries():
+    chunks = chunk_passage(_paragraph("delta", 30), max_words=100, min_words=40)
+    assert [len(chunk.split()) for chunk in chunks] == [100, 100, 100]
+    assert all(chunk.endswith("end.") for chunk in chunks)
+
+def test_editing_one_paragraph_keeps_other_chunks():
+    paragraphs = [_paragraph(label, 5) for label in ("one", "two", "three")]
+    before = chunk_passage("\n\n".join(paragraphs), max_words=100, min_words=40)
+    paragraphs[1] = paragraphs[1].replace("two", "too", 1)
+    after = chunk_passage("\n\n".join(paragraphs), max_words=100, min_words=40)
+    assert before[0] == after[0] and before[2] == after[2] and before[1] != after[1]
+
+def test_chunk_cache_key_ignores_whitespace_and_evicts_oldest():
+    cache = ChunkSummaryCache(max_entries=2)
+    assert ChunkSummaryCache.key("a  b\nc", "고1") == ChunkSummaryCache.key("a b c", "고1")
+    assert ChunkSummaryCache.key("a b c", "고1") != ChunkSummaryCache.key("a b c", "고2")
+    cache.put("k1", "s1")
+    cache.put("k2", "s2")
+    assert cache.get("k1") == "s1"
+    cache.put("k3", "s3")
+    assert cache.get("k2") is None
+    assert cache.stats() == {"entries": 2, "hits": 1, "misses": 1}
+
+def test_unpunctuated_paragraph_still_respects_max_words():
+    # 문장 부호가 없는 300단어 단락도 조각당 최대 단어 수를 넘지 않음
+    chunks = chunk_passage(" ".join(["word"] * 300))
+    assert [len(chunk.split()) for chunk in chunks] == [250, 50]
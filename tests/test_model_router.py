@@ -0,0 +1,14 @@
+from data_config import MODEL_TIERS, MODEL_TASK_ROUTES
+from model_router import ModelRouter
+
+def test_latency_percentile_ignores_failed_calls():
+    router = ModelRouter(MODEL_TIERS, MODEL_TASK_ROUTES)
+    tier = router.route("summary")["tier"]
+    for latency in (1.0, 1.1, 1.2, 1.3):
+        router.record_call("summary", tier, latency)
+    # 빨리 실패한 429 응답이 많아도 p90은 성공한 응답 시간 기준
+    for _ in range(20):
+        router.record_call("summary", tier, 0.05, error=True)
+    assert router.latency_percentile("summary", 0.9, min_samples=4) == 1.3
+    assert router.latency_percentile("summary", 0.9, min_samples=5) is None
+    assert router.stats()[0]["errors"] == 20
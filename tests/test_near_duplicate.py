@@ -0,0 +1,32 @@
+from near_duplicate import NearDuplicateIndex, estimate_jaccard, minhash_signature, shingle_text
+
+PASSAGE = (
+    "Many animals have developed clever ways to survive the winter. Some birds fly thousands of kilometers "
+    "to warmer places, while bears sleep through the coldest months in caves. Squirrels store nuts in the "
+    "autumn so that they have enough food when snow covers the ground."
+)
+
+def test_shingles_ignore_case_punctuation_and_line_breaks():
+    assert shingle_text("Hello,\nWorld!") == shingle_text("hello world")
+    assert shingle_text("") == set()
+
+def test_identical_and_reformatted_passages_match():
+    signature = minhash_signature(PASSAGE)
+    assert estimate_jaccard(signature, minhash_signature(PASSAGE)) == 1.0
+    # 줄바꿈/공백만 바뀐 붙여넣기
+    reformatted = PASSAGE.replace(". ", ".\n\n").replace(", ", ",  ")
+    assert estimate_jaccard(signature, minhash_signature(reformatted)) == 1.0
+
+def test_index_finds_variant_but_not_unrelated_passage():
+    index = NearDuplicateIndex()
+    index.add("winter", minhash_signature(PASSAGE))
+    index.add("winter", minhash_signature(PASSAGE))
+    assert len(index) == 1 and "winter" in index
+
+    # 오탈자 하나가 있는 변형
+    variant = PASSAGE.replace("kilometers", "kilometres")
+    match = index.query(minhash_signature(variant), threshold=0.8)
+    assert match is not None and match[0] == "winter" and match[1] >= 0.8
+
+    unrelated = "The city council voted to build a new library next to the train station, and construction begins in May."
+    assert index.query(minhash_signature(unrelated), threshold=0.8) is None
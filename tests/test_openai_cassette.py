@@ -0,0 +1,80 @@
+import json
+
+import httpx
+import pytest
+from openai import OpenAI
+
+import ai_services
+from circuit_breaker import CircuitBreaker
+from openai_cassette import CassetteMissError, CassetteTransport
+from rate_limiter import AdaptiveConcurrencyLimiter
+
+COMPLETION = {
+    "id": "chatcmpl-test", "object": "chat.completion", "created": 0, "model": "gpt-4o-mini",
+    "choices": [{"index": 0, "message": {"role": "assistant", "content": "recorded answer"}, "finish_reason": "stop"}],
+    "usage": {"prompt_tokens": 3, "completion_tokens": 2, "total_tokens": 5}
+}
+
+class LiveServer:
+    """실제 API 대신 응답하는 httpx.MockTransport와 받은 요청 수"""
+
+    def __init__(self, status_code=200):
+        self.calls = 0
+        self.status_code = status_code
+        self.transport = httpx.MockTransport(self._handle)
+
+    def _handle(self, request):
+        self.calls += 1
+        return httpx.Response(self.status_code, json=COMPLETION, headers={"x-request-id": "req-1", "set-cookie": "secret"})
+
+def _post(transport, content="hello"):
+    with httpx.Client(transport=transport, base_url="https://api.openai.com") as client:
+        return client.post("/v1/chat/completions", json={"model": "gpt-4o-mini", "messages": [{"role": "user", "content": content}]},
+                           headers={"Authorization": "Bearer sk-secret"})
+
+def test_record_then_replay_without_live_calls(tmp_path):
+    live = LiveServer()
+    response = _post(CassetteTransport(tmp_path, mode="record", transport=live.transport))
+    assert response.json()["choices"][0]["message"]["content"] == "recorded answer"
+    assert live.calls == 1
+
+    [cassette] = list(tmp_path.glob("*.json"))
+    entry = json.loads(cassette.read_text(encoding="utf-8"))
+    # 인증/쿠키 헤더는 저장하지 않음
+    assert entry["response"]["headers"] == {"content-type": "application/json", "x-request-id": "req-1"}
+    assert "sk-secret" not in cassette.read_text(encoding="utf-8")
+
+    for mode in ("replay", "offline"):
+        transport = CassetteTransport(tmp_path, mode=mode, transport=live.transport)
+        assert _post(transport).json() == COMPLETION
+        assert transport.stats()["hits"] == 1
+    assert live.calls == 1
+
+def test_replay_records_misses_but_not_error_responses(tmp_path):
+    transport = CassetteTransport(tmp_path, mode="replay", transport=LiveServer(status_code=500).transport)
+    assert _post(transport).status_code == 500
+    assert transport.stats() == {"mode": "replay", "hits": 0, "misses": 1, "recorded": 0}
+    assert list(tmp_path.glob("*.json")) == []
+
+def test_offline_miss_raises(tmp_path):
+    live = LiveServer()
+    transport = CassetteTransport(tmp_path, mode="offline", transport=live.transport)
+    with pytest.raises(CassetteMissError):
+        _post(transport, "not recorded")
+    assert live.calls == 0
+    assert transport.stats()["misses"] == 1
+
+def test_offline_miss_is_not_a_fallback_or_breaker_failure(tmp_path, monkeypatch):
+    breaker = CircuitBreaker("test", failure_threshold=1, slow_call_seconds=10, open_seconds=60)
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, min_limit=1, max_limit=1, latency_target_seconds=10)
+    monkeypatch.setattr(ai_services, "OPENAI_CIRCUIT_BREAKER", breaker)
+    monkeypatch.setattr(ai_services, "OPENAI_CONCURRENCY_LIMITER", limiter)
+    client = OpenAI(api_key="offline", max_retries=0, http_client=httpx.Client(transport=CassetteTransport(tmp_path, mode="offline")))
+
+    route = ai_services.MODEL_ROUTER.route("summary")
+    request = ai_services._build_request("not recorded", route, route["tier"])
+    with pytest.raises(CassetteMissError):
+        ai_services._call_model(client, request, "summary", route["tier"])
+    assert not isinstance(CassetteMissError("누락"), ai_services._fallback_errors())
+    assert breaker.state == "closed" and breaker.stats()["trips"] == 0
+    assert limiter.stats()["in_flight"] == 0
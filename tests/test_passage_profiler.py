@@ -0,0 +1,34 @@
+from passage_profiler import assess_passage_fit, estimate_syllables, format_profile_for_prompt, profile_passage
+
+PASSAGE = "The cat sat on the mat. It was a sunny day, and the children played in the park near the school."
+
+def test_estimate_syllables():
+    assert estimate_syllables("cat") == 1
+    assert estimate_syllables("make") == 1
+    assert estimate_syllables("table") == 2
+    assert estimate_syllables("library") == 3
+    assert estimate_syllables("rhythm") == 1
+
+def test_profile_counts_and_coverage():
+    profile = profile_passage(PASSAGE)
+    assert profile["words"] == 21
+    assert profile["sentences"] == 2
+    assert profile["sentence_length"]["max"] == 15
+    assert 0.0 <= profile["coverage"]["2015"] <= 1.0
+    assert abs(profile["coverage"]["2015"] + profile["out_of_list_density"]["2015"] - 1.0) < 0.002
+    # 같은 지문은 캐시된 프로필을 돌려줌
+    assert profile_passage(PASSAGE) is profile
+    assert profile_passage("123 456") == {}
+
+def _profile(fk_grade, density):
+    return {"words": 100, "sentences": 5, "fk_grade": fk_grade, "sentence_length": {"mean": 20.0, "max": 30},
+            "coverage": {"2015": 1 - density, "2022": 1 - density},
+            "out_of_list_density": {"2015": density, "2022": density}}
+
+def test_assess_passage_fit_levels():
+    assert assess_passage_fit({}, "고1")["level"] == "판정 불가"
+    assert assess_passage_fit(_profile(30.0, 0.0), "고1")["level"] == "어려움"
+    assert assess_passage_fit(_profile(0.0, 0.0), "고1")["level"] == "쉬움"
+    hard = assess_passage_fit(_profile(30.0, 0.9), "고2")
+    assert len(hard["reasons"]) == 2 and "2015" in hard["reasons"][1]
+    assert "'어려움'" in format_profile_for_prompt(_profile(30.0, 0.9), "고3")
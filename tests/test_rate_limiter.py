@@ -0,0 +1,96 @@
+import threading
+import time
+
+import pytest
+
+from rate_limiter import AdaptiveConcurrencyLimiter, TokenBucket
+
+def test_token_bucket_allows_burst_then_throttles():
+    bucket = TokenBucket(rate_per_second=20, capacity=2)
+    assert bucket.acquire() < 0.01
+    assert bucket.acquire() < 0.01
+    waited = bucket.acquire()
+    assert 0.03 <= waited <= 0.2
+    assert bucket.stats()["throttled"] == 1
+
+def test_token_bucket_timeout():
+    bucket = TokenBucket(rate_per_second=1, capacity=1)
+    bucket.acquire()
+    with pytest.raises(TimeoutError):
+        bucket.acquire(timeout=0.05)
+    assert bucket.stats()["waiting"] == 0
+
+def test_token_bucket_shared_across_threads():
+    bucket = TokenBucket(rate_per_second=50, capacity=1)
+    start = time.monotonic()
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    # 첫 토큰 이후 5개는 0.02초 간격
+    assert time.monotonic() - start >= 0.09
+    assert bucket.stats()["acquired"] == 6
+
+def _limiter(initial_limit=2, max_limit=4):
+    return AdaptiveConcurrencyLimiter(initial_limit=initial_limit, min_limit=1, max_limit=max_limit,
+                                      latency_target_seconds=1.0, decrease_factor=0.5)
+
+def test_aimd_grows_only_while_saturated_and_fast():
+    limiter = _limiter()
+    # 한도를 다 쓰지 않을 때는 늘리지 않음
+    limiter.acquire()
+    limiter.release(0.1)
+    assert limiter.stats()["limit"] == 2
+    for _ in range(4):
+        limiter.acquire()
+        limiter.acquire()
+        limiter.release(0.1)
+        limiter.release(0.1)
+    assert limiter.stats()["limit"] == 3
+
+def test_aimd_slow_responses_do_not_grow_limit():
+    limiter = _limiter()
+    for _ in range(4):
+        limiter.acquire()
+        limiter.acquire()
+        limiter.release(2.0)
+        limiter.release(2.0)
+    assert limiter.stats()["limit"] == 2
+
+def test_aimd_overload_halves_once_per_congestion_episode():
+    limiter = _limiter(initial_limit=4)
+    for _ in range(4):
+        limiter.acquire()
+    limiter.release(0.1, overloaded=True)
+    # 같은 혼잡 중에 시작한 요청의 429는 다시 줄이지 않음
+    limiter.release(0.1, overloaded=True)
+    assert limiter.stats()["limit"] == 2
+    assert limiter.stats()["decreases"] == 1
+    limiter.release(0.1)
+    limiter.release(0.1)
+    limiter.acquire()
+    limiter.release(0.0, overloaded=True)
+    assert limiter.stats()["limit"] == 1
+
+def test_aimd_queues_and_times_out_waiters():
+    limiter = _limiter(initial_limit=1, max_limit=1)
+    limiter.acquire()
+    with pytest.raises(TimeoutError):
+        limiter.acquire(timeout=0.05)
+
+    waiter = threading.Thread(target=limiter.acquire)
+    waiter.start()
+    while limiter.stats()["waiting"] == 0:
+        time.sleep(0.01)
+    limiter.abandon()
+    waiter.join(5)
+    stats = limiter.stats()
+    assert (stats["in_flight"], stats["waiting"], stats["queued"]) == (1, 0, 1)
+
+def test_limiter_slot_returns_only_once():
+    limiter = _limiter()
+    slot = limiter.acquire_slot()
+    slot.abandon()
+    slot.release(0.1)
+    assert limiter.stats()["in_flight"] == 0
@@ -0,0 +1,29 @@
+from types import SimpleNamespace
+
+import pytest
+
+import session_store
+from session_store import SharedValueStore
+
+@pytest.fixture
+def session(monkeypatch):
+    """Streamlit 실행 환경 없이 쓰는 세션 상태와 새 공유 저장소"""
+    fake_st = SimpleNamespace(session_state={})
+    monkeypatch.setattr(session_store, "st", fake_st)
+    monkeypatch.setattr(session_store, "SHARED_STORE", SharedValueStore(memory_budget_bytes=1024 * 1024, idle_ttl_seconds=60))
+    return fake_st.session_state
+
+def test_default_value_is_not_shared(session):
+    session_store.get_session_value("vocab_analysis")["total_words"] = 3
+    assert session_store.get_session_value("vocab_analysis") == {}
+    assert session_store.SHARED_SESSION_FIELDS["vocab_analysis"] == {}
+
+def test_identical_values_share_one_entry(session):
+    session_store.set_session_value("original_text", "A passage.")
+    other_key = session_store.SHARED_STORE.intern("A passage.")
+    assert session["original_text_key"] == other_key
+    assert session_store.get_session_value("original_text") == "A passage."
+    assert session_store.SHARED_STORE.stats()["entries"] == 1
+
+    session_store.clear_session_values("original_text")
+    assert session_store.get_session_value("original_text") == ""
@@ -0,0 +1,54 @@
+import gspread
+import pytest
+import requests
+
+import sheets_service
+from rate_limiter import TokenBucket
+
+def _api_error(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = b'{"error": {"code": %d, "message": "error", "status": "ERROR"}}' % status_code
+    return gspread.exceptions.APIError(response)
+
+class FlakyCall:
+    """처음 몇 번은 지정한 오류를 던지고 그다음부터 성공하는 요청"""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    """재시도 대기와 분당 한도 없이 바로 실행"""
+    monkeypatch.setattr(sheets_service, "_retry_delay", lambda error, attempt: 0)
+    monkeypatch.setattr(sheets_service, "SHEETS_RATE_LIMITER", TokenBucket(1000, 100))
+
+def test_reads_retry_server_errors_and_timeouts():
+    call = FlakyCall(_api_error(503), requests.exceptions.Timeout())
+    assert sheets_service.sheets_call(call) == "ok"
+    assert call.calls == 3
+
+def test_appends_retry_only_rate_limits():
+    call = FlakyCall(_api_error(429))
+    assert sheets_service.sheets_call(call, idempotent=False) == "ok"
+    assert call.calls == 2
+
+    # 서버가 이미 행을 저장했을 수 있으므로 5xx/시간 초과는 다시 보내지 않음
+    for error in (_api_error(500), requests.exceptions.Timeout(), requests.exceptions.ConnectionError()):
+        call = FlakyCall(error)
+        with pytest.raises(type(error)):
+            sheets_service.sheets_call(call, idempotent=False)
+        assert call.calls == 1
+
+def test_client_errors_are_not_retried():
+    call = FlakyCall(_api_error(400))
+    with pytest.raises(gspread.exceptions.APIError):
+        sheets_service.sheets_call(call)
+    assert call.calls == 1
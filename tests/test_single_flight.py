@@ -0,0 +1,65 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from single_flight import SingleFlight
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    gate = threading.Event()
+    executions = []
+
+    def fn():
+        executions.append(1)
+        gate.wait(5)
+        return "result"
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        futures = [executor.submit(flight.do, "key", fn, 5) for _ in range(5)]
+        while flight.stats()["coalesced"] < 4:
+            time.sleep(0.01)
+        gate.set()
+        assert [future.result() for future in futures] == ["result"] * 5
+    assert len(executions) == 1
+    assert flight.stats() == {"in_flight": 0, "executions": 1, "coalesced": 4, "max_waiters": 4}
+
+def test_error_is_shared_and_not_cached():
+    flight = SingleFlight()
+    gate = threading.Event()
+
+    def failing():
+        gate.wait(5)
+        raise ValueError("실패")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(flight.do, "key", failing, 5) for _ in range(2)]
+        while flight.stats()["coalesced"] < 1:
+            time.sleep(0.01)
+        gate.set()
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+    # 끝난 호출은 보관하지 않으므로 다음 호출은 새로 실행
+    assert flight.do("key", lambda: "retry") == "retry"
+
+def test_waiter_timeout():
+    flight = SingleFlight()
+    gate = threading.Event()
+    leader = threading.Thread(target=flight.do, args=("key", lambda: gate.wait(5)))
+    leader.start()
+    try:
+        while flight.stats()["in_flight"] == 0:
+            time.sleep(0.01)
+        with pytest.raises(TimeoutError):
+            flight.do("key", lambda: "unused", timeout=0.05)
+    finally:
+        gate.set()
+        leader.join(5)
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+    assert flight.stats()["executions"] == 2
@@ -0,0 +1,34 @@
+from spelling_index import SymSpellIndex, check_spelling, edit_distance
+
+def test_edit_distance_counts_transposition_as_one():
+    assert edit_distance("form", "from", 2) == 1
+    assert edit_distance("recieve", "receive", 2) == 1
+    assert edit_distance("cat", "cat", 2) == 0
+    # 최대 거리를 넘으면 max_distance + 1
+    assert edit_distance("apple", "orange", 2) == 3
+
+def test_symspell_lookup_orders_by_distance():
+    index = SymSpellIndex(["environment", "government", "enjoyment"])
+    assert index.lookup("environment") == [("environment", 0)]
+    assert index.lookup("enviroment")[0] == ("environment", 1)
+    assert index.lookup("zzzzzz") == []
+    assert len(index) == 3
+
+def test_check_spelling_flags_typos_and_suggests_passage_words():
+    results = {r["word"]: r["suggestions"] for r in check_spelling("The studnet liked the Photosynthsis lesson.",
+                                                                     passage_text="Photosynthesis needs light.")}
+    assert results["studnet"][0] == "student"
+    assert results["photosynthsis"][0] == "photosynthesis"
+    # 지문에 나온 단어와 기본 어휘는 오류가 아님
+    assert check_spelling("Photosynthesis helps the students.", passage_text="Photosynthesis needs light.") == []
+
+def test_real_typos_are_flagged():
+    flagged = {r["word"]: r["suggestions"] for r in check_spelling("I recieve letters becuase my freind lives in another city.")}
+    assert flagged["recieve"][0] == "receive"
+    assert flagged["becuase"][0] == "because"
+    assert flagged["freind"][0] == "friend"
+
+def test_ordinary_words_outside_the_lists_are_not_flagged():
+    # 기본 어휘 목록에는 없지만 일반 영어 단어인 경우 (이전에는 cafe → cage, oath → bath 등으로 잡힘)
+    text = "At the cafe, an old sage swore an oath by the urn while dew covered the bait and the pollinated blossoms."
+    assert check_spelling(text) == []
@@ -0,0 +1,29 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from data_config import SUMMARY_MIN_WORDS, SUMMARY_MAX_WORDS, get_curriculum_key
+from summary_scoring import length_score, paraphrase_score
+
+def test_length_score_uses_configured_word_limits():
+    assert length_score(SUMMARY_MIN_WORDS) == 1.0
+    assert length_score(SUMMARY_MAX_WORDS) == 1.0
+    assert length_score(SUMMARY_MIN_WORDS - 2) == 0.8
+    assert length_score(SUMMARY_MAX_WORDS + 3) == 0.7
+    assert length_score(0) == 0.0
+
+def test_paraphrase_score_penalizes_only_above_allowed_ratio():
+    assert paraphrase_score(0.0) == 1.0
+    assert paraphrase_score(1.0) == 0.0
+    assert paraphrase_score(0.8) < paraphrase_score(0.5) < 1.0
+
+def test_curriculum_key_splits_subject_only_for_upper_grades():
+    assert get_curriculum_key("고1", "영어") == "고1"
+    assert get_curriculum_key("고2", "영어I") == "고2_영어I"
+
+def test_instant_scoring_does_not_import_ai_services():
+    # 즉시 예비 점수는 OpenAI/Streamlit/라이브러리 DB 없이 동작해야 함
+    code = "import sys, summary_scoring; print(sorted({'ai_services', 'passage_library', 'openai'} & set(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).resolve().parent.parent,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
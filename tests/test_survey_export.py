@@ -0,0 +1,97 @@
+import csv
+import json
+
+import pytest
+
+from sheets_service import SURVEY_HEADERS
+from survey_export import convert_row, export_survey_data, iter_csv_pages, load_export_state
+
+def _row(participant_id: str) -> list:
+    values = {"participant_id": participant_id, "completed_summary": "TRUE", "PU_1": "5"}
+    return [values.get(name, "") for name in SURVEY_HEADERS]
+
+def _write_sheet(path, participant_ids):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(SURVEY_HEADERS)
+        writer.writerows(_row(participant_id) for participant_id in participant_ids)
+
+def _pages(path, page_size=2):
+    return lambda start: iter_csv_pages(path, start, page_size=page_size)
+
+def test_convert_row_types_and_blanks():
+    record = convert_row(_row("P1")[:5])
+    assert record["participant_id"] == "P1"
+    assert record["completed_summary"] is None
+    record = convert_row(_row("P1"))
+    assert record["completed_summary"] is True
+    assert record["PU_1"] == 5
+    assert record["timestamp"] is None
+
+def test_incremental_csv_export_appends_only_new_rows(tmp_path):
+    sheet, output = tmp_path / "sheet.csv", tmp_path / "export" / "survey.csv"
+    _write_sheet(sheet, ["P1", "P2", "P3"])
+    assert export_survey_data(_pages(sheet), output, fmt="csv") == {"exported_rows": 3, "last_row": 4, "total_exported_rows": 3}
+
+    _write_sheet(sheet, ["P1", "P2", "P3", "P4", "P5"])
+    assert export_survey_data(_pages(sheet), output, fmt="csv")["exported_rows"] == 2
+    # 새 행이 없으면 아무것도 쓰지 않음
+    assert export_survey_data(_pages(sheet), output, fmt="csv")["exported_rows"] == 0
+
+    with open(output, encoding="utf-8-sig") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["participant_id"] for row in rows] == ["P1", "P2", "P3", "P4", "P5"]
+    assert load_export_state(output) == {"last_row": 6, "exported_rows": 5, "format": "csv"}
+
+def test_failed_export_resumes_after_last_written_page(tmp_path):
+    sheet, output = tmp_path / "sheet.csv", tmp_path / "survey.csv"
+    _write_sheet(sheet, ["P1", "P2", "P3", "P4"])
+
+    def failing_pages(start):
+        pages = iter_csv_pages(sheet, start, page_size=2)
+        yield next(pages)
+        raise ConnectionError("시트 읽기 실패")
+
+    with pytest.raises(ConnectionError):
+        export_survey_data(failing_pages, output, fmt="csv")
+    assert load_export_state(output)["last_row"] == 3
+
+    assert export_survey_data(_pages(sheet), output, fmt="csv")["exported_rows"] == 2
+    with open(output, encoding="utf-8-sig") as f:
+        assert [row["participant_id"] for row in csv.DictReader(f)] == ["P1", "P2", "P3", "P4"]
+
+def test_full_export_replaces_existing_csv_and_state(tmp_path):
+    sheet, output = tmp_path / "sheet.csv", tmp_path / "survey.csv"
+    _write_sheet(sheet, ["P1", "P2"])
+    export_survey_data(_pages(sheet), output, fmt="csv")
+    _write_sheet(sheet, ["P3"])
+    result = export_survey_data(_pages(sheet), output, fmt="csv", incremental=False)
+
+    assert result == {"exported_rows": 1, "last_row": 2, "total_exported_rows": 1}
+    assert load_export_state(output)["last_row"] == 2
+    with open(output, encoding="utf-8-sig") as f:
+        assert [row["participant_id"] for row in csv.DictReader(f)] == ["P3"]
+
+def test_full_export_replaces_existing_parquet_folder(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    sheet, output = tmp_path / "sheet.csv", tmp_path / "survey_parquet"
+    _write_sheet(sheet, ["P1", "P2", "P3"])
+    export_survey_data(_pages(sheet), output)
+    export_survey_data(_pages(sheet), output, incremental=False)
+
+    assert [path.name for path in output.iterdir()] == ["part-0000002-0000004.parquet"]
+    assert sorted(pq.read_table(str(output)).column("participant_id").to_pylist()) == ["P1", "P2", "P3"]
+
+def test_incremental_parquet_export_adds_part_files(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    sheet, output = tmp_path / "sheet.csv", tmp_path / "survey_parquet"
+    _write_sheet(sheet, ["P1", "P2", "P3"])
+    export_survey_data(_pages(sheet), output)
+    _write_sheet(sheet, ["P1", "P2", "P3", "P4"])
+    export_survey_data(_pages(sheet), output)
+
+    assert sorted(path.name for path in output.iterdir()) == ["part-0000002-0000004.parquet", "part-0000005-0000005.parquet"]
+    table = pq.read_table(str(output))
+    assert sorted(table.column("participant_id").to_pylist()) == ["P1", "P2", "P3", "P4"]
+    assert table.schema.field("PU_1").type == "int64"
+    assert json.loads((tmp_path / "survey_parquet.state.json").read_text())["exported_rows"] == 4
@@ -1,5 +1,83 @@
 # utils.py
+import difflib
+import hashlib
+import re
+import unicodedata
+from collections import Counter
 
 def count_words(text: str) -> int:
     """단어 수 계산"""
-    return len(text.split()) if text.strip() else 0
\ No newline at end of file
+    return len(text.split()) if text.strip() else 0
+
+def summary_word_diff(old_summary: str, new_summary: str) -> str:
+    """두 요약문의 단어 단위 차이를 [-삭제-]{+추가+} 형식으로 반환"""
+    old_words = old_summary.split()
+    new_words = new_summary.split()
+    
+    matcher = difflib.SequenceMatcher(a=old_words, b=new_words, autojunk=False)
+    parts = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            parts.append(" ".join(old_words[i1:i2]))
+            continue
+        if tag in ("replace", "delete"):
+            parts.append(f"[-{' '.join(old_words[i1:i2])}-]")
+        if tag in ("replace", "insert"):
+            parts.append(f"{{+{' '.join(new_words[j1:j2])}+}}")
+    
+    return " ".join(parts)
+
+# 붙여넣기 과정에서 달라지는 문자(스마트 따옴표, 대시 등)를 통일하기 위한 표
+_PUNCTUATION_MAP = str.maketrans({
+    "\u2018": "'", "\u2019": "'", "\u201a": "'", "\u201b": "'",
+    "\u201c": '"', "\u201d": '"', "\u201e": '"', "\u201f": '"',
+    "\u2013": "-", "\u2014": "-", "\u2015": "-", "\u2212": "-",
+    "\u00a0": " ", "\u200b": "", "\ufeff": "",
+})
+
+def normalize_passage_text(text: str) -> str:
+    """지문 비교용 정규화 (유니코드 정규화, 따옴표/대시 통일, 공백/줄바꿈 정리)"""
+    text = unicodedata.normalize("NFKC", text).translate(_PUNCTUATION_MAP)
+    return " ".join(text.split())
+
+def passage_hash(text: str) -> str:
+    """정규화된 지문의 해시값"""
+    return hashlib.sha256(normalize_passage_text(text).encode("utf-8")).hexdigest()
+
+def extract_keywords(text: str, top_n: int = 5) -> list:
+    """텍스트에서 주요 키워드 추출 (지시대명사, 문법어휘 제외)"""
+    if not text.strip():
+        return []
+    
+    # 제외할 단어들 (지시대명사, 문법어휘, 관사, 전치사 등)
+    stopwords = {
+        'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them',
+        'this', 'that', 'these', 'those', 'my', 'your', 'his', 'her', 'its', 'our', 'their',
+        'a', 'an', 'the', 'and', 'or', 'but', 'so', 'if', 'because', 'when', 'where', 'how', 'why',
+        'in', 'on', 'at', 'by', 'for', 'with', 'without', 'to', 'from', 'of', 'about', 'into', 'through',
+        'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did',
+        'will', 'would', 'could', 'should', 'may', 'might', 'can', 'must', 'shall',
+        'not', 'no', 'yes', 'very', 'more', 'most', 'much', 'many', 'some', 'any', 'all', 'each', 'every',
+        'also', 'just', 'only', 'even', 'up', 'down', 'out', 'over', 'under', 'here', 'there', 'where',
+        'then', 'now', 'always', 'never', 'often', 'seldom', 'sometimes', 'usually', 'rarely', 'already',
+        'still', 'yet', 'away', 'back', 'forth', 'further', 'once', 'twice', 'enough', 'indeed', 'perhaps',
+        'possibly', 'probably', 'surely', 'truly', 'actually', 'obviously', 'simply', 'really', 'almost',
+        'among', 'amongst', 'around', 'above', 'below', 'between', 'before', 'after', 'along', 'beside',
+        'besides', 'inside', 'outside', 'near', 'off', 'past', 'round', 'since', 'until', 'upon', 'within',
+        'without', 'across', 'against', 'amongst', 'amid', 'amidst', 'around', 'concerning', 'despite',
+        'during', 'except', 'inside', 'like', 'minus', 'outside', 'plus', 'regarding', 'save', 'than',
+        'towards', 'unlike', 'versus', 'via', 'whether', 'whilst', 'whom', 'whose', 'though', 'throughout',
+        'till', 'together', 'too', 'underneath', 'unless', 'whither', 'yet', 'hence', 'thereby', 'therein',
+        'thereof', 'thereto', 'thereupon', 'whereby', 'wherein', 'whereof', 'whereto', 'whereupon', 'whoever',
+        'whatever', 'whenever', 'wherever', 'whichever', 'whomever'
+    }
+    
+    # 텍스트를 소문자로 변환하고 단어 추출
+    words = re.findall(r'\b[a-zA-Z]+\b', text.lower())
+    
+    # 불용어 제거 및 길이 3 이상인 단어만 선택
+    filtered_words = [word for word in words if word not in stopwords and len(word) >= 3]
+    
+    # 빈도 계산 후 상위 n개 반환
+    word_counts = Counter(filtered_words)
+    return [word for word, count in word_counts.most_common(top_n)]
@@ -1,12 +1,121 @@
 # vocabulary_loader.py
 import streamlit as st
 import os
+import re
+import threading
+from collections.abc import Mapping, Set
 from pathlib import Path
 
-from data_config import VOCAB_FILE_PATH_2015, VOCAB_FILE_PATH_2022
+from data_config import VOCAB_FILE_PATH_2015, VOCAB_FILE_PATH_2022, SYNONYM_MAX_GLOSS_HEADWORDS, SYNONYM_MAX_SUGGESTIONS
+from startup_profiler import record_startup_timing
 
-def load_moe_vocabulary(file_path: str, year: str) -> set:
-    """교육부 기본 어휘 목록 파일을 읽어 단어 집합으로 반환합니다."""
+# 어휘 로드 상태 메시지 (화면 출력 대신 기록해 두고 필요한 곳에서 표시)
+_load_status = []
+_load_lock = threading.Lock()
+_moe_vocabularies = None
+
+def _record_status(level: str, message: str):
+    """어휘 로드 상태 메시지 기록 (level: success/info/warning/error)"""
+    _load_status.append({"level": level, "message": message})
+
+def get_vocabulary_load_status() -> list:
+    """어휘 로드 중 기록된 상태 메시지 목록"""
+    return list(_load_status)
+
+# 어휘 목록별 비트 (사용자/학교 목록은 그 다음 비트부터 할당)
+VOCAB_BIT_2015 = 1 << 0
+VOCAB_BIT_2022 = 1 << 1
+MOE_VOCAB_MASK = VOCAB_BIT_2015 | VOCAB_BIT_2022
+
+# 뜻풀이 정규화: 괄호 설명, "~을" 같은 자리 표시, 따옴표 제거
+_GLOSS_NOISE = re.compile(r"\([^)]*\)|\[[^\]]*\]|~\S*|[\"'“”]")
+_HANGUL = re.compile(r"[가-힣]")
+
+def normalize_gloss(gloss: str) -> str:
+    """뜻풀이 하나를 색인 키로 정규화 (한글이 없거나 한 글자뿐이면 빈 문자열)"""
+    gloss = re.sub(r"\s+", " ", _GLOSS_NOISE.sub(" ", gloss)).strip(" .-")
+    if len(gloss) < 2 or not _HANGUL.search(gloss):
+        return ""
+    return gloss
+
+class VocabularyView(Set):
+    """비트마스크 표의 특정 목록(들)을 집합처럼 다루는 읽기 전용 뷰"""
+
+    def __init__(self, table, mask: int):
+        self.table = table
+        self.mask = mask
+
+    def __contains__(self, word):
+        return bool(self.table.word_masks.get(word, 0) & self.mask)
+
+    def __iter__(self):
+        mask = self.mask
+        return (word for word, word_mask in self.table.word_masks.items() if word_mask & mask)
+
+    def __len__(self):
+        return self.table.count_words(self.mask)
+
+class VocabularyMaskTable(Mapping):
+    """단어 → 비트마스크 표 (단어 하나 조회로 모든 목록의 포함 여부를 확인)
+
+    기존 {"2015": set, "2022": set, "combined": set} 딕셔너리처럼 조회할 수 있으며,
+    각 값은 별도 집합 대신 표를 공유하는 VocabularyView입니다.
+    """
+
+    def __init__(self):
+        self.word_masks = {}
+        self.list_bits = {"2015": VOCAB_BIT_2015, "2022": VOCAB_BIT_2022}
+        self._count_cache = {}
+        # 단어 → 뜻풀이 집합, 뜻풀이 → 표제어 집합 (역색인)
+        self.word_glosses = {}
+        self.gloss_headwords = {}
+
+    def add_list(self, name: str, words) -> int:
+        """어휘 목록을 표에 추가하고 해당 목록의 비트를 반환 (새 목록이면 다음 비트 할당)"""
+        bit = self.list_bits.get(name)
+        if bit is None:
+            bit = 1 << len(self.list_bits)
+            self.list_bits[name] = bit
+        
+        word_masks = self.word_masks
+        for word in words:
+            word_masks[word] = word_masks.get(word, 0) | bit
+        self._count_cache.clear()
+        return bit
+
+    def add_glosses(self, word: str, meanings: str):
+        """어휘 파일의 뜻풀이("뜻, 뜻")를 단어와 역색인에 추가"""
+        for gloss in re.split(r"[,;/]", meanings):
+            gloss = normalize_gloss(gloss)
+            if gloss:
+                self.word_glosses.setdefault(word, set()).add(gloss)
+                self.gloss_headwords.setdefault(gloss, set()).add(word)
+
+    def mask_of(self, name: str) -> int:
+        """목록 이름의 비트마스크 ("combined"는 2015/2022 합집합)"""
+        if name == "combined":
+            return MOE_VOCAB_MASK
+        return self.list_bits.get(name, 0)
+
+    def count_words(self, mask: int) -> int:
+        """마스크에 해당하는 단어 수 (목록이 바뀌기 전까지 캐시)"""
+        if mask not in self._count_cache:
+            self._count_cache[mask] = sum(1 for word_mask in self.word_masks.values() if word_mask & mask)
+        return self._count_cache[mask]
+
+    def __getitem__(self, name: str) -> VocabularyView:
+        if name != "combined" and name not in self.list_bits:
+            raise KeyError(name)
+        return VocabularyView(self, self.mask_of(name))
+
+    def __iter__(self):
+        return iter(["2015", "2022", "combined"] + [name for name in self.list_bits if name not in ("2015", "2022")])
+
+    def __len__(self):
+        return len(self.list_bits) + 1
+
+def load_moe_vocabulary(file_path: str, year: str, glosses: dict = None) -> set:
+    """교육부 기본 어휘 목록 파일을 읽어 단어 집합으로 반환합니다. (glosses를 주면 단어 → 뜻풀이도 채움)"""
     vocabulary_set = set()
     
     try:
@@ -14,14 +123,14 @@ def load_moe_vocabulary(file_path: str, year: str) -> set:
         file_path = Path(file_path)
         
         if not file_path.exists():
-            st.warning(f"교육부 기본 어휘 파일 '{file_path}'을(를) 찾을 수 없습니다.")
-            st.info(f"파일 위치 확인: {file_path.absolute()}")
+            _record_status("warning", f"교육부 기본 어휘 파일 '{file_path}'을(를) 찾을 수 없습니다.")
+            _record_status("info", f"파일 위치 확인: {file_path.absolute()}")
             return set()
 
         # 파일 크기 확인
         file_size = file_path.stat().st_size
         if file_size == 0:
-            st.warning(f"{year}년 어휘 파일이 비어있습니다.")
+            _record_status("warning", f"{year}년 어휘 파일이 비어있습니다.")
             return set()
 
         with open(file_path, 'r', encoding='utf-8') as f:
@@ -40,6 +149,8 @@ def load_moe_vocabulary(file_path: str, year: str) -> set:
                         word = parts[0].strip()
                         if word and word.replace('.', '').replace('-', '').isalpha():
                             vocabulary_set.add(word.lower())
+                            if glosses is not None:
+                                glosses.setdefault(word.lower(), []).append(parts[1])
                 else:
                     # 구분자가 없는 경우 첫 번째 단어만 추출
                     words = line.split()
@@ -49,9 +160,9 @@ def load_moe_vocabulary(file_path: str, year: str) -> set:
                             vocabulary_set.add(word.lower())
         
         if vocabulary_set:
-            st.success(f"{year}년 교육부 기본 어휘 목록 ({len(vocabulary_set)}개) 로드 완료")
+            _record_status("success", f"{year}년 교육부 기본 어휘 목록 ({len(vocabulary_set)}개) 로드 완료")
         else:
-            st.warning(f"{year}년 어휘 파일에서 유효한 어휘를 찾지 못했습니다. (처리된 줄 수: {line_count})")
+            _record_status("warning", f"{year}년 어휘 파일에서 유효한 어휘를 찾지 못했습니다. (처리된 줄 수: {line_count})")
             
     except UnicodeDecodeError:
         try:
@@ -67,52 +178,51 @@ def load_moe_vocabulary(file_path: str, year: str) -> set:
                             word = parts[0].strip()
                             if word and word.replace('.', '').replace('-', '').isalpha():
                                 vocabulary_set.add(word.lower())
-            st.success(f"{year}년 교육부 기본 어휘 목록 ({len(vocabulary_set)}개) 로드 완료 (CP949 인코딩)")
+                                if glosses is not None:
+                                    glosses.setdefault(word.lower(), []).append(parts[1])
+            _record_status("success", f"{year}년 교육부 기본 어휘 목록 ({len(vocabulary_set)}개) 로드 완료 (CP949 인코딩)")
         except Exception as e:
-            st.error(f"{year}년 교육부 기본 어휘 목록 로드 중 인코딩 오류: {e}")
+            _record_status("error", f"{year}년 교육부 기본 어휘 목록 로드 중 인코딩 오류: {e}")
             
     except Exception as e:
-        st.error(f"{year}년 교육부 기본 어휘 목록 로드 중 오류 발생: {e}")
-        st.info(f"파일 경로: {file_path.absolute()}")
+        _record_status("error", f"{year}년 교육부 기본 어휘 목록 로드 중 오류 발생: {e}")
+        _record_status("info", f"파일 경로: {Path(file_path).absolute()}")
         
     return vocabulary_set
 
-def load_combined_moe_vocabulary() -> dict:
-    """2015년과 2022년 교육부 기본 어휘를 모두 로드하여 반환합니다."""
-    result = {
-        "2015": set(),
-        "2022": set(),
-        "combined": set()
-    }
+def load_combined_moe_vocabulary() -> VocabularyMaskTable:
+    """2015년과 2022년 교육부 기본 어휘를 하나의 비트마스크 표로 로드하여 반환합니다."""
+    result = VocabularyMaskTable()
+    glosses = {}
     
-    st.info("📚 교육부 기본 어휘 파일 로드 중...")
+    _record_status("info", "📚 교육부 기본 어휘 파일 로드 중...")
     
     # 2015년 어휘 로드
-    vocab_2015 = load_moe_vocabulary(VOCAB_FILE_PATH_2015, "2015")
-    result["2015"] = vocab_2015
+    result.add_list("2015", load_moe_vocabulary(VOCAB_FILE_PATH_2015, "2015", glosses))
     
     # 2022년 어휘 로드  
-    vocab_2022 = load_moe_vocabulary(VOCAB_FILE_PATH_2022, "2022")
-    result["2022"] = vocab_2022
+    result.add_list("2022", load_moe_vocabulary(VOCAB_FILE_PATH_2022, "2022", glosses))
     
-    # 통합 어휘 (합집합)
-    result["combined"] = vocab_2015.union(vocab_2022)
+    # 뜻풀이 역색인 (같은 뜻풀이를 가진 표제어 = 동의어 후보)
+    for word, meanings in glosses.items():
+        for meaning in meanings:
+            result.add_glosses(word, meaning)
     
     if result["combined"]:
-        st.info(f"""
+        _record_status("info", f"""
 **📊 교육부 기본 어휘 로드 완료:**
 - **2015년**: {len(result['2015'])}개
 - **2022년**: {len(result['2022'])}개  
 - **통합**: {len(result['combined'])}개 (중복 제거)
-- **공통 어휘**: {len(vocab_2015.intersection(vocab_2022))}개
-- **2015년 고유**: {len(vocab_2015 - vocab_2022)}개
-- **2022년 고유**: {len(vocab_2022 - vocab_2015)}개
+- **공통 어휘**: {sum(1 for m in result.word_masks.values() if m & MOE_VOCAB_MASK == MOE_VOCAB_MASK)}개
+- **2015년 고유**: {sum(1 for m in result.word_masks.values() if m & MOE_VOCAB_MASK == VOCAB_BIT_2015)}개
+- **2022년 고유**: {sum(1 for m in result.word_masks.values() if m & MOE_VOCAB_MASK == VOCAB_BIT_2022)}개
         """)
     else:
-        st.error("⚠️ 어휘 파일을 로드하지 못했습니다. 파일 경로와 형식을 확인해주세요.")
+        _record_status("error", "⚠️ 어휘 파일을 로드하지 못했습니다. 파일 경로와 형식을 확인해주세요.")
         
         # 디버깅 정보 제공
-        st.info(f"""
+        _record_status("info", f"""
 **🔍 디버깅 정보:**
 - 2015년 파일 경로: `{VOCAB_FILE_PATH_2015}`
 - 2022년 파일 경로: `{VOCAB_FILE_PATH_2022}`
@@ -138,10 +248,100 @@ def get_vocabulary_for_grade(grade_level: str, all_vocabularies: dict) -> set:
         # 기타의 경우 통합 어휘 사용
         return all_vocabularies.get("combined", set())
 
+# 기본 어휘 목록에 원형만 있는 불규칙 변화형/기능어 → 목록의 표제어
+IRREGULAR_FORMS = {
+    "am": "be", "is": "be", "are": "be", "was": "be", "were": "be", "been": "be", "being": "be",
+    "has": "have", "had": "have", "does": "do", "did": "do", "done": "do",
+    "an": "a", "these": "this", "those": "that", "me": "i", "my": "i", "us": "we", "our": "we",
+    "them": "they", "their": "they", "his": "he", "him": "he", "its": "it",
+    "more": "much", "most": "much", "better": "good", "best": "good", "worse": "bad", "worst": "bad",
+    "less": "little", "least": "little", "children": "child", "people": "person", "men": "man", "women": "woman",
+    "went": "go", "gone": "go", "made": "make", "took": "take", "taken": "take", "got": "get", "gave": "give",
+    "given": "give", "saw": "see", "seen": "see", "came": "come", "found": "find", "told": "tell", "said": "say",
+    "thought": "think", "knew": "know", "known": "know", "grew": "grow", "grown": "grow", "began": "begin",
+    "begun": "begin", "became": "become", "brought": "bring", "bought": "buy", "built": "build", "kept": "keep",
+    "left": "leave", "lost": "lose", "met": "meet", "paid": "pay", "ran": "run", "sent": "send", "spent": "spend",
+    "stood": "stand", "understood": "understand", "wrote": "write", "written": "write", "felt": "feel",
+    "held": "hold", "led": "lead", "meant": "mean", "heard": "hear", "taught": "teach", "caught": "catch",
+    "chose": "choose", "chosen": "choose", "fell": "fall", "fallen": "fall", "drove": "drive", "driven": "drive",
+    "ate": "eat", "eaten": "eat", "spoke": "speak", "spoken": "speak", "sold": "sell", "won": "win",
+}
+
+def _inflection_bases(word: str) -> list:
+    """규칙 변화형(-s/-es/-ies, -ed, -ing, -ly, -er/-est)에서 추정한 원형 후보"""
+    bases = []
+    if word.endswith("ies") or word.endswith("ied") or word.endswith("ier"):
+        bases.append(word[:-3] + "y")
+    if word.endswith("iest") or word.endswith("ily"):
+        bases.append(word[:-4 if word.endswith("iest") else -3] + "y")
+    for suffix in ("es", "s", "ed", "d", "ing", "ly", "er", "r", "est", "st"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+            stem = word[:-len(suffix)]
+            bases.append(stem)
+            if suffix in ("ing", "ed", "er", "est"):
+                bases.append(stem + "e")
+                # stopped → stop, bigger → big
+                if len(stem) >= 3 and stem[-1] == stem[-2]:
+                    bases.append(stem[:-1])
+    return bases
+
+def in_vocabulary(word: str, vocab) -> bool:
+    """단어나 규칙 변화형의 원형이 어휘 목록에 있는지 (기본 어휘 목록에는 원형만 있음)"""
+    word = word.lower()
+    if word in vocab or IRREGULAR_FORMS.get(word) in vocab:
+        return True
+    return any(base in vocab for base in _inflection_bases(word))
+
+def suggest_in_list_synonyms(word: str, target_vocab, all_vocabularies, limit: int = SYNONYM_MAX_SUGGESTIONS) -> list:
+    """뜻풀이를 공유하는 기준 어휘 목록 안의 대체어 (공유 뜻풀이가 많은 순)
+
+    단어(또는 변화형의 원형)가 다른 연도 목록에만 있을 때 그 뜻풀이로 역색인을 조회합니다.
+    표제어가 너무 많은 일반적인 뜻풀이("하다", "쓰다" 등)는 건너뜁니다.
+    """
+    word_glosses = getattr(all_vocabularies, "word_glosses", None)
+    if not word_glosses:
+        return []
+    word = word.lower()
+    # 변화형의 원형이 이미 기준 목록에 있으면 (jobs → job) 바꿀 필요 없음
+    if in_vocabulary(word, target_vocab):
+        return []
+    source = next((w for w in [word, IRREGULAR_FORMS.get(word)] + _inflection_bases(word) if w in word_glosses), None)
+    if source is None:
+        return []
+
+    shared = {}
+    for gloss in word_glosses[source]:
+        headwords = all_vocabularies.gloss_headwords.get(gloss, ())
+        if len(headwords) > SYNONYM_MAX_GLOSS_HEADWORDS:
+            continue
+        for candidate in headwords:
+            if candidate not in (word, source) and candidate in target_vocab:
+                shared[candidate] = shared.get(candidate, 0) + 1
+    # 같은 수면 2015/2022 두 목록에 모두 있는(더 기본적인) 단어, 짧은 단어 순
+    word_masks = all_vocabularies.word_masks
+    return sorted(shared, key=lambda c: (-shared[c], word_masks.get(c, 0) & MOE_VOCAB_MASK != MOE_VOCAB_MASK, len(c), c))[:limit]
+
+def suggest_synonyms(words, target_vocab, all_vocabularies, limit: int = SYNONYM_MAX_SUGGESTIONS) -> dict:
+    """기준 외 어휘마다 기준 어휘 목록 안의 대체어 {단어: [대체어, ...]} (대체어가 없는 단어는 제외)"""
+    suggestions = {}
+    for word in words:
+        synonyms = suggest_in_list_synonyms(word, target_vocab, all_vocabularies, limit)
+        if synonyms:
+            suggestions[word] = synonyms
+    return suggestions
+
+def word_mask_with_inflections(word: str, word_masks: dict) -> int:
+    """비트마스크 표에서 단어의 목록 마스크 조회 (표에 없으면 변화형의 원형으로 조회)"""
+    mask = word_masks.get(word, 0)
+    if mask:
+        return mask
+    for base in [IRREGULAR_FORMS.get(word)] + _inflection_bases(word):
+        if base and word_masks.get(base):
+            return word_masks[base]
+    return 0
+
 def analyze_vocabulary_level(text: str, target_vocab: set, all_vocabularies: dict) -> dict:
     """텍스트의 어휘 수준을 분석합니다."""
-    import re
-    
     words = re.findall(r'\b[a-zA-Z]+\b', text.lower())
     unique_words = set(words)
     
@@ -160,6 +360,10 @@ def analyze_vocabulary_level(text: str, target_vocab: set, all_vocabularies: dic
             "non_target_examples": sorted(list(unique_words))[:10]
         }
     
+    # 비트마스크 표: 단어마다 한 번 조회한 마스크로 모든 목록을 함께 집계
+    if isinstance(target_vocab, VocabularyView) and target_vocab.table is all_vocabularies:
+        return _analyze_with_masks(unique_words, target_vocab.mask, all_vocabularies)
+    
     # 대상 어휘 집합 기준 분석
     target_vocab_words = unique_words.intersection(target_vocab)
     non_target_vocab_words = unique_words - target_vocab
@@ -180,6 +384,53 @@ def analyze_vocabulary_level(text: str, target_vocab: set, all_vocabularies: dic
         "non_target_examples": sorted(list(non_target_vocab_words))[:10]  # 최대 10개 예시
     }
 
+def _analyze_with_masks(unique_words: set, target_mask: int, table: VocabularyMaskTable, get_mask=None) -> dict:
+    """비트마스크 표 기반 어휘 분석 (목록 수와 무관하게 단어당 한 번 조회)"""
+    get_mask = get_mask or table.word_masks.get
+    mask_counts = {}
+    non_target_words = []
+    
+    for word in unique_words:
+        word_mask = get_mask(word, 0)
+        mask_counts[word_mask] = mask_counts.get(word_mask, 0) + 1
+        if not word_mask & target_mask:
+            non_target_words.append(word)
+    
+    # 목록별 개수는 (서로 다른 마스크 수만큼의) 비트 검사로 계산
+    list_counts = {
+        name: sum(count for word_mask, count in mask_counts.items() if word_mask & bit)
+        for name, bit in table.list_bits.items()
+    }
+    target_count = len(unique_words) - len(non_target_words)
+    
+    total = len(unique_words)
+    return {
+        "total_unique_words": total,
+        "target_vocab_words": target_count,
+        "non_target_vocab_words": len(non_target_words),
+        "target_vocab_ratio": target_count / total if total else 0,
+        "vocab_2015_words": list_counts["2015"],
+        "vocab_2022_words": list_counts["2022"],
+        "vocab_2015_ratio": list_counts["2015"] / total if total else 0,
+        "vocab_2022_ratio": list_counts["2022"] / total if total else 0,
+        "vocab_list_counts": list_counts,
+        "non_target_examples": sorted(non_target_words)[:10]  # 최대 10개 예시
+    }
+
+def analyze_vocabulary_batch(texts: list, target_vocab: set, all_vocabularies: dict) -> list:
+    """여러 요약문의 어휘 수준을 한 번에 분석 (전체 고유 단어를 한 번씩만 조회)"""
+    if not (isinstance(target_vocab, VocabularyView) and target_vocab.table is all_vocabularies and target_vocab):
+        return [analyze_vocabulary_level(text, target_vocab, all_vocabularies) for text in texts]
+    
+    token_sets = [set(re.findall(r'\b[a-zA-Z]+\b', text.lower())) for text in texts]
+    word_masks = all_vocabularies.word_masks
+    batch_masks = {word: word_masks.get(word, 0) for word in set().union(*token_sets)}
+    
+    return [
+        _analyze_with_masks(unique_words, target_vocab.mask, all_vocabularies, get_mask=batch_masks.get)
+        for unique_words in token_sets
+    ]
+
 def debug_vocabulary_files():
     """어휘 파일 디버깅을 위한 함수"""
     st.subheader("🔍 어휘 파일 디버깅")
@@ -216,12 +467,37 @@ def debug_vocabulary_files():
         else:
             st.error("파일이 존재하지 않습니다!")
 
-# 모듈 로드 시 어휘 데이터 초기화
-try:
-    MOE_VOCABULARIES = load_combined_moe_vocabulary()
-    # 하위 호환성을 위한 기본 어휘 집합 (통합 버전)
-    MOE_VOCABULARY = MOE_VOCABULARIES.get("combined", set())
-except Exception as e:
-    st.error(f"어휘 데이터 초기화 중 오류 발생: {e}")
-    MOE_VOCABULARIES = {"2015": set(), "2022": set(), "combined": set()}
-    MOE_VOCABULARY = set()
\ No newline at end of file
+def get_moe_vocabularies() -> VocabularyMaskTable:
+    """교육부 기본 어휘를 최초 사용 시 한 번만 로드하여 반환 (프로세스 전체 공유)"""
+    global _moe_vocabularies
+    if _moe_vocabularies is not None:
+        return _moe_vocabularies
+    
+    with _load_lock:
+        if _moe_vocabularies is None:
+            try:
+                with record_startup_timing("교육부 기본 어휘 로드"):
+                    _moe_vocabularies = load_combined_moe_vocabulary()
+            except Exception as e:
+                _record_status("error", f"어휘 데이터 초기화 중 오류 발생: {e}")
+                _moe_vocabularies = VocabularyMaskTable()
+    return _moe_vocabularies
+
+def register_vocabulary_list(name: str, words) -> int:
+    """사용자/학교 어휘 목록을 비트마스크 표에 추가하고 할당된 비트를 반환"""
+    table = get_moe_vocabularies()
+    with _load_lock:
+        return table.add_list(name, [word.strip().lower() for word in words if word.strip()])
+
+def is_vocabulary_loaded() -> bool:
+    """어휘 데이터가 이미 로드되었는지 여부 (로드를 유발하지 않음)"""
+    return _moe_vocabularies is not None
+
+def __getattr__(name: str):
+    """하위 호환성: MOE_VOCABULARIES / MOE_VOCABULARY 접근 시 지연 로드"""
+    if name == "MOE_VOCABULARIES":
+        return get_moe_vocabularies()
+    if name == "MOE_VOCABULARY":
+        # 하위 호환성을 위한 기본 어휘 집합 (통합 버전)
+        return get_moe_vocabularies().get("combined", set())
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")